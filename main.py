@@ -4,6 +4,11 @@ from __future__ import annotations
 
 import sys
 
+from src.core.startup_profile import mark_phase, start_from_argv
+
+# First, so every later import is timed when --profile-startup is given.
+start_from_argv(sys.argv)
+
 
 def _prepare_windows_dpi() -> None:
     """Claim per-monitor DPI awareness before pyautogui locks a weaker mode.
@@ -25,9 +30,31 @@ def _prepare_windows_dpi() -> None:
 
 _prepare_windows_dpi()
 
+mark_phase("Importing modules")
 from src.ui.app import GunsmokeApp  # noqa: E402
 
 
+def _session_recorder():
+    """--record-session=PATH: record grabs + input for scripts/replay_session.py."""
+    for arg in list(sys.argv):
+        if arg.startswith("--record-session="):
+            sys.argv.remove(arg)
+            from src.core.session_replay import SessionRecorder
+
+            return SessionRecorder(arg.split("=", 1)[1])
+    return None
+
+
 if __name__ == "__main__":
+    recorder = _session_recorder()
     app = GunsmokeApp()
-    app.run()
+    if recorder is not None:
+        recorder.start(
+            config=app.config_manager.config,
+            live_config=lambda: app.config_manager.config,
+        )
+    try:
+        app.run()
+    finally:
+        if recorder is not None:
+            recorder.stop()
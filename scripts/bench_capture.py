@@ -0,0 +1,74 @@
+"""Micro-benchmark screen capture backends (grabs/second per region size).
+
+    python scripts/bench_capture.py
+    python scripts/bench_capture.py --backends pil mss --seconds 2
+
+The ``fake`` backend serves a synthetic 3440x1440 frame, so it runs without a
+display and shows the floor cost of crop + copy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+
+from src.core.capture import ArrayBackend, backend_names, create_backend  # noqa: E402
+from src.core.scanner import _clamp_bbox  # noqa: E402
+
+# (label, w, h): one OCR cell, a full Access Records table, a 1440p screen
+SIZES = (
+    ("cell 200x36", 200, 36),
+    ("table 1100x300", 1100, 300),
+    ("screen 3440x1440", 3440, 1440),
+)
+
+
+def bench(backend, w: int, h: int, seconds: float) -> float:
+    box = _clamp_bbox([0, 0, w, h], backend)
+    if box is None:
+        return 0.0
+    backend.grab(box)  # warm up handles / buffers
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        backend.grab(box)
+        n += 1
+    return n / (time.perf_counter() - start)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--backends", nargs="*", default=backend_names())
+    ap.add_argument("--seconds", type=float, default=1.0)
+    args = ap.parse_args()
+
+    print(f"{'backend':<8} {'region':<18} {'grabs/s':>10} {'ms/grab':>9}")
+    for name in args.backends:
+        try:
+            backend = create_backend(name)
+        except Exception as e:
+            print(f"{name:<8} unavailable: {e}")
+            continue
+        if isinstance(backend, ArrayBackend):
+            backend.set_frame(np.zeros((1440, 3440, 3), dtype=np.uint8))
+        for label, w, h in SIZES:
+            try:
+                rate = bench(backend, w, h, args.seconds)
+            except Exception as e:
+                print(f"{name:<8} {label:<18} failed: {e}")
+                break
+            ms = 1000.0 / rate if rate else float("nan")
+            print(f"{name:<8} {label:<18} {rate:>10.1f} {ms:>9.2f}")
+        backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""Per-operation latency of GachaDB / InventoryDB: fresh connection vs shared pool.
+
+    python scripts/bench_db.py
+    python scripts/bench_db.py --rounds 500
+
+"before" opens a new sqlite3 connection per call (the old _connect);
+"after" is the shared WAL writer + reader pool from src/data/sqlite_pool.py.
+Runs against throwaway databases in a temp directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.data.gacha_db import GachaDB  # noqa: E402
+from src.data.inventory_db import InventoryDB  # noqa: E402
+from src.data.sqlite_pool import close_all  # noqa: E402
+
+
+@contextmanager
+def _fresh_connection(self):
+    conn = sqlite3.connect(self.path)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+class LegacyGachaDB(GachaDB):
+    _connect = _fresh_connection
+    _read = _fresh_connection
+
+
+class LegacyInventoryDB(InventoryDB):
+    _connect = _fresh_connection
+    _read = _fresh_connection
+
+
+def _page(n: int):
+    return [
+        {
+            "purchase_time": f"2025-01-{1 + n // 1000 % 28:02d} 12:{n // 60 % 60:02d}:{n % 60:02d}",
+            "purchase_source": "Standard Procurement",
+            "item_type": "Doll",
+            "item_name": f"Item {i}",
+            "ordinal": 0,
+            "rarity_color": "standard",
+        }
+        for i in range(6)
+    ]
+
+
+def _time(fn, rounds: int):
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(gacha: GachaDB, inv: InventoryDB, rounds: int):
+    perks = [{"name": "Attack", "level": 2}, {"name": "Crit", "level": 1}]
+    return {
+        "insert_pulls (6-row page)": _time(lambda i: gacha.insert_pulls(_page(i)), rounds),
+        "pull_exists": _time(
+            lambda i: gacha.pull_exists(_page(i)[0]["purchase_time"], "Item 0", 0), rounds
+        ),
+        "count_pulls": _time(lambda i: gacha.count_pulls(), rounds),
+        "list_pulls (limit 50)": _time(lambda i: gacha.list_pulls(limit=50), rounds),
+        "upsert_core": _time(
+            lambda i: inv.upsert_core(f"Type {i % 20}", perks), rounds
+        ),
+        "total_quantity": _time(lambda i: inv.total_quantity(), rounds),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rounds", type=int, default=300)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run(
+            LegacyGachaDB(str(Path(tmp) / "before_gacha.db")),
+            LegacyInventoryDB(str(Path(tmp) / "before_inv.db")),
+            args.rounds,
+        )
+        after = run(
+            GachaDB(str(Path(tmp) / "after_gacha.db")),
+            InventoryDB(str(Path(tmp) / "after_inv.db")),
+            args.rounds,
+        )
+        close_all()
+
+    print(f"{'operation':<28} {'before µs':>10} {'p95':>8} {'after µs':>10} {'p95':>8} {'x':>6}")
+    for op, (b_mean, b_p95) in before.items():
+        a_mean, a_p95 = after[op]
+        speedup = b_mean / a_mean if a_mean else float("nan")
+        print(
+            f"{op:<28} {b_mean:>10.1f} {b_p95:>8.1f} {a_mean:>10.1f} {a_p95:>8.1f} "
+            f"{speedup:>6.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
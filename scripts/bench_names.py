@@ -0,0 +1,184 @@
+"""resolve_item_name on noisy OCR-like names: linear catalog scan vs the name index.
+
+    python scripts/bench_names.py
+    python scripts/bench_names.py --queries 20000 --min-ratio 0.7
+
+"before" scores every compact catalog name with _similarity (the resolver as
+it was); "after" is src/core/gacha_names.resolve_item_name with its prebuilt
+per-catalog index. Both results are compared for every query and the script
+exits non-zero if any differ.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core import gacha_names  # noqa: E402
+from src.core.gacha_names import (  # noqa: E402
+    _compact,
+    _normalize_item_type,
+    _similarity,
+    all_canonical_names,
+    canonical_names_for_type,
+    resolve_item_name,
+)
+
+# What OCR tends to do to a name: confusable letters, dropped / doubled
+# characters, stray punctuation, spacing and case.
+_SWAPS = {"i": "l", "l": "1", "o": "0", "e": "c", "m": "rn", "n": "h", "u": "v"}
+
+
+def noisy(name: str, rng: random.Random) -> str:
+    chars = list(name)
+    for _ in range(rng.choice((0, 1, 1, 2, 3))):
+        if not chars:
+            break
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.35:
+            chars[i] = _SWAPS.get(chars[i].lower(), chars[i])
+        elif op < 0.55:
+            del chars[i]
+        elif op < 0.7:
+            chars.insert(i, chars[i])
+        elif op < 0.85:
+            chars.insert(i, rng.choice(" .-'|"))
+        else:
+            chars[i] = chars[i].swapcase()
+    text = "".join(chars)
+    if rng.random() < 0.1:
+        text = text + rng.choice((" Gun", " II", "s", " Elite"))
+    if rng.random() < 0.05:
+        text = "".join(
+            rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(len(text))
+        )
+    return text
+
+
+def queries(n: int, seed: int) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    dolls = canonical_names_for_type("Doll")
+    weapons = canonical_names_for_type("Weapons")
+    out = []
+    for _ in range(n):
+        item_type = rng.choice(("Doll", "Weapons", "Weapons", ""))
+        pool = (
+            dolls if item_type == "Doll" else weapons if item_type else dolls + weapons
+        )
+        out.append((noisy(rng.choice(pool), rng), item_type))
+    return out
+
+
+def linear(
+    raw: str, *, item_type: Optional[str] = None, min_ratio: float = 0.78
+) -> str:
+    """The resolver before the index: maps rebuilt and every name scored per call."""
+    if not raw:
+        return ""
+    text = re.sub(r"\s+", " ", raw.strip())
+    kind = _normalize_item_type(item_type)
+    if not kind:
+        lower_map = {n.lower(): n for n in all_canonical_names()}
+        return lower_map.get(text.lower(), text)
+    catalog = canonical_names_for_type(kind)
+    if not catalog:
+        return text
+
+    lower_map = {n.lower(): n for n in catalog}
+    if text.lower() in lower_map:
+        return lower_map[text.lower()]
+    compact_raw = _compact(text)
+    if not compact_raw:
+        return text
+    compact_map: Dict[str, str] = {}
+    for n in catalog:
+        compact_map.setdefault(_compact(n), n)
+    if compact_raw in compact_map:
+        return compact_map[compact_raw]
+
+    best_name = text
+    best_score = 0.0
+    for c, n in compact_map.items():
+        adj = _similarity(compact_raw, c) + min(0.02, len(c) * 0.0005)
+        if adj > best_score:
+            best_score = adj
+            best_name = n
+    if best_score >= min_ratio and best_name != text:
+        return best_name
+    return text
+
+
+def timed(fn, qs, min_ratio: float, rounds: int) -> Tuple[float, List[str]]:
+    best = float("inf")
+    out: List[str] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        out = [fn(raw, item_type=t, min_ratio=min_ratio) for raw, t in qs]
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--queries", type=int, default=5000)
+    ap.add_argument("--min-ratio", type=float, default=0.78)
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    qs = queries(args.queries, args.seed)
+    print(
+        f"{len(qs)} queries, catalogs: {len(canonical_names_for_type('Doll'))} dolls, "
+        f"{len(canonical_names_for_type('Weapons'))} weapons"
+    )
+
+    before, expected = timed(linear, qs, args.min_ratio, args.rounds)
+    gacha_names._name_index.cache_clear()
+    start = time.perf_counter()
+    resolve_item_name("x", item_type="Doll")
+    resolve_item_name("x", item_type="Weapons")
+    build = time.perf_counter() - start
+    after, got = timed(resolve_item_name, qs, args.min_ratio, args.rounds)
+
+    index = gacha_names._name_index(canonical_names_for_type("Weapons"))
+    scored = [
+        len(index.candidates(_compact(raw), args.min_ratio))
+        for raw, t in qs
+        if t == "Weapons" and _compact(raw)
+    ]
+    changed = sum(1 for (raw, _t), fixed in zip(qs, got) if fixed != raw)
+    print(
+        f"  linear scan  {before * 1000:9.1f} ms  ({before / len(qs) * 1e6:7.1f} µs/query)"
+    )
+    print(
+        f"  name index   {after * 1000:9.1f} ms  ({after / len(qs) * 1e6:7.1f} µs/query)"
+    )
+    print(f"  speed-up     {before / after if after else float('inf'):9.1f}x")
+    print(f"  index build  {build * 1000:9.1f} ms (both catalogs, once)")
+    if scored:
+        print(
+            f"  scored per weapon query: {sum(scored) / len(scored):.1f} of "
+            f"{len(index.keys)} names"
+        )
+    print(f"  {changed} of {len(qs)} queries resolved to a different name")
+
+    diff = [(q, e, g) for q, e, g in zip(qs, expected, got) if e != g]
+    if diff:
+        for (raw, t), e, g in diff[:10]:
+            print(f"  MISMATCH {raw!r} ({t or 'no type'}): linear {e!r}, index {g!r}")
+        print(f"{len(diff)} mismatches")
+        return 1
+    print("  results identical")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,503 @@
+"""OCR latency / throughput / accuracy per region type against a golden corpus.
+
+    python scripts/bench_ocr.py --export-session scan.gsrec data/ocr_golden
+    python scripts/bench_ocr.py --synthesize data/ocr_golden
+    python scripts/bench_ocr.py data/ocr_golden --output base.json
+    python scripts/bench_ocr.py data/ocr_golden --presets scanner threshold-150 \\
+        --engines recognizer detector --languages en en,ja --baseline base.json
+
+A corpus is a directory with labels.json and one PNG per crop:
+
+    {"version": 1, "crops": [{"region": "gacha_time", "file": "gacha_time/ab12.png",
+                              "text": "2025-01-02 13:04:05"}, ...]}
+
+--export-session cuts every configured region out of a session recorded with
+main.py --record-session and labels each crop with what OCR reads today -
+correct labels.json by hand before using it as a baseline. --synthesize
+renders sample strings with OpenCV's font instead: enough for latency runs
+without the game, not for judging accuracy.
+
+Every (languages, engine, preset) configuration reads each crop once to warm
+up, then --rounds more times with the OCR cache off. Per region: p50 / p95 ms
+per crop, crops/s (one at a time, and batched through extract_batch for the
+recognizer and glyph engines) and exact-match accuracy of the stripped text.
+The recognizer engine reads timestamps on the EasyOCR path only; the glyph
+engine reads them the way GachaScanner does, glyph atlas first (the saved
+atlas, which the run may extend in memory but never writes back). --output
+writes the results as JSON; --baseline compares with such a file and exits 1
+when any accuracy went down.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from src.constants import (  # noqa: E402
+    DEFAULT_CONFIG,
+    GACHA_DEFAULT_PREPROCESSING,
+    GACHA_ROW_COLUMNS,
+)
+from src.core.ocr import (  # noqa: E402
+    GlyphRecognizer,
+    OCRCache,
+    OCRProcessor,
+    OCRSpec,
+)
+
+CORPUS_VERSION = 1
+LABELS = "labels.json"
+
+# region type -> how the scanners read it (OCRSpec fields, minus config and
+# validate; the glyph engine adds validate, see _scanner_validators)
+REGIONS: Dict[str, Dict[str, Any]] = {
+    "gacha_time": {"allowlist": "0123456789-: "},
+    "gacha_source": {},
+    "gacha_type": {},
+    "gacha_name": {},
+    "lb_nickname": {},
+    "lb_single": {"is_number": True},
+    "lb_total": {"is_number": True},
+    "growth_type": {},
+    "growth_perks": {},
+}
+_GACHA_REGION = dict(
+    zip(GACHA_ROW_COLUMNS, ("gacha_time", "gacha_source", "gacha_type", "gacha_name"))
+)
+_LEADERBOARD_REGION = {
+    "nickname": "lb_nickname",
+    "single_high": "lb_single",
+    "total_score": "lb_total",
+}
+
+# Preprocessing overrides on top of what the region's scanner uses ("scanner").
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "scanner": {},
+    "adaptive": {"adaptive": True},
+    "threshold-120": {"adaptive": False, "threshold": 120},
+    "threshold-150": {"adaptive": False, "threshold": 150},
+    "threshold-180": {"adaptive": False, "threshold": 180},
+    "kernel-1x1": {"kernel_size": [1, 1]},
+    "kernel-3x3": {"kernel_size": [3, 3]},
+}
+# recognizer: extract_text (line_boxes + recognizer, detection skipped)
+# glyph: extract_batch with the scanner's validate, so the glyph atlas is tried
+#        first; only regions the scanners read that way
+# detector: the full reader.readtext path (CRAFT detection + recognizer)
+ENGINES = ("recognizer", "glyph", "detector")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+# -- corpus -------------------------------------------------------------------
+
+
+def load_corpus(root: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    labels = json.loads((root / LABELS).read_text(encoding="utf-8"))
+    if labels.get("version") != CORPUS_VERSION:
+        raise ValueError(f"Unsupported corpus version {labels.get('version')!r}")
+    crops = []
+    for entry in labels["crops"]:
+        if entry["region"] not in REGIONS:
+            print(f"  skipping {entry['file']}: unknown region {entry['region']!r}")
+            continue
+        bgr = cv2.imread(str(root / entry["file"]), cv2.IMREAD_COLOR)
+        if bgr is None:
+            print(f"  skipping {entry['file']}: unreadable")
+            continue
+        crops.append({**entry, "img": cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)})
+    return labels, crops
+
+
+def _write_crop(root: Path, region: str, img: np.ndarray) -> str:
+    digest = hashlib.blake2b(img.tobytes(), digest_size=8)
+    digest.update(repr(img.shape).encode())
+    rel = f"{region}/{digest.hexdigest()}.png"
+    (root / region).mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(root / rel), cv2.cvtColor(img, cv2.COLOR_RGB2BGR))
+    return rel
+
+
+def _save_labels(
+    root: Path, preprocessing: Dict[str, Any], entries: List[Dict[str, Any]]
+) -> None:
+    entries.sort(key=lambda e: (list(REGIONS).index(e["region"]), e["file"]))
+    data = {"version": CORPUS_VERSION, "preprocessing": preprocessing, "crops": entries}
+    (root / LABELS).write_text(
+        json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+
+
+def _config_boxes(config: Dict[str, Any]) -> List[Tuple[str, List[int]]]:
+    """(region type, [x, y, w, h]) for every region the scanners OCR."""
+    boxes = []
+    for row in (config.get("gacha") or {}).get("rows", []):
+        boxes += [(_GACHA_REGION[c], row[c]) for c in GACHA_ROW_COLUMNS if row.get(c)]
+    for row in config.get("rows", []):
+        boxes += [(r, row[k]) for k, r in _LEADERBOARD_REGION.items() if row.get(k)]
+    growth = (config.get("inventory") or {}).get("growth") or {}
+    boxes += [(f"growth_{k}", growth[k]) for k in ("type", "perks") if growth.get(k)]
+    return boxes
+
+
+def _scanner_preprocessing(config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "default": dict(config.get("preprocessing") or DEFAULT_CONFIG["preprocessing"]),
+        "gacha": dict(
+            (config.get("gacha") or {}).get("preprocessing")
+            or config.get("preprocessing")
+            or GACHA_DEFAULT_PREPROCESSING
+        ),
+    }
+
+
+def export_session(session_path: Path, root: Path, languages: List[str]) -> int:
+    from src.core.session_replay import ReplaySession
+
+    session = ReplaySession(str(session_path))
+    if not session.config:
+        print(f"{session_path}: no recorded config")
+        return 2
+    preprocessing = _scanner_preprocessing(session.config)
+    boxes = _config_boxes(session.config)
+    seen = set()
+    cut: List[Tuple[str, np.ndarray]] = []
+    for i, grab in enumerate(session.grabs):
+        left, top, right, bottom = grab["box"]
+        for region, (x, y, w, h) in boxes:
+            if not (left <= x and top <= y and x + w <= right and y + h <= bottom):
+                continue
+            img = session._crop(i, (x, y, x + w, y + h))
+            key = (region, hashlib.blake2b(img.tobytes(), digest_size=16).digest())
+            if img.size and key not in seen:
+                seen.add(key)
+                cut.append((region, img))
+    if not cut:
+        print(f"{session_path}: no configured region inside any recorded grab")
+        return 2
+
+    ocr = OCRProcessor(languages, cache=OCRCache(max_entries=0), load=False)
+    if not ocr._ensure_reader():
+        print(f"EasyOCR unavailable ({ocr.load_error})")
+        return 2
+    entries = []
+    for region, img in cut:
+        spec = _spec(region, preprocessing, {})
+        text = ocr.extract_text(img, spec.is_number, spec.config, spec.allowlist)
+        entries.append(
+            {"region": region, "file": _write_crop(root, region, img), "text": text}
+        )
+    _save_labels(root, preprocessing, entries)
+    print(
+        f"{len(entries)} crops → {root / LABELS} (labels are today's OCR - check them by hand)"
+    )
+    return 0
+
+
+def _sample_texts(rng: random.Random) -> Dict[str, str]:
+    from src.core.gacha_pool import STANDARD_ELITE_DOLLS, STANDARD_ELITE_WEAPONS
+    from src.core.growth_names import CORE_TYPES, load_catalog
+
+    perks = [p["name"] for p in load_catalog().get("perks") or []] or [
+        "Annular Defense"
+    ]
+    item_type = rng.choice(("Doll", "Weapons"))
+    names = sorted(
+        STANDARD_ELITE_DOLLS if item_type == "Doll" else STANDARD_ELITE_WEAPONS
+    )
+    nick = "".join(
+        rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ0123456789")
+        for _ in range(rng.randint(4, 12))
+    )
+    return {
+        "gacha_time": (
+            f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+            f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+        ),
+        "gacha_source": rng.choice(
+            (
+                "Targeted Procurement",
+                "Military Upgrade",
+                "Standard Procurement",
+                "Beginner Procurement",
+            )
+        ),
+        "gacha_type": item_type,
+        "gacha_name": rng.choice(names),
+        "lb_nickname": nick,
+        "lb_single": f"{rng.randint(1000, 999999):,}",
+        "lb_total": f"{rng.randint(100000, 99999999):,}",
+        "growth_type": f"Suitable for {rng.choice(CORE_TYPES)}",
+        "growth_perks": f"Lv.{rng.randint(1, 3)} {rng.choice(perks)}",
+    }
+
+
+def _render(text: str, rng: random.Random, noise: np.random.Generator) -> np.ndarray:
+    scale = rng.uniform(0.7, 1.0)
+    (w, h), base = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)
+    pad = rng.randint(6, 14)
+    img = np.full((h + base + 2 * pad, w + 2 * pad, 3), rng.randint(20, 60), np.uint8)
+    img += noise.integers(0, 6, size=img.shape, dtype=np.uint8)
+    shade = rng.randint(200, 255)
+    cv2.putText(
+        img,
+        text,
+        (pad, pad + h),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        scale,
+        (shade,) * 3,
+        2,
+        cv2.LINE_AA,
+    )
+    return img
+
+
+def synthesize(root: Path, per_region: int, seed: int) -> int:
+    rng = random.Random(seed)
+    noise = np.random.default_rng(seed)
+    entries = []
+    for _ in range(per_region):
+        for region, text in _sample_texts(rng).items():
+            img = _render(text, rng, noise)
+            entries.append(
+                {"region": region, "file": _write_crop(root, region, img), "text": text}
+            )
+    _save_labels(root, _scanner_preprocessing({}), entries)
+    print(f"{len(entries)} synthetic crops → {root / LABELS}")
+    return 0
+
+
+# -- benchmark ------------------------------------------------------------------
+
+
+def _spec(
+    region: str, preprocessing: Dict[str, Any], overrides: Dict[str, Any]
+) -> OCRSpec:
+    base = preprocessing["gacha" if region.startswith("gacha_") else "default"]
+    return OCRSpec(config={"preprocessing": {**base, **overrides}}, **REGIONS[region])
+
+
+def _scanner_validators() -> Dict[str, Callable[[str], bool]]:
+    """Region type -> the validate= its scanner passes (turns on the glyph atlas)."""
+    from src.core.gacha_scanner import _is_full_timestamp
+
+    return {"gacha_time": _is_full_timestamp}
+
+
+def _read(ocr: OCRProcessor, engine: str, img: np.ndarray, spec: OCRSpec) -> str:
+    if engine == "detector":
+        return ocr._readtext(img, spec.is_number, spec.config, spec.allowlist)
+    if engine == "glyph":
+        return ocr.extract_batch([img], [spec])[0]
+    return ocr.extract_text(img, spec.is_number, spec.config, spec.allowlist)
+
+
+def run_config(
+    ocr: OCRProcessor,
+    engine: str,
+    overrides: Dict[str, Any],
+    preprocessing: Dict[str, Any],
+    crops: List[Dict[str, Any]],
+    rounds: int,
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    validators: Dict[str, Callable[[str], bool]] = {}
+    if engine == "glyph":
+        validators = _scanner_validators()
+        # Every glyph configuration starts from the saved atlas; nothing is saved.
+        ocr.glyphs = GlyphRecognizer()
+        ocr.glyphs.path = None
+    for region in REGIONS:
+        items = [c for c in crops if c["region"] == region]
+        if not items or engine == "glyph" and region not in validators:
+            continue
+        spec = _spec(region, preprocessing, overrides)
+        if engine == "glyph":
+            spec = dataclasses.replace(spec, validate=validators[region])
+        latencies: List[float] = []
+        correct = 0
+        misses = []
+        for item in items:
+            text = _read(
+                ocr, engine, item["img"], spec
+            )  # warm-up, and the scored reading
+            if text.strip() == item["text"].strip():
+                correct += 1
+            elif len(misses) < 5:
+                misses.append(
+                    {"file": item["file"], "expected": item["text"], "got": text}
+                )
+            for _ in range(rounds):
+                start = time.perf_counter()
+                _read(ocr, engine, item["img"], spec)
+                latencies.append(time.perf_counter() - start)
+
+        row = {
+            "crops": len(items),
+            "p50_ms": round(_percentile(latencies, 0.50) * 1000.0, 3),
+            "p95_ms": round(_percentile(latencies, 0.95) * 1000.0, 3),
+            "crops_per_s": (
+                round(len(latencies) / sum(latencies), 2) if sum(latencies) else 0.0
+            ),
+            "accuracy": round(correct / len(items), 4),
+            "misses": misses,
+        }
+        if engine in ("recognizer", "glyph"):
+            imgs = [c["img"] for c in items]
+            start = time.perf_counter()
+            for _ in range(rounds):
+                ocr.extract_batch(imgs, [spec] * len(imgs))
+            elapsed = time.perf_counter() - start
+            row["batch_crops_per_s"] = (
+                round(len(imgs) * rounds / elapsed, 2) if elapsed else 0.0
+            )
+        results[region] = row
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> int:
+    """Print accuracy / p50 changes per (configuration, region); count regressions."""
+    worse = 0
+    print(f"\nAgainst baseline ({baseline.get('corpus', '?')}):")
+    for name, regions in results["configs"].items():
+        old_regions = baseline.get("configs", {}).get(name)
+        if old_regions is None:
+            print(f"  {name}: not in baseline")
+            continue
+        for region, row in regions.items():
+            old = old_regions.get(region)
+            if old is None:
+                continue
+            d_acc = row["accuracy"] - old["accuracy"]
+            d_p50 = row["p50_ms"] - old["p50_ms"]
+            flag = ""
+            if d_acc < 0:
+                worse += 1
+                flag = "  ACCURACY DOWN"
+            print(
+                f"  {name:<32} {region:<13} acc {row['accuracy']:.3f} ({d_acc:+.3f})  "
+                f"p50 {row['p50_ms']:.1f} ms ({d_p50:+.1f}){flag}"
+            )
+    return worse
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("corpus", type=Path)
+    ap.add_argument(
+        "--export-session",
+        type=Path,
+        metavar="SESSION",
+        help="build the corpus from a recording",
+    )
+    ap.add_argument(
+        "--synthesize", action="store_true", help="build a rendered-text corpus"
+    )
+    ap.add_argument(
+        "--per-region", type=int, default=20, help="crops per region for --synthesize"
+    )
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument(
+        "--presets", nargs="*", default=["scanner"], choices=sorted(PRESETS)
+    )
+    ap.add_argument("--engines", nargs="*", default=["recognizer"], choices=ENGINES)
+    ap.add_argument(
+        "--languages",
+        nargs="*",
+        default=["en"],
+        help="comma-separated language lists, one per configuration",
+    )
+    ap.add_argument(
+        "--regions", nargs="*", choices=sorted(REGIONS), help="only these region types"
+    )
+    ap.add_argument("--rounds", type=int, default=3, help="timed readings per crop")
+    ap.add_argument("--output", type=Path, help="write results as JSON")
+    ap.add_argument("--baseline", type=Path, help="JSON from an earlier --output")
+    args = ap.parse_args()
+
+    if args.export_session:
+        return export_session(
+            args.export_session, args.corpus, args.languages[0].split(",")
+        )
+    if args.synthesize:
+        return synthesize(args.corpus, args.per_region, args.seed)
+
+    labels, crops = load_corpus(args.corpus)
+    if args.regions:
+        crops = [c for c in crops if c["region"] in args.regions]
+    if not crops:
+        print(f"{args.corpus}: no crops")
+        return 2
+    preprocessing = labels.get("preprocessing") or _scanner_preprocessing({})
+
+    results: Dict[str, Any] = {
+        "corpus": str(args.corpus),
+        "crops": len(crops),
+        "rounds": args.rounds,
+        "python": sys.version.split()[0],
+        "configs": {},
+    }
+    print(
+        f"{'configuration':<32} {'region':<13} {'n':>4} {'p50 ms':>8} {'p95 ms':>8} {'crops/s':>8} {'batch/s':>8} {'acc':>6}"
+    )
+    for langs in args.languages:
+        languages = [x.strip() for x in langs.split(",") if x.strip()]
+        ocr = OCRProcessor(languages, cache=OCRCache(max_entries=0), load=False)
+        if not ocr._ensure_reader():
+            print(f"{langs}: EasyOCR unavailable ({ocr.load_error})")
+            continue
+        for engine in args.engines:
+            for preset in args.presets:
+                name = f"{'+'.join(languages)}/{engine}/{preset}"
+                regions = run_config(
+                    ocr,
+                    engine,
+                    PRESETS[preset],
+                    preprocessing,
+                    crops,
+                    max(1, args.rounds),
+                )
+                results["configs"][name] = regions
+                for region, row in regions.items():
+                    batch = row.get("batch_crops_per_s")
+                    batch = "-" if batch is None else f"{batch:.1f}"
+                    print(
+                        f"{name:<32} {region:<13} {row['crops']:>4} {row['p50_ms']:>8.1f} "
+                        f"{row['p95_ms']:>8.1f} {row['crops_per_s']:>8.1f} "
+                        f"{batch:>8} {row['accuracy']:>6.3f}"
+                    )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if compare(results, baseline):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+"""Text-column pulls table (schema v1) vs integer-coded pull_rows (schema v2).
+
+    python scripts/bench_schema.py
+    python scripts/bench_schema.py --pulls 200000 --rounds 10
+
+Builds a v1 database of synthetic pulls with the old DDL, copies it and
+opens the copy with GachaDB, which migrates it to v2. "before" runs the old
+queries on the v1 file; "after" runs the v2 ones (the pulls view,
+GachaDB.count_elite_copies) on the migrated copy. Reports
+file size, count_elite_copies, list_pulls and loading the timeline into
+NumPy code arrays; exits non-zero if list_pulls or the elite counts differ.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_stats import synthetic_pulls  # noqa: E402
+from src.data.gacha_db import GachaDB  # noqa: E402
+from src.data.sqlite_pool import close_all  # noqa: E402
+
+V1_SCHEMA = """
+    CREATE TABLE pulls (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        purchase_time TEXT NOT NULL,
+        purchase_source TEXT NOT NULL,
+        item_type TEXT NOT NULL,
+        item_name TEXT NOT NULL,
+        ordinal INTEGER NOT NULL DEFAULT 0,
+        rarity_color TEXT,
+        scanned_at TEXT NOT NULL,
+        UNIQUE (purchase_time, item_name, ordinal)
+    );
+    CREATE INDEX idx_pulls_time ON pulls(purchase_time DESC);
+    CREATE INDEX idx_pulls_source ON pulls(purchase_source);
+"""
+
+V1_ELITE = """
+    SELECT item_name, item_type, COUNT(*) AS n
+    FROM pulls
+    WHERE lower(trim(rarity_color)) IN ('elite', 'gold')
+    GROUP BY item_name, item_type
+"""
+
+V1_LIST = """
+    SELECT id, purchase_time, purchase_source, item_type, item_name,
+           ordinal, rarity_color, scanned_at
+    FROM pulls
+    ORDER BY purchase_time DESC, id ASC
+    LIMIT ?
+"""
+
+V2_LIST = """
+    SELECT id, purchase_time, purchase_source, item_type, item_name,
+           ordinal, rarity_color, scanned_at
+    FROM pulls
+    ORDER BY purchase_ts DESC, id ASC
+    LIMIT ?
+"""
+
+
+def build_v1(path: str, n: int, seed: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(V1_SCHEMA)
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO pulls (
+            purchase_time, purchase_source, item_type, item_name,
+            ordinal, rarity_color, scanned_at
+        ) VALUES (?, ?, ?, ?, ?, ?, '2025-06-01 12:00:00')
+        """,
+        [
+            (
+                p["purchase_time"],
+                p["purchase_source"],
+                p["item_type"],
+                p["item_name"],
+                p["ordinal"],
+                p["rarity_color"],
+            )
+            for p in synthetic_pulls(n, seed)
+        ],
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def v1_columns(conn: sqlite3.Connection):
+    rows = conn.execute(
+        """
+        SELECT purchase_time, purchase_source, item_type, item_name, rarity_color
+        FROM pulls ORDER BY purchase_time ASC, id DESC
+        """
+    ).fetchall()
+    cols = list(zip(*rows))
+    # Text has to be coded in Python before it is usable as arrays.
+    return [np.unique(np.array(c, dtype=object), return_inverse=True)[1] for c in cols]
+
+
+def v2_columns(conn: sqlite3.Connection):
+    rows = conn.execute(
+        """
+        SELECT purchase_ts, source_id, type_id, item_id, COALESCE(rarity_id, 0)
+        FROM pull_rows ORDER BY purchase_ts ASC, id DESC
+        """
+    ).fetchall()
+    return np.array(rows, dtype=np.int64).T
+
+
+def timed(fn, rounds: int):
+    best = float("inf")
+    out = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pulls", type=int, default=50000)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        v1_path = os.path.join(tmp, "v1.db")
+        v2_path = os.path.join(tmp, "v2.db")
+        build_v1(v1_path, args.pulls, args.seed)
+        shutil.copy(v1_path, v2_path)
+        start = time.perf_counter()
+        db = GachaDB(v2_path)
+        migrate = time.perf_counter() - start
+        db_list = db.list_pulls(limit=5000)
+
+        v1 = sqlite3.connect(v1_path)
+        v2 = sqlite3.connect(v2_path)
+        results = {}
+        results["count_elite_copies"] = (
+            timed(lambda: v1.execute(V1_ELITE).fetchall(), args.rounds),
+            timed(db.count_elite_copies, args.rounds),
+        )
+        results["list_pulls (5000)"] = (
+            timed(lambda: v1.execute(V1_LIST, (5000,)).fetchall(), args.rounds),
+            timed(lambda: v2.execute(V2_LIST, (5000,)).fetchall(), args.rounds),
+        )
+        results["timeline → arrays"] = (
+            timed(lambda: v1_columns(v1), args.rounds),
+            timed(lambda: v2_columns(v2), args.rounds),
+        )
+        v1.close()
+        v2.close()
+        close_all()
+        sizes = os.path.getsize(v1_path), os.path.getsize(v2_path)
+
+    print(f"{args.pulls} pulls, migration {migrate * 1000:.0f} ms")
+    print(
+        f"  {'file size':<22} {sizes[0] / 1e6:9.2f} MB {sizes[1] / 1e6:9.2f} MB"
+        f"  {sizes[0] / sizes[1]:5.1f}x"
+    )
+    for op, ((before, _), (after, _)) in results.items():
+        print(
+            f"  {op:<22} {before * 1000:9.2f} ms {after * 1000:9.2f} ms"
+            f"  {before / after if after else float('inf'):5.1f}x"
+        )
+
+    (_, elite_v1), (_, elite_v2) = results["count_elite_copies"]
+    (_, list_v1), (_, list_v2) = results["list_pulls (5000)"]
+    mismatches = []
+    if {(r[0], r[1]): r[2] for r in elite_v1} != elite_v2:
+        mismatches.append("count_elite_copies")
+    if list_v1 != list_v2 or list_v2 != [tuple(r.values()) for r in db_list]:
+        mismatches.append("list_pulls")
+    if mismatches:
+        print(f"  MISMATCH: {', '.join(mismatches)}")
+        return 1
+    print("  results identical")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""build_stats_report on a synthetic timeline: dict-based reference vs columnar engine.
+
+    python scripts/bench_stats.py
+    python scripts/bench_stats.py --pulls 200000 --source "Targeted Procurement"
+
+"before" is annotate_pulls + the compute_* functions in src/core/gacha_stats.py;
+"after" is src/core/gacha_columns.Timeline. Both outputs are compared and the
+script exits non-zero if they differ.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core import gacha_stats  # noqa: E402
+from src.core.gacha_columns import Timeline  # noqa: E402
+from src.core.gacha_pool import STANDARD_ELITE_DOLLS, STANDARD_ELITE_WEAPONS  # noqa: E402
+
+SOURCES = [
+    "Targeted Procurement",
+    "Targeted Procurement",
+    "Military Upgrade",
+    "Custom Procurement - Dolls",
+    "Custom Procurement - Weapons",
+    "Standard Procurement",
+    "Beginner Procurement",
+]
+FEATURED_DOLLS = ["Featured Doll A", "Featured Doll B", "Featured Doll C"]
+FEATURED_WEAPONS = ["Featured Weapon A", "Featured Weapon B"]
+
+
+def synthetic_pulls(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    std_dolls = sorted(STANDARD_ELITE_DOLLS)
+    std_weapons = sorted(STANDARD_ELITE_WEAPONS)
+    pulls = []
+    for i in range(n):
+        item_type = rng.choice(("Doll", "Weapons"))
+        roll = rng.random()
+        if roll < 0.02:
+            rarity = "elite"
+            if item_type == "Doll":
+                name = rng.choice(FEATURED_DOLLS if rng.random() < 0.5 else std_dolls)
+            else:
+                name = rng.choice(FEATURED_WEAPONS if rng.random() < 0.5 else std_weapons)
+        else:
+            rarity = "standard" if roll < 0.2 else "retired"
+            name = f"Item {rng.randint(1, 60)}"
+        day, sec = divmod(i, 600)
+        pulls.append(
+            {
+                "purchase_time": (
+                    f"2025-{1 + day // 28 % 12:02d}-{1 + day % 28:02d} "
+                    f"{sec // 3600:02d}:{sec // 60 % 60:02d}:{sec % 60:02d}"
+                ),
+                "purchase_source": rng.choice(SOURCES),
+                "item_type": item_type,
+                "item_name": name,
+                "ordinal": 0,
+                "rarity_color": rarity,
+            }
+        )
+    return pulls
+
+
+def reference(pulls: List[Dict[str, Any]], source: Optional[str]):
+    annotated = gacha_stats.annotate_pulls(pulls)
+    if source:
+        want = gacha_stats.normalize_source(source)
+        annotated = [
+            p
+            for p in annotated
+            if gacha_stats.normalize_source(p.get("purchase_source")) == want
+        ]
+    return (
+        gacha_stats.compute_summary(annotated),
+        gacha_stats.compute_campaigns(annotated),
+        gacha_stats.compute_fifty_fifty_summary(annotated),
+        gacha_stats.compute_activity_by_day(annotated),
+    )
+
+
+def columnar(pulls: List[Dict[str, Any]], source: Optional[str]):
+    timeline = Timeline.from_pulls(pulls)
+    if source:
+        timeline = timeline.of_source(source)
+    return (
+        timeline.summary(),
+        timeline.campaigns(),
+        timeline.fifty_fifty_summary(),
+        timeline.activity_by_day(),
+    )
+
+
+def _best_of(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pulls", type=int, default=200_000)
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--source", default=None, help="limit metrics to one Purchase Source")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    pulls = synthetic_pulls(args.pulls, args.seed)
+    before = reference(pulls, args.source)
+    after = columnar(pulls, args.source)
+    # repr keeps dict ordering and int/float/None distinctions in the comparison.
+    if repr(before) != repr(after):
+        print("MISMATCH: columnar output differs from the reference")
+        return 1
+
+    t_before = _best_of(lambda: reference(pulls, args.source), args.rounds)
+    t_after = _best_of(lambda: columnar(pulls, args.source), args.rounds)
+    print(f"{args.pulls} pulls, source={args.source or 'all'} (outputs identical)")
+    print(f"  dict reference  {t_before * 1000:9.1f} ms")
+    print(f"  columnar        {t_after * 1000:9.1f} ms   x{t_before / t_after:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+"""Restore Access Records history into data/gacha.db from an export.
+
+    python scripts/import_pulls.py backup.csv
+    python scripts/import_pulls.py old/gacha.db --db data/gacha.db
+
+Accepts CSV or JSON (a list of objects) with the list_pulls columns
+(purchase_time, purchase_source, item_type, item_name, ordinal, rarity_color,
+scanned_at - the last three optional), or another gacha.db. Rows already in
+the target are updated in place, exactly like a rescan.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.data.gacha_db import DB_PATH, GachaDB  # noqa: E402
+
+REQUIRED = ("purchase_time", "purchase_source", "item_type", "item_name")
+
+
+def _read_rows(path: Path) -> List[Dict]:
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with path.open(encoding="utf-8") as f:
+            return list(json.load(f))
+    if suffix in (".db", ".sqlite", ".sqlite3"):
+        conn = sqlite3.connect(str(path))
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(r) for r in conn.execute("SELECT * FROM pulls")]
+        finally:
+            conn.close()
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("source", type=Path)
+    ap.add_argument("--db", default=DB_PATH, help=f"target database (default {DB_PATH})")
+    args = ap.parse_args()
+
+    rows = _read_rows(args.source)
+    pulls = []
+    skipped = 0
+    for row in rows:
+        if any(not row.get(k) for k in REQUIRED):
+            skipped += 1
+            continue
+        pull = {k: row[k] for k in REQUIRED}
+        pull["ordinal"] = int(row.get("ordinal") or 0)
+        pull["rarity_color"] = row.get("rarity_color") or None
+        if row.get("scanned_at"):
+            pull["scanned_at"] = row["scanned_at"]
+        pulls.append(pull)
+
+    inserted, known = GachaDB(args.db).insert_pulls(pulls)
+    print(
+        f"{args.source}: {len(rows)} rows → {inserted} new, {known} already known, "
+        f"{skipped} skipped (missing columns)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""Replay a recorded scanner session: throughput and output equality, no game needed.
+
+    python main.py --record-session=gacha.gsrec          (record: run a scan, quit)
+    python scripts/replay_session.py gacha.gsrec --scanner gacha --save-output base.json
+    python scripts/replay_session.py gacha.gsrec --scanner gacha --compare base.json --rounds 3
+
+Scanners: gacha (scan_all_pages), inventory-full / inventory-last-row /
+inventory-single (GrowthScanner F9 / F7 / F8), gunsmoke (leaderboard rows).
+Grabs come from the recording, pyautogui input is a no-op, and results go to
+throwaway databases, so this runs on Linux without a display. The session's
+recorded config is used, not config.json. Timings include the scanners' own
+settle waits. Exits 1 when --compare finds different output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.session_replay import ReplaySession, input_module  # noqa: E402
+
+# Before the scanners import pyautogui (stand-in when there is no display).
+input_module()
+
+from src.config import ConfigManager  # noqa: E402
+from src.core.ocr import OCRProcessor  # noqa: E402
+
+SCANNERS = ("gacha", "inventory-full", "inventory-last-row", "inventory-single", "gunsmoke")
+
+
+class SessionConfig(ConfigManager):
+    """The config recorded with the session; never reads or writes config.json."""
+
+    def __init__(self, config: dict):
+        self.config = config
+
+    def save_config(self):
+        pass
+
+
+def _runner(kind: str, config: SessionConfig, ocr, tmp: Path, season: int) -> Callable[[], List[Any]]:
+    if kind == "gacha":
+        from src.core.gacha_scanner import GachaScanner
+        from src.data.gacha_db import GachaDB
+
+        def run():
+            db = GachaDB(str(tmp / f"gacha_{time.monotonic_ns()}.db"))
+            result = GachaScanner(config, ocr, db).scan_all_pages()
+            return result["pulls"]
+
+        return run
+
+    if kind.startswith("inventory-"):
+        from src.core.growth_scanner import GrowthScanner
+        from src.data.inventory_db import InventoryDB
+
+        def run():
+            db = InventoryDB(str(tmp / f"inventory_{time.monotonic_ns()}.db"))
+            scanner = GrowthScanner(config, ocr, db)
+            cores: List[Dict] = []
+            if kind == "inventory-full":
+                scanner.scan_full(on_core=cores.append)
+            elif kind == "inventory-last-row":
+                scanner.scan_last_row(on_core=cores.append)
+            else:
+                scanner.scan_single(on_core=cores.append)
+            return cores
+
+        return run
+
+    from src.core.leaderboard import read_leaderboard
+
+    def run():
+        return [p.to_dict() for p in read_leaderboard(config, ocr, season)]
+
+    return run
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("session", type=Path)
+    ap.add_argument("--scanner", choices=SCANNERS, required=True)
+    ap.add_argument("--rounds", type=int, default=1)
+    ap.add_argument("--season", type=int, default=0, help="season number for gunsmoke rows")
+    ap.add_argument("--save-output", type=Path, help="write the scanner output as JSON")
+    ap.add_argument("--compare", type=Path, help="JSON from an earlier --save-output")
+    args = ap.parse_args()
+
+    session = ReplaySession(str(args.session))
+    if not session.config:
+        print(f"{args.session}: no recorded config")
+        return 2
+    config = SessionConfig(session.config)
+    ocr = OCRProcessor(config.get_ocr_languages())
+
+    output: List[Any] = []
+    timings: List[float] = []
+    with tempfile.TemporaryDirectory() as tmp, session:
+        run = _runner(args.scanner, config, ocr, Path(tmp), args.season)
+        for _ in range(max(1, args.rounds)):
+            session.rewind()
+            ocr.cache.clear()
+            start = time.perf_counter()
+            output = run()
+            timings.append(time.perf_counter() - start)
+        from src.data.sqlite_pool import close_all
+
+        close_all()
+
+    # Round-trip through JSON so saved and fresh output compare alike.
+    output = json.loads(json.dumps(output, default=str))
+    best = min(timings)
+    print(
+        f"{args.session.name}: {args.scanner}, {len(output)} items, "
+        f"best {best:.2f}s of {len(timings)} ({len(output) / best if best else 0:.1f} items/s; "
+        f"recorded live {session.duration:.2f}s)"
+    )
+    print(
+        f"  inputs {'match' if session.actions_match() else 'DIFFER from'} the recording "
+        f"({len(session.actions)} replayed / {len(session.recorded_actions)} recorded); "
+        f"unserved grabs {session.misses}"
+    )
+
+    if args.save_output:
+        args.save_output.write_text(json.dumps(output, indent=2), encoding="utf-8")
+        print(f"  output written to {args.save_output}")
+    if args.compare:
+        expected = json.loads(args.compare.read_text(encoding="utf-8"))
+        if expected != output:
+            diff = sum(1 for a, b in zip(expected, output) if a != b)
+            diff += abs(len(expected) - len(output))
+            print(f"  OUTPUT DIFFERS from {args.compare}: {diff} item(s)")
+            return 1
+        print(f"  output identical to {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,9 @@ from datetime import datetime
 import pyautogui
 
 from src.constants import (
+    DEFAULT_CAPTURE_BACKEND,
     DEFAULT_CONFIG,
+    DEFAULT_OCR_CACHE,
     DEFAULT_UI,
     GACHA_DEFAULT_PREPROCESSING,
     GACHA_EXTRA_REGIONS,
@@ -38,6 +40,7 @@ def _default_inventory_growth_block(screen_w: int, screen_h: int) -> dict:
             "skip_rows_after_scroll": 1,
             "scroll_duration_ms": 700,
             "scroll_settle_ms": 500,
+            "frame_fps": 20,
         }
 
     cx, cy = screen_w // 2, screen_h // 2
@@ -58,6 +61,7 @@ def _default_inventory_growth_block(screen_w: int, screen_h: int) -> dict:
         "skip_rows_after_scroll": 1,
         "scroll_duration_ms": 700,
         "scroll_settle_ms": 500,
+        "frame_fps": 20,
     }
 
 
@@ -98,8 +102,13 @@ def _default_gacha_block(screen_w: int, screen_h: int) -> dict:
         "page_number": [center_x - 20, page_y, 40, 32],
         "btn_prev": [center_x - 70, page_y, 36, 32],
         "btn_next": [center_x + 30, page_y, 36, 32],
-        "click_delay_ms": 150,
+        # Page turns finish when the rows change and then hold still for
+        # ocr_settle_ms; click_delay_ms is the floor, the timeout the fallback.
+        "click_delay_ms": 50,
         "ocr_settle_ms": 100,
+        "page_turn_timeout_ms": 1500,
+        # Background capture rate while scanning; 0 = fixed click + settle sleeps
+        "frame_fps": 20,
         "preprocessing": dict(GACHA_DEFAULT_PREPROCESSING),
     }
 
@@ -179,14 +188,20 @@ class ConfigManager:
                     defaults = _default_gacha_block(screen_w, screen_h)
                     gacha[key] = defaults[key]
                     changed = True
-            for key in ("click_delay_ms", "ocr_settle_ms", "preprocessing"):
+            for key in (
+                "click_delay_ms",
+                "ocr_settle_ms",
+                "page_turn_timeout_ms",
+                "frame_fps",
+                "preprocessing",
+            ):
                 if key not in gacha:
                     defaults = _default_gacha_block(*pyautogui.size())
                     gacha[key] = defaults[key]
                     changed = True
             # Migrate previous stock defaults → current recommended defaults
-            if gacha.get("click_delay_ms") in (800, 270):
-                gacha["click_delay_ms"] = 150
+            if gacha.get("click_delay_ms") in (800, 270, 150):
+                gacha["click_delay_ms"] = 50
                 changed = True
             if gacha.get("ocr_settle_ms") in (500, 170):
                 gacha["ocr_settle_ms"] = 100
@@ -294,6 +309,21 @@ class ConfigManager:
         self.config["ocr_languages"] = cleaned
         self.save_config()
 
+    def get_capture_backend(self) -> str:
+        name = self.config.get("capture_backend")
+        if not isinstance(name, str) or not name.strip():
+            return DEFAULT_CAPTURE_BACKEND
+        return name.strip().lower()
+
+    def get_ocr_cache(self) -> dict:
+        cache = self.config.get("ocr_cache")
+        merged = dict(DEFAULT_OCR_CACHE)
+        if isinstance(cache, dict):
+            merged.update(
+                {k: v for k, v in cache.items() if k in DEFAULT_OCR_CACHE}
+            )
+        return merged
+
     def set_always_on_top(self, enabled: bool) -> None:
         ui = self.get_ui()
         ui["always_on_top"] = bool(enabled)
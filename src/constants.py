@@ -133,8 +133,19 @@ OCR_LANG_CUSTOM_CHOICES = (
     ("hi", "Hindi"),
 )
 
+# Screen capture backend for OCR grabs (see src/core/capture.py): pil | mss | fake
+DEFAULT_CAPTURE_BACKEND = "pil"
+
+# OCR result cache (src/core/ocr.py OCRCache); persist keeps it across sessions.
+DEFAULT_OCR_CACHE = {
+    "max_entries": 4096,
+    "persist": False,
+}
+
 DEFAULT_CONFIG = {
     "ocr_languages": [OCR_LANG_EN],
+    "capture_backend": DEFAULT_CAPTURE_BACKEND,
+    "ocr_cache": dict(DEFAULT_OCR_CACHE),
     "preprocessing": {
         "threshold": 140,
         "adaptive": True,
@@ -0,0 +1,178 @@
+"""Screen capture backends behind safe_grab / grab_frame.
+
+Backends take an already screen-clipped (left, top, right, bottom) box and
+return an RGB uint8 array they own (callers may keep frames around).
+
+- ``pil``  - PIL.ImageGrab (default; works everywhere the app runs)
+- ``mss``  - persistent mss handle per thread (GDI DC / XShm segment reused
+  between grabs instead of being set up on every call); needs ``pip install mss``
+- ``fake`` - crops a stored full-screen array or image file (tests / tooling)
+"""
+
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+DEFAULT_BACKEND = "pil"
+
+
+class CaptureBackend(ABC):
+    name = "base"
+
+    def screen_size(self) -> Tuple[int, int]:
+        import pyautogui
+
+        w, h = pyautogui.size()
+        return int(w), int(h)
+
+    @abstractmethod
+    def grab(self, box: Box) -> Optional[np.ndarray]:
+        """RGB pixels of a screen-clipped (left, top, right, bottom) box."""
+
+    def release_thread(self) -> None:
+        """Free what the calling thread holds (capture threads call it on exit)."""
+
+    def close(self) -> None:
+        pass
+
+
+class PILBackend(CaptureBackend):
+    name = "pil"
+
+    def grab(self, box: Box) -> Optional[np.ndarray]:
+        from PIL import ImageGrab
+
+        return np.array(ImageGrab.grab(bbox=box))
+
+
+class MSSBackend(CaptureBackend):
+    """mss with one long-lived handle per thread (mss handles are not shareable)."""
+
+    name = "mss"
+
+    def __init__(self):
+        import mss  # noqa: F401 - fail at construction so the registry can fall back
+
+        self._local = threading.local()
+
+    def _sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss
+
+            sct = mss.mss()
+            self._local.sct = sct
+        return sct
+
+    def grab(self, box: Box) -> Optional[np.ndarray]:
+        import cv2
+
+        left, top, right, bottom = box
+        shot = self._sct().grab(
+            {"left": left, "top": top, "width": right - left, "height": bottom - top}
+        )
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(
+            shot.height, shot.width, 4
+        )
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB)
+
+    def release_thread(self) -> None:
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+    def close(self) -> None:
+        # Other threads' handles are released by those threads (release_thread).
+        self.release_thread()
+
+
+class ArrayBackend(CaptureBackend):
+    """Serve grabs from an in-memory full-screen RGB array (no display needed)."""
+
+    name = "fake"
+
+    def __init__(self, frame: Optional[np.ndarray] = None):
+        self._lock = threading.Lock()
+        self.frame = frame
+
+    def set_frame(self, frame: Optional[np.ndarray]) -> None:
+        with self._lock:
+            self.frame = frame
+
+    def load(self, path: str) -> None:
+        from PIL import Image
+
+        self.set_frame(np.array(Image.open(path).convert("RGB")))
+
+    def screen_size(self) -> Tuple[int, int]:
+        frame = self.frame
+        if frame is None:
+            return 0, 0
+        h, w = frame.shape[:2]
+        return int(w), int(h)
+
+    def grab(self, box: Box) -> Optional[np.ndarray]:
+        with self._lock:
+            frame = self.frame
+        if frame is None:
+            return None
+        left, top, right, bottom = box
+        return frame[top:bottom, left:right].copy()
+
+
+_FACTORIES: Dict[str, Callable[[], CaptureBackend]] = {
+    PILBackend.name: PILBackend,
+    MSSBackend.name: MSSBackend,
+    ArrayBackend.name: ArrayBackend,
+}
+_active: Optional[CaptureBackend] = None
+_active_lock = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[], CaptureBackend]) -> None:
+    _FACTORIES[name] = factory
+
+
+def backend_names() -> List[str]:
+    return list(_FACTORIES)
+
+
+def create_backend(name: str) -> CaptureBackend:
+    """Build a backend by name; raises KeyError / ImportError if unusable."""
+    return _FACTORIES[name]()
+
+
+def set_backend(backend) -> CaptureBackend:
+    """Activate a backend (instance or registry name) for all screen grabs.
+
+    Unknown or unavailable names fall back to PIL so capture keeps working.
+    """
+    global _active
+    if isinstance(backend, CaptureBackend):
+        new = backend
+    else:
+        try:
+            new = create_backend(str(backend or DEFAULT_BACKEND))
+        except Exception as e:
+            print(f"Capture backend {backend!r} unavailable ({e}) - using PIL")
+            new = PILBackend()
+    with _active_lock:
+        old, _active = _active, new
+    if old is not None and old is not new:
+        old.close()
+    return new
+
+
+def get_backend() -> CaptureBackend:
+    global _active
+    with _active_lock:
+        if _active is None:
+            _active = PILBackend()
+        return _active
@@ -0,0 +1,132 @@
+"""Background screen capture into a small ring buffer of timestamped frames.
+
+Scanners click, note time.monotonic(), then ask for the first frame captured
+after that moment instead of sleeping a fixed settle delay and grabbing
+synchronously. Capture cost runs on its own thread, off the OCR path.
+
+fingerprint / frames_differ give a cheap pixel diff so a scanner can tell
+when a page turn has landed without OCR'ing the page number.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from src.core.capture import CaptureBackend, get_backend
+from src.core.scanner import ScreenFrame, grab_frame, union_bbox
+
+# A pixel "changed" when its downsampled gray level moves this much (0-255);
+# the area changed when more than this fraction of pixels did. A single
+# timestamp digit flipping clears it; compositor noise does not.
+_DIFF_PIXEL = 24
+_DIFF_FRACTION = 0.002
+
+
+def fingerprint(img: Optional[np.ndarray], scale: int = 2) -> Optional[np.ndarray]:
+    """Downsampled grayscale copy of img for cheap frame-to-frame comparison."""
+    if img is None or img.size == 0:
+        return None
+    rgb = img[:, :, :3] if img.ndim == 3 else img
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY) if rgb.ndim == 3 else rgb
+    h, w = gray.shape[:2]
+    size = (max(1, w // scale), max(1, h // scale))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def frames_differ(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> bool:
+    """True when two fingerprints show a visible change (or cannot be compared)."""
+    if a is None or b is None or a.shape != b.shape:
+        return True
+    moved = np.count_nonzero(np.abs(a - b) > _DIFF_PIXEL)
+    return moved > a.size * _DIFF_FRACTION
+
+
+class FrameSource:
+    def __init__(
+        self,
+        bboxes: Iterable[Sequence[int]],
+        *,
+        fps: float = 20.0,
+        capacity: int = 8,
+    ):
+        self.bbox: Optional[List[int]] = union_bbox(bboxes)
+        self.interval = 1.0 / max(1.0, float(fps))
+        self._frames: Deque[ScreenFrame] = deque(maxlen=max(2, int(capacity)))
+        self._cond = threading.Condition()
+        self._halt = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "FrameSource":
+        if self.running or self.bbox is None:
+            return self
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._halt.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=2.0)
+        with self._cond:
+            self._frames.clear()
+            self._cond.notify_all()
+
+    def __enter__(self) -> "FrameSource":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        # Backends can hold per-thread handles (mss); each scan starts a new
+        # thread, so release them here rather than leak one per scan.
+        used: List[CaptureBackend] = []
+        try:
+            while not self._halt.is_set():
+                backend = get_backend()
+                if backend not in used:
+                    used.append(backend)
+                frame = grab_frame([self.bbox])
+                if frame.img is not None:
+                    with self._cond:
+                        self._frames.append(frame)
+                        self._cond.notify_all()
+                spent = time.monotonic() - frame.timestamp
+                self._halt.wait(max(0.0, self.interval - spent))
+        finally:
+            for backend in used:
+                backend.release_thread()
+
+    def latest(self) -> Optional[ScreenFrame]:
+        with self._cond:
+            return self._frames[-1] if self._frames else None
+
+    def frames_since(self, after: float) -> List[ScreenFrame]:
+        """Buffered frames captured after `after` (oldest first)."""
+        with self._cond:
+            return [f for f in self._frames if f.timestamp > after]
+
+    def wait_newer(self, after: float, timeout: float = 2.0) -> Optional[ScreenFrame]:
+        """First frame whose grab started after `after`; None on timeout/stop."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            while True:
+                for f in self._frames:
+                    if f.timestamp > after:
+                        return f
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._halt.is_set():
+                    return None
+                self._cond.wait(remaining)
@@ -0,0 +1,461 @@
+"""Columnar (NumPy) engine behind build_stats_report.
+
+The dict-based functions in gacha_stats call is_elite_* and friends on
+every pull, for every statistic. Here a timeline is encoded once into
+integer-coded columns (source, type, rarity, pool, 50/50, pity kind) plus
+pity / index arrays; normalizers run once per distinct value and every
+statistic is a handful of array operations. Outputs are identical to the
+dict-based functions (same keys, values, and dict ordering).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.gacha_pool import is_standard_elite_doll, is_standard_elite_weapon
+from src.core.gacha_stats import (
+    CAMPAIGN_SOURCES,
+    DOLL_PITY_SOURCES,
+    ELITE_HARD_PITY,
+    FIFTY_FIFTY_SOURCES,
+    MAX_COPIES,
+    STANDARD_SOURCE,
+    WEAPON_PITY_SOURCES,
+    WORST_PULLS_V6,
+    _streak_stats,
+    banner_label,
+    normalize_rarity,
+    normalize_source,
+)
+
+RARITIES = ("elite", "standard", "retired")
+POOLS = (None, "standard", "premium")
+FIFTIES = (None, "win", "loss", "guaranteed")
+PITY_KINDS = (None, "doll", "weapon", "standard")
+
+ELITE, STANDARD, RETIRED = 0, 1, 2
+POOL_STANDARD, POOL_PREMIUM = 1, 2
+WIN, LOSS, GUARANTEED = 1, 2, 3
+KIND_DOLL, KIND_WEAPON, KIND_STANDARD = 1, 2, 3
+NO_PITY = -1
+
+
+def _encode(
+    values: Iterable[Any], label: Optional[Callable[[Any], Any]] = None
+) -> Tuple[np.ndarray, List[Any]]:
+    """Integer codes + code → label list; label() runs once per distinct value."""
+    raw_code: Dict[Any, int] = {}
+    label_code: Dict[Any, int] = {}
+    labels: List[Any] = []
+    codes = []
+    for v in values:
+        c = raw_code.get(v)
+        if c is None:
+            lab = label(v) if label is not None else v
+            c = label_code.get(lab)
+            if c is None:
+                c = label_code[lab] = len(labels)
+                labels.append(lab)
+            raw_code[v] = c
+        codes.append(c)
+    return np.asarray(codes, dtype=np.int32), labels
+
+
+def _fixed_codes(values: Iterable[Any], table: Tuple[Any, ...]) -> np.ndarray:
+    lookup = {v: i for i, v in enumerate(table)}
+    return np.fromiter((lookup[v] for v in values), dtype=np.int8)
+
+
+def _code_of(labels: List[Any], wanted: Iterable[Any]) -> List[int]:
+    wanted = set(wanted)
+    return [i for i, lab in enumerate(labels) if lab in wanted]
+
+
+def _group_rank(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stable sort by code → (order, 0-based position in sorted, group start)."""
+    order = np.argsort(codes, kind="stable")
+    ordered = codes[order]
+    pos = np.arange(len(codes))
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    group_start = np.maximum.accumulate(np.where(starts, pos, 0))
+    return order, pos, group_start
+
+
+def _last_reset_before(
+    reset_sorted: np.ndarray, pos: np.ndarray, group_start: np.ndarray
+) -> np.ndarray:
+    """Sorted position of the previous reset in the same group (group_start-1 if none)."""
+    acc = np.maximum.accumulate(np.where(reset_sorted, pos, -1))
+    prev = np.empty_like(acc)
+    if len(acc):
+        prev[0] = -1
+        prev[1:] = acc[:-1]
+    return np.maximum(prev, group_start - 1)
+
+
+def _first_seen(codes: np.ndarray) -> np.ndarray:
+    """Distinct codes in order of first appearance."""
+    uniq, first = np.unique(codes, return_index=True)
+    return uniq[np.argsort(first)]
+
+
+class Timeline:
+    """Oldest → newest pulls as parallel arrays (see module docstring)."""
+
+    def __init__(self, n: int):
+        self.n = n
+
+    # -- construction ------------------------------------------------------
+
+    @classmethod
+    def from_pulls(
+        cls, pulls: List[Dict[str, Any]], *, pre_annotated: bool = False
+    ) -> "Timeline":
+        """Encode raw pulls (annotating them) or rows already annotated."""
+        tl = cls(len(pulls))
+        tl.src, tl.sources = _encode(
+            (p.get("purchase_source") for p in pulls), normalize_source
+        )
+        tl.itype, tl.types = _encode(p.get("item_type") for p in pulls)
+        tl.names = np.array([p.get("item_name") for p in pulls], dtype=object)
+        tl.times = np.array([p.get("purchase_time") for p in pulls], dtype=object)
+        # is_elite_doll & co. read rarity_color, the display fields read rarity.
+        color, colors = _encode(
+            (p.get("rarity_color") for p in pulls), normalize_rarity
+        )
+        tl.elite = np.isin(color, _code_of(colors, ("elite",)))
+        if pre_annotated:
+            tl.rarity = _fixed_codes((p.get("rarity") for p in pulls), RARITIES)
+            tl.pool = _fixed_codes((p.get("elite_pool") for p in pulls), POOLS)
+            tl.fifty = _fixed_codes((p.get("fifty_fifty") for p in pulls), FIFTIES)
+            tl.kind = _fixed_codes((p.get("pity_kind") for p in pulls), PITY_KINDS)
+            tl.pity = np.fromiter(
+                (NO_PITY if p.get("pity") is None else p["pity"] for p in pulls),
+                dtype=np.int64,
+                count=tl.n,
+            )
+            tl.source_index = np.fromiter(
+                (p.get("source_index") or 0 for p in pulls), dtype=np.int64, count=tl.n
+            )
+            tl.pull_index = np.array([p.get("pull_index") for p in pulls], dtype=object)
+            tl.banner, tl.banners = _encode(p.get("banner") for p in pulls)
+        else:
+            tl.rarity = np.array([RARITIES.index(c) for c in colors], dtype=np.int8)[color]
+            tl._annotate()
+        return tl
+
+    def _annotate(self) -> None:
+        """Vectorized annotate_pulls: source_index, pity, pool, 50/50."""
+        n = self.n
+        src = self.src
+        is_doll = np.isin(self.itype, _code_of(self.types, ("Doll",)))
+        is_weapon = np.isin(self.itype, _code_of(self.types, ("Weapons",)))
+        doll_src = np.isin(src, _code_of(self.sources, DOLL_PITY_SOURCES))
+        weapon_src = np.isin(src, _code_of(self.sources, WEAPON_PITY_SOURCES))
+        std_src = np.isin(src, _code_of(self.sources, (STANDARD_SOURCE,)))
+
+        self.kind = np.zeros(n, dtype=np.int8)
+        self.kind[doll_src] = KIND_DOLL
+        self.kind[weapon_src] = KIND_WEAPON
+        self.kind[std_src] = KIND_STANDARD
+
+        order, pos, group_start = _group_rank(src)
+        self.source_index = np.empty(n, dtype=np.int64)
+        self.source_index[order] = pos - group_start + 1
+
+        elite_doll = doll_src & self.elite & is_doll
+        elite_weapon = weapon_src & self.elite & is_weapon
+        reset = elite_doll | elite_weapon | (std_src & self.elite)
+        last = _last_reset_before(reset[order], pos, group_start)
+        self.pity = np.full(n, NO_PITY, dtype=np.int64)
+        self.pity[order] = pos - last
+        self.pity[self.kind == 0] = NO_PITY
+
+        self.pool = np.zeros(n, dtype=np.int8)
+        for mask, check in (
+            (elite_doll, is_standard_elite_doll),
+            (elite_weapon, is_standard_elite_weapon),
+        ):
+            idx = np.flatnonzero(mask)
+            cache: Dict[Any, bool] = {}
+            for i in idx:
+                name = self.names[i]
+                std = cache.get(name)
+                if std is None:
+                    std = cache[name] = check(name)
+                self.pool[i] = POOL_STANDARD if std else POOL_PREMIUM
+
+        # 50/50: standard-pool Elite = loss; after a loss the next one is
+        # guaranteed; otherwise a win. Only the previous event matters.
+        self.fifty = np.zeros(n, dtype=np.int8)
+        for code in _code_of(self.sources, FIFTY_FIFTY_SOURCES):
+            idx = np.flatnonzero((src == code) & (self.pool != 0))
+            if idx.size == 0:
+                continue
+            loss = self.pool[idx] == POOL_STANDARD
+            prev_loss = np.zeros(idx.size, dtype=bool)
+            prev_loss[1:] = loss[:-1]
+            self.fifty[idx] = np.where(
+                loss, LOSS, np.where(prev_loss, GUARANTEED, WIN)
+            )
+
+        self.pull_index = np.arange(1, n + 1, dtype=object)
+        per_source, self.banners = _encode(banner_label(s) for s in self.sources)
+        self.banner = per_source[src]
+
+    def select(self, mask: np.ndarray) -> "Timeline":
+        sub = Timeline(int(np.count_nonzero(mask)))
+        for key, value in self.__dict__.items():
+            if isinstance(value, np.ndarray) and value.shape == (self.n,):
+                setattr(sub, key, value[mask])
+            elif key != "n":
+                setattr(sub, key, value)
+        return sub
+
+    def _source_mask(self, source: str) -> np.ndarray:
+        want = normalize_source(source)
+        return np.isin(self.src, _code_of(self.sources, (want,)))
+
+    def of_source(self, source: str) -> "Timeline":
+        return self.select(self._source_mask(source))
+
+    def _type_mask(self, item_type: str) -> np.ndarray:
+        return np.isin(self.itype, _code_of(self.types, (item_type,)))
+
+    def history(
+        self,
+        *,
+        purchase_source: Optional[str] = None,
+        item_type: Optional[str] = None,
+        rarity: Optional[str] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """build_history as an index array: (newest-first row indices, summary)."""
+        scope = np.ones(self.n, dtype=bool)
+        if purchase_source:
+            scope &= self._source_mask(purchase_source)
+        summary = self.select(scope).summary()
+
+        display = scope.copy()
+        if item_type:
+            display &= self._type_mask(item_type)
+        if rarity:
+            display &= self.rarity == RARITIES.index(normalize_rarity(rarity))
+        if item_type or rarity or purchase_source:
+            vis = self.select(display).summary()
+            for key in ("total", "elite_dolls", "elite_weapons", "standard", "retired", "banners"):
+                summary[key] = vis[key]
+        return np.flatnonzero(display)[::-1], summary
+
+    # -- statistics ----------------------------------------------------------
+
+    def current_pity_by_source(self) -> Dict[str, int]:
+        """Pulls since the last pity reset, per source in first-seen order."""
+        out: Dict[str, int] = {}
+        for code in _first_seen(self.src):
+            label = self.sources[code]
+            if label in DOLL_PITY_SOURCES:
+                wanted = "Doll"
+            elif label in WEAPON_PITY_SOURCES:
+                wanted = "Weapons"
+            elif label == STANDARD_SOURCE:
+                wanted = None
+            else:
+                continue
+            rows = self.src == code
+            reset = rows & self.elite
+            if wanted is not None:
+                reset &= self._type_mask(wanted)
+            idx = np.flatnonzero(rows)
+            resets = np.flatnonzero(reset)
+            after = idx.size if resets.size == 0 else np.count_nonzero(idx > resets[-1])
+            out[label] = int(after)
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        rarity_counts = np.bincount(self.rarity, minlength=len(RARITIES))
+        is_doll = self._type_mask("Doll")
+        is_weapon = self._type_mask("Weapons")
+        elite_dolls = int(np.count_nonzero(self.elite & is_doll))
+        elite_weapons = int(np.count_nonzero(self.elite & is_weapon))
+
+        banner_counts = np.bincount(self.banner, minlength=len(self.banners))
+        banners = {
+            self.banners[c]: int(banner_counts[c])
+            for c in _first_seen(self.banner)
+        }
+        pity_now = self.current_pity_by_source()
+
+        targeted = np.isin(self.src, _code_of(self.sources, ("Targeted Procurement",)))
+        hits = np.flatnonzero((self.elite & is_doll)[targeted])
+        if hits.size:
+            gaps = np.diff(np.concatenate(([-1], hits)))
+            avg_doll_gap = round(int(gaps.sum()) / int(gaps.size), 1)
+        else:
+            avg_doll_gap = None
+
+        return {
+            "total": self.n,
+            "elite_dolls": elite_dolls,
+            "elite_weapons": elite_weapons,
+            "standard": int(rarity_counts[STANDARD]),
+            "retired": int(rarity_counts[RETIRED]),
+            "banners": banners,
+            "pity_by_source": pity_now,
+            "pity_doll": pity_now.get("Targeted Procurement", 0),
+            "pity_weapon": pity_now.get("Military Upgrade", 0),
+            "pity_custom_doll": pity_now.get("Custom Procurement - Dolls", 0),
+            "pity_custom_weapon": pity_now.get("Custom Procurement - Weapons", 0),
+            "pity_standard": pity_now.get(STANDARD_SOURCE, 0),
+            "hard_pity": ELITE_HARD_PITY,
+            "avg_elite_doll_gap": avg_doll_gap,
+        }
+
+    def _pity_value(self, i: int) -> Optional[int]:
+        v = int(self.pity[i])
+        return None if v == NO_PITY else v
+
+    def campaigns(self) -> List[Dict[str, Any]]:
+        campaigns: List[Dict[str, Any]] = []
+        for source, item_type in CAMPAIGN_SOURCES:
+            rows = np.flatnonzero(
+                np.isin(self.src, _code_of(self.sources, (source,)))
+            )
+            if rows.size == 0:
+                continue
+            premium = (
+                self._type_mask(item_type)[rows]
+                & (self.rarity[rows] == ELITE)
+                & (self.pool[rows] == POOL_PREMIUM)
+            )
+            cand = rows[premium]
+            by_name: Dict[str, List[int]] = {}
+            for i in cand:
+                name = self.names[i]
+                if name:
+                    by_name.setdefault(name, []).append(int(i))
+            if not by_name:
+                continue
+
+            si = self.source_index[rows]
+            fifty = self.fifty[rows]
+            monotonic = bool(np.all(si[1:] >= si[:-1]))
+            cums = {
+                code: np.concatenate(([0], np.cumsum(fifty == code)))
+                for code in (LOSS, WIN, GUARANTEED)
+            }
+
+            def _window_count(code: int, lo: int, hi: int) -> int:
+                if monotonic:
+                    a = np.searchsorted(si, lo, side="left")
+                    b = np.searchsorted(si, hi, side="right")
+                    return int(cums[code][b] - cums[code][a])
+                return int(np.count_nonzero((si >= lo) & (si <= hi) & (fifty == code)))
+
+            for name, copies in by_name.items():
+                first = copies[0]
+                end_idx = min(len(copies), MAX_COPIES) - 1
+                last = copies[end_idx]
+                extras = max(0, len(copies) - MAX_COPIES)
+                first_si = int(self.source_index[first])
+                last_si = int(self.source_index[last])
+                first_pity = self._pity_value(first) or 1
+                pulls_spent = last_si - first_si + first_pity
+                window_start = first_si - first_pity + 1
+                window_end = last_si
+                copy_segments: List[int] = []
+                prev_end = window_start - 1
+                for c in copies[: end_idx + 1]:
+                    c_si = int(self.source_index[c])
+                    copy_segments.append(c_si - prev_end)
+                    prev_end = c_si
+                n = end_idx + 1
+                campaigns.append(
+                    {
+                        "name": name,
+                        "item_type": item_type,
+                        "banner": banner_label(source),
+                        "purchase_source": source,
+                        "copies": n,
+                        "extras": extras,
+                        "potential": f"V{n - 1}" if n else "—",
+                        "complete": n >= MAX_COPIES,
+                        "pulls_spent": pulls_spent,
+                        "copy_segments": copy_segments,
+                        "first_pity": first_pity,
+                        "fifty_losses": _window_count(LOSS, window_start, window_end),
+                        "fifty_wins": _window_count(WIN, window_start, window_end),
+                        "fifty_guaranteed": _window_count(
+                            GUARANTEED, window_start, window_end
+                        ),
+                        "luck_ratio": round(pulls_spent / WORST_PULLS_V6, 3),
+                        "first_time": self.times[first],
+                        "last_time": self.times[last],
+                        "first_index": self.pull_index[first],
+                        "last_index": self.pull_index[last],
+                    }
+                )
+
+        campaigns.sort(key=lambda c: (-c["pulls_spent"], c["name"]))
+        return campaigns
+
+    def fifty_fifty_summary(self) -> Dict[str, Any]:
+        by_banner: Dict[str, Dict[str, Any]] = {}
+        sequences: Dict[str, List[Dict[str, Any]]] = {}
+        guarantee: Dict[str, bool] = {}
+        for src in FIFTY_FIFTY_SOURCES:
+            label = banner_label(src)
+            idx = np.flatnonzero(
+                np.isin(self.src, _code_of(self.sources, (src,))) & (self.fifty != 0)
+            )
+            codes = self.fifty[idx]
+            outcomes = [FIFTIES[c] for c in codes]
+            seq = [
+                {
+                    "outcome": FIFTIES[c],
+                    "name": self.names[i] or "",
+                    "time": self.times[i] or "",
+                    "pity": self._pity_value(i),
+                }
+                for i, c in zip(idx, codes)
+            ]
+            counts = np.bincount(codes, minlength=len(FIFTIES))
+            wins, losses, guaranteed = (
+                int(counts[WIN]),
+                int(counts[LOSS]),
+                int(counts[GUARANTEED]),
+            )
+            decided = wins + losses
+            win_streaks = _streak_stats(outcomes, "win")
+            loss_streaks = _streak_stats(outcomes, "loss")
+            by_banner[label] = {
+                "wins": wins,
+                "losses": losses,
+                "guaranteed": guaranteed,
+                "decided": decided,
+                "win_rate": round(100.0 * wins / decided, 1) if decided else None,
+                "longest_win_streak": win_streaks["longest"],
+                "longest_loss_streak": loss_streaks["longest"],
+                "current_win_streak": win_streaks["current"],
+                "current_loss_streak": loss_streaks["current"],
+                "sequence": outcomes,
+            }
+            sequences[label] = seq
+            guarantee[src] = bool(codes.size) and int(codes[-1]) == LOSS
+
+        return {
+            "by_banner": by_banner,
+            "sequences": sequences,
+            "guarantee_premium_doll": guarantee.get("Targeted Procurement", False),
+            "guarantee_premium_weapon": guarantee.get("Military Upgrade", False),
+        }
+
+    def activity_by_day(self) -> Dict[str, int]:
+        """YYYY-MM-DD → pull count, days in order of first appearance."""
+        # U10 truncates like [:10]; shorter strings are not a full date.
+        days = np.array([t or "" for t in self.times], dtype="U10")
+        days = days[np.char.str_len(days) == 10]
+        uniq, first, counts = np.unique(days, return_index=True, return_counts=True)
+        return {str(uniq[k]): int(counts[k]) for k in np.argsort(first)}
@@ -7,6 +7,7 @@ OTs-14 weapon). Always pass item_type so catalogs never cross-match.
 from __future__ import annotations
 
 import re
+from collections import Counter
 from difflib import SequenceMatcher
 from functools import lru_cache
 from pathlib import Path
@@ -211,6 +212,94 @@ def _similarity(a: str, b: str) -> float:
     return ratio * (0.55 + 0.45 * len_pen)
 
 
+def _length_bound(la: int, lc: int, overlap: int) -> float:
+    """Upper bound of _similarity for lengths la, lc sharing `overlap` characters.
+
+    SequenceMatcher can only match characters both strings have, so its ratio
+    is at most 2 * overlap / (la + lc); substring hits need the whole shorter
+    string present (overlap == shorter).
+    """
+    shorter, longer = min(la, lc), max(la, lc)
+    len_pen = shorter / longer
+    bound = 2.0 * overlap / (la + lc) * (0.55 + 0.45 * len_pen)
+    if overlap == shorter and shorter >= 4:
+        bound = max(bound, max(0.82, len_pen) if len_pen >= 0.85 else len_pen * 0.9)
+    return bound
+
+
+class _NameIndex:
+    """One catalog prepared for resolve_item_name.
+
+    Exact and compact lookups are dict hits. Fuzzy candidates are filtered by
+    length bucket, then by how many characters they share with the query (a
+    per-character count bound - bigram filters would drop real matches, since
+    SequenceMatcher also credits single-character matches). Only candidates
+    whose bound can still reach min_ratio go through _similarity, in catalog
+    order, so the result is the same as scoring the whole catalog.
+    """
+
+    def __init__(self, catalog: Tuple[str, ...]):
+        self.lower = {n.lower(): n for n in catalog}
+        self.compact: Dict[str, str] = {}
+        for n in catalog:
+            self.compact.setdefault(_compact(n), n)
+        self.keys = list(self.compact)
+        self.counts = [Counter(c) for c in self.keys]
+        self.by_length: Dict[int, List[int]] = {}
+        for i, c in enumerate(self.keys):
+            self.by_length.setdefault(len(c), []).append(i)
+
+    def candidates(self, compact_raw: str, min_ratio: float) -> List[int]:
+        la = len(compact_raw)
+        counts = Counter(compact_raw)
+        # Float slack so a bound equal to the real score never drops it.
+        floor = min_ratio - 1e-9
+        out: List[int] = []
+        for lc, indices in self.by_length.items():
+            bonus = min(0.02, lc * 0.0005)
+            if _length_bound(la, lc, min(la, lc)) + bonus < floor:
+                continue
+            for i in indices:
+                other = self.counts[i]
+                overlap = sum(min(n, other[ch]) for ch, n in counts.items())
+                if _length_bound(la, lc, overlap) + bonus >= floor:
+                    out.append(i)
+        out.sort()
+        return out
+
+    def resolve(self, text: str, min_ratio: float) -> str:
+        hit = self.lower.get(text.lower())
+        if hit is not None:
+            return hit
+
+        compact_raw = _compact(text)
+        if not compact_raw:
+            return text
+        hit = self.compact.get(compact_raw)
+        if hit is not None:
+            return hit
+
+        best_name = text
+        best_score = 0.0
+        for i in self.candidates(compact_raw, min_ratio):
+            c = self.keys[i]
+            score = _similarity(compact_raw, c)
+            adj = score + min(0.02, len(c) * 0.0005)
+            if adj > best_score:
+                best_score = adj
+                best_name = self.compact[c]
+
+        if best_score >= min_ratio and best_name != text:
+            return best_name
+        return text
+
+
+@lru_cache(maxsize=8)
+def _name_index(catalog: Tuple[str, ...]) -> _NameIndex:
+    """Built once per catalog (the typed catalogs are cached tuples themselves)."""
+    return _NameIndex(catalog)
+
+
 def resolve_item_name(
     raw: str,
     *,
@@ -230,41 +319,12 @@ def resolve_item_name(
         if not kind:
             # Without a type, refuse fuzzy cross-catalog matches — only exact
             # case-insensitive hit against the union.
-            lower_map = {n.lower(): n for n in all_canonical_names()}
-            return lower_map.get(text.lower(), text)
+            return _name_index(all_canonical_names()).lower.get(text.lower(), text)
         catalog = canonical_names_for_type(kind)
 
     if not catalog:
         return text
-
-    lower_map = {n.lower(): n for n in catalog}
-    if text.lower() in lower_map:
-        return lower_map[text.lower()]
-
-    compact_raw = _compact(text)
-    if not compact_raw:
-        return text
-
-    compact_map: Dict[str, str] = {}
-    for n in catalog:
-        c = _compact(n)
-        compact_map.setdefault(c, n)
-
-    if compact_raw in compact_map:
-        return compact_map[compact_raw]
-
-    best_name = text
-    best_score = 0.0
-    for c, n in compact_map.items():
-        score = _similarity(compact_raw, c)
-        adj = score + min(0.02, len(c) * 0.0005)
-        if adj > best_score:
-            best_score = adj
-            best_name = n
-
-    if best_score >= min_ratio and best_name != text:
-        return best_name
-    return text
+    return _name_index(catalog).resolve(text, min_ratio)
 
 
 def propose_name_fixes(
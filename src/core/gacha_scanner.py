@@ -5,12 +5,17 @@ from __future__ import annotations
 import re
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pyautogui
 
-from src.core.scanner import safe_grab
+from src.constants import GACHA_ROW_COLUMNS
+from src.core.frame_source import FrameSource, fingerprint, frames_differ
+from src.core.ocr import OCRSpec
+from src.core.scanner import ScreenFrame, grab_frame, safe_grab, union_bbox
 from src.data.gacha_db import GachaDB
 
 TIMESTAMP_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s*(\d{2}:\d{2}:\d{2})")
@@ -31,6 +36,9 @@ KNOWN_SOURCES = (
     "Standard Procurement",
 )
 
+# Screen poll interval while waiting for a page turn without a FrameSource.
+_TURN_POLL_S = 0.03
+
 STATUS_CB = Optional[Callable[[str], None]]
 PULL_CB = Optional[Callable[[Dict], None]]
 
@@ -78,6 +86,16 @@ def classify_rarity_color(img: np.ndarray) -> str:
     return "retired"
 
 
+def _is_full_timestamp(text: str) -> bool:
+    """Exactly one well-formed timestamp - safe to teach the glyph atlas."""
+    return TIMESTAMP_RE.fullmatch(text.strip()) is not None
+
+
+def _is_page_number(text: str) -> bool:
+    text = text.strip()
+    return text.isdigit() and 0 < int(text) < 10000
+
+
 def clean_timestamp(text: str) -> str:
     if not text:
         return ""
@@ -188,6 +206,7 @@ class GachaScanner:
         self.ocr = ocr_processor
         self.db = db or GachaDB()
         self._stop = False
+        self._source: Optional[FrameSource] = None
 
     def request_stop(self):
         self._stop = True
@@ -201,22 +220,152 @@ class GachaScanner:
 
     def _delays(self) -> Tuple[float, float]:
         gacha = self.config_manager.get_gacha()
-        click_ms = int(gacha.get("click_delay_ms", 150))
+        click_ms = int(gacha.get("click_delay_ms", 50))
         settle_ms = int(gacha.get("ocr_settle_ms", 100))
         return click_ms / 1000.0, settle_ms / 1000.0
 
+    def _turn_timeout(self) -> float:
+        gacha = self.config_manager.get_gacha()
+        return max(0.1, int(gacha.get("page_turn_timeout_ms", 1500)) / 1000.0)
+
     def _status(self, cb: STATUS_CB, msg: str):
         if cb:
             cb(msg)
 
-    def read_page_number(self) -> Optional[int]:
+    def _frame_regions(self) -> List[List[int]]:
+        """Every cell of the table plus the page number (one frame covers all)."""
+        gacha = self.config_manager.get_gacha()
+        regions = [
+            row[col]
+            for row in gacha.get("rows", [])
+            for col in GACHA_ROW_COLUMNS
+            if row.get(col)
+        ]
+        if gacha.get("page_number"):
+            regions.append(gacha["page_number"])
+        return regions
+
+    @contextmanager
+    def _frame_source(self):
+        """Capture the table on a background thread while scanning (frame_fps > 0)."""
+        fps = float(self.config_manager.get_gacha().get("frame_fps", 0) or 0)
+        if fps <= 0:
+            yield
+            return
+        self._source = FrameSource(self._frame_regions(), fps=fps).start()
+        try:
+            yield
+        finally:
+            self._source.stop()
+            self._source = None
+
+    def _rows_bbox(self) -> Optional[List[int]]:
+        gacha = self.config_manager.get_gacha()
+        return union_bbox(
+            row[col]
+            for row in gacha.get("rows", [])
+            for col in GACHA_ROW_COLUMNS
+            if row.get(col)
+        )
+
+    def _page_frame(self) -> ScreenFrame:
+        """Fresh frame of the table + page number."""
+        if self._source is not None:
+            frame = self._source.wait_newer(time.monotonic(), timeout=1.0)
+            if frame is not None:
+                return frame
+        return grab_frame(self._frame_regions())
+
+    def _next_frame(self, after: float, timeout: float) -> Optional[ScreenFrame]:
+        if self._source is not None:
+            return self._source.wait_newer(after, timeout=timeout)
+        time.sleep(min(timeout, _TURN_POLL_S))
+        return grab_frame(self._frame_regions())
+
+    def _turn_fingerprint(self, frame: ScreenFrame) -> List[Optional[np.ndarray]]:
+        """Fingerprints of the rows and the page number (what a page turn changes)."""
+        gacha = self.config_manager.get_gacha()
+        boxes = [self._rows_bbox(), gacha.get("page_number")]
+        return [fingerprint(frame.crop(b)) for b in boxes if b]
+
+    @staticmethod
+    def _turn_differs(
+        a: List[Optional[np.ndarray]], b: List[Optional[np.ndarray]]
+    ) -> bool:
+        return len(a) != len(b) or any(frames_differ(x, y) for x, y in zip(a, b))
+
+    def turn_page(self, key: str, before: ScreenFrame) -> Tuple[ScreenFrame, bool]:
+        """Click Prev/Next, wait until the page changes and then holds still.
+
+        Returns (settled frame, changed). changed=False means the click had no
+        visible effect within page_turn_timeout_ms (already on first/last page).
+        Rows and page number are compared, so a next page whose rows look
+        the same still counts as a turn. The table must stay unchanged for
+        ocr_settle_ms, and nothing is accepted sooner than click_delay_ms
+        after the click. A page that changed but was still moving at the
+        timeout is given ocr_settle_ms more and grabbed once again.
+        """
+        click_delay, settle = self._delays()
+        base = self._turn_fingerprint(before)
+
+        self.click_bbox(key)
+        clicked = time.monotonic()
+        deadline = clicked + self._turn_timeout()
+        after = clicked
+        frame = before
+        last_fp = None
+        still_since = clicked
+
+        while not self._stop:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            nxt = self._next_frame(after, remaining)
+            if nxt is None:
+                break
+            after = nxt.timestamp
+            if nxt.img is None:
+                continue
+            frame = nxt
+            fp = self._turn_fingerprint(nxt)
+            if last_fp is None:
+                # Still showing the old page?
+                if self._turn_differs(fp, base):
+                    last_fp = fp
+                    still_since = nxt.timestamp
+                continue
+            if self._turn_differs(fp, last_fp):
+                last_fp = fp
+                still_since = nxt.timestamp
+                continue
+            if (
+                nxt.timestamp - still_since >= settle
+                and nxt.timestamp - clicked >= click_delay
+            ):
+                return nxt, True
+
+        if last_fp is None:
+            return frame, False
+        if not self._stop:
+            # Changed but never held still: don't OCR a mid-animation frame.
+            time.sleep(settle)
+            fresh = self._page_frame()
+            if fresh.img is not None:
+                frame = fresh
+        return frame, True
+
+    def read_page_number(self, frame: Optional[ScreenFrame] = None) -> Optional[int]:
         gacha = self.config_manager.get_gacha()
-        img = safe_grab(gacha["page_number"])
-        text = self.ocr.extract_text(
+        if frame is not None:
+            img = frame.crop(gacha["page_number"])
+        else:
+            img = safe_grab(gacha["page_number"])
+        text = self.ocr.extract_glyphs(
             img,
             is_number=True,
             config=self._ocr_config(),
             allowlist="0123456789",
+            validate=_is_page_number,
         )
         return parse_page_number(text)
 
@@ -226,32 +375,30 @@ class GachaScanner:
         pyautogui.click(cx, cy)
 
     def go_to_page_one(self, status_cb: STATUS_CB = None, max_clicks: int = 200) -> bool:
-        """Click Prev until page OCR reads 1. Returns False if aborted/failed."""
-        click_delay, settle = self._delays()
-        page = self.read_page_number()
+        """Click Prev until the table stops changing. Returns False if aborted."""
+        frame = self._page_frame()
+        page = self.read_page_number(frame)
         self._status(status_cb, f"Current page: {page if page is not None else '?'}")
+        if page == 1:
+            return True
 
         clicks = 0
-        while page is not None and page != 1 and clicks < max_clicks:
+        while clicks < max_clicks:
             if self._stop:
                 return False
-            prev = page
-            self.click_bbox("btn_prev")
-            time.sleep(click_delay)
-            time.sleep(settle)
-            page = self.read_page_number()
-            clicks += 1
-            self._status(status_cb, f"Going to page 1… now {page}")
-            if page == prev:
+            frame, changed = self.turn_page("btn_prev", frame)
+            if not changed:
                 break
-
-        final = self.read_page_number()
-        return final == 1 or final is None
+            clicks += 1
+            self._status(status_cb, f"Going to page 1… back {clicks}")
+        return not self._stop
 
     def scan_current_page(
-        self, ordinals: Optional[Dict[Tuple[str, str], int]] = None
+        self,
+        ordinals: Optional[Dict[Tuple[str, str], int]] = None,
+        frame: Optional[ScreenFrame] = None,
     ) -> List[Dict]:
-        """OCR all 6 rows on the current Access Records page."""
+        """OCR all 6 rows on the current Access Records page (or a given frame)."""
         if ordinals is None:
             ordinals = defaultdict(int)
 
@@ -259,20 +406,34 @@ class GachaScanner:
         cfg = self._ocr_config()
         pulls: List[Dict] = []
 
-        for row in gacha.get("rows", []):
-            time_img = safe_grab(row["purchase_time"])
-            source_img = safe_grab(row["purchase_source"])
-            type_img = safe_grab(row["type"])
-            name_img = safe_grab(row["name"])
-
-            raw_time = self.ocr.extract_text(
-                time_img,
-                config=cfg,
-                allowlist="0123456789-: ",
+        rows = gacha.get("rows", [])
+        # One grab for the whole table; each cell is a view into that frame.
+        if frame is None:
+            frame = grab_frame(
+                row[col] for row in rows for col in GACHA_ROW_COLUMNS if row.get(col)
             )
-            raw_source = self.ocr.extract_text(source_img, config=cfg)
-            raw_type = self.ocr.extract_text(type_img, config=cfg)
-            raw_name = self.ocr.extract_text(name_img, config=cfg)
+
+        time_spec = OCRSpec(
+            allowlist="0123456789-: ", config=cfg, validate=_is_full_timestamp
+        )
+        text_spec = OCRSpec(config=cfg)
+        crops, specs = [], []
+        for row in rows:
+            crops += [frame.crop(row[col]) for col in GACHA_ROW_COLUMNS]
+            specs += [
+                time_spec if col == "purchase_time" else text_spec
+                for col in GACHA_ROW_COLUMNS
+            ]
+        texts = self.ocr.extract_batch(crops, specs)
+
+        width = len(GACHA_ROW_COLUMNS)
+        for r, row in enumerate(rows):
+            cells = dict(zip(GACHA_ROW_COLUMNS, texts[r * width : (r + 1) * width]))
+            name_img = crops[r * width + GACHA_ROW_COLUMNS.index("name")]
+            raw_time = cells["purchase_time"]
+            raw_source = cells["purchase_source"]
+            raw_type = cells["type"]
+            raw_name = cells["name"]
 
             purchase_time = clean_timestamp(raw_time)
             purchase_source = clean_source(raw_source)
@@ -300,6 +461,16 @@ class GachaScanner:
 
         return pulls
 
+    def _ocr_and_save(
+        self, frame: ScreenFrame, ordinals: Dict[Tuple[str, str], int]
+    ) -> Tuple[List[Dict], int, int]:
+        """OCR one captured page and store it → (pulls, inserted, known)."""
+        pulls = self.scan_current_page(ordinals, frame)
+        if not pulls:
+            return pulls, 0, 0
+        inserted, known = self.db.insert_pulls(pulls)
+        return pulls, inserted, known
+
     def scan_all_pages(
         self,
         status_cb: STATUS_CB = None,
@@ -311,10 +482,22 @@ class GachaScanner:
         stuck/empty, or until a full page of pulls is already in the DB
         (incremental catch-up after the first full history scan).
 
+        OCR + DB writes for a captured page run on a worker thread while this
+        thread already turns to the next page; the speculative next frame is
+        dropped when the worker reports a catch-up or an empty page.
+
         Returns summary dict with inserted/skipped/pages/pulls/caught_up.
         """
         self._stop = False
-        click_delay, settle = self._delays()
+        with self._frame_source():
+            return self._scan_all_pages(status_cb, on_pull, max_pages)
+
+    def _scan_all_pages(
+        self,
+        status_cb: STATUS_CB,
+        on_pull: PULL_CB,
+        max_pages: int,
+    ) -> Dict:
         ordinals: Dict[Tuple[str, str], int] = defaultdict(int)
         session_pulls: List[Dict] = []
         inserted_total = 0
@@ -323,65 +506,59 @@ class GachaScanner:
 
         self._status(status_cb, "Resetting to page 1…")
         self.go_to_page_one(status_cb=status_cb)
-        time.sleep(settle)
 
         pages_scanned = 0
-        prev_page: Optional[int] = None
-
-        while pages_scanned < max_pages:
-            if self._stop:
-                self._status(status_cb, "Scan stopped.")
-                break
-
-            page = self.read_page_number()
-            self._status(
-                status_cb,
-                f"Scanning page {page if page is not None else pages_scanned + 1}…",
-            )
-
-            page_pulls = self.scan_current_page(ordinals)
-            if not page_pulls:
-                self._status(status_cb, "Empty page — finished.")
-                break
-
-            ins, known = self.db.insert_pulls(page_pulls)
-            inserted_total += ins
-            skipped_total += known
-            for p in page_pulls:
-                session_pulls.append(p)
-                if on_pull:
-                    on_pull(p)
-
-            pages_scanned += 1
-            prev_page = page
-
-            # Records are newest→oldest. A 10-pull often spans pages, e.g.
-            # page 1: 6 new, page 2: 4 new + 2 already known. Once we see any
-            # known pull on a page (after saving that page's new ones), every
-            # older page is already in the DB — stop without walking history.
-            if known > 0:
-                caught_up = True
-                self._status(
-                    status_cb,
-                    f"Caught up — hit {known} known pull(s) on this page. "
-                    f"New this run: {inserted_total}.",
-                )
-                break
-
-            if self._stop:
-                break
-
-            self.click_bbox("btn_next")
-            time.sleep(click_delay)
-            time.sleep(settle)
-
-            new_page = self.read_page_number()
-            if new_page is not None and prev_page is not None and new_page == prev_page:
-                self._status(status_cb, "Next page unchanged — finished.")
-                break
-            if new_page is not None and prev_page is not None and new_page < prev_page:
-                self._status(status_cb, "Page did not advance — finished.")
-                break
+        frame = self._page_frame()
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="gacha-ocr") as worker:
+            while pages_scanned < max_pages:
+                if self._stop:
+                    self._status(status_cb, "Scan stopped.")
+                    break
+
+                self._status(status_cb, f"Scanning page {pages_scanned + 1}…")
+
+                # Page N is OCR'd + saved in the worker while we turn to N+1.
+                job = worker.submit(self._ocr_and_save, frame, ordinals)
+                next_frame, changed = frame, False
+                if not self._stop and pages_scanned + 1 < max_pages:
+                    next_frame, changed = self.turn_page("btn_next", frame)
+
+                page_pulls, ins, known = job.result()
+                if not page_pulls:
+                    self._status(status_cb, "Empty page — finished.")
+                    break
+
+                inserted_total += ins
+                skipped_total += known
+                for p in page_pulls:
+                    session_pulls.append(p)
+                    if on_pull:
+                        on_pull(p)
+
+                pages_scanned += 1
+
+                # Records are newest→oldest. A 10-pull often spans pages, e.g.
+                # page 1: 6 new, page 2: 4 new + 2 already known. Once we see any
+                # known pull on a page (after saving that page's new ones), every
+                # older page is already in the DB — stop without walking history.
+                if known > 0:
+                    caught_up = True
+                    self._status(
+                        status_cb,
+                        f"Caught up — hit {known} known pull(s) on this page. "
+                        f"New this run: {inserted_total}.",
+                    )
+                    break
+
+                if self._stop:
+                    continue
+                if pages_scanned >= max_pages:
+                    break
+                if not changed:
+                    self._status(status_cb, "Next page unchanged — finished.")
+                    break
+                frame = next_frame
 
         if not caught_up and not self._stop:
             self._status(
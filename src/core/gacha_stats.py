@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from collections import Counter, defaultdict
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.core.gacha_pool import is_standard_elite_doll, is_standard_elite_weapon
@@ -52,8 +54,15 @@ def normalize_rarity(value: Optional[str]) -> str:
     return "retired"
 
 
+@lru_cache(maxsize=256)
 def normalize_source(value: Optional[str]) -> str:
-    """Canonical banner name (handles OCR variants)."""
+    """Canonical banner name (handles OCR variants).
+
+    GachaDB stores canonical names and PullAnnotator writes them onto every
+    annotated pull, so the compute_* functions compare purchase_source as is;
+    this runs on raw input only (and is memoized - a timeline has a handful
+    of distinct sources).
+    """
     return clean_source(value or "") or (value or "").strip()
 
 
@@ -100,28 +109,59 @@ def is_premium_elite(pull: Dict[str, Any]) -> bool:
     return False
 
 
-def annotate_pulls(pulls_oldest_first: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Add pull_index, per-source pity, source_index, and 50/50 outcome.
+class PullAnnotator:
+    """Running per-source pity / source_index / 50/50 state over a timeline.
 
-    Pity is consecutive pulls within one Purchase Source only.
-    50/50 applies only to Targeted Procurement (dolls) and Military Upgrade
-    (weapons): standard-pool Elite = loss; other Elite = win (or guaranteed).
+    annotate_pulls feeds a whole timeline through one of these; GachaDB keeps
+    the output in pull_annotations and resumes from the stored rows (see
+    resume) so only pulls after the first new or edited row are replayed.
     """
-    pity_by_source: Dict[str, int] = defaultdict(int)
-    source_index: Dict[str, int] = defaultdict(int)
-    guarantee_doll = False
-    guarantee_weapon = False
-    out: List[Dict[str, Any]] = []
 
-    for i, raw in enumerate(pulls_oldest_first, start=1):
+    def __init__(self):
+        self.count = 0
+        self.pity_by_source: Dict[str, int] = defaultdict(int)
+        self.source_index: Dict[str, int] = defaultdict(int)
+        self.guarantee_doll = False
+        self.guarantee_weapon = False
+
+    @classmethod
+    def resume(
+        cls,
+        count: int,
+        last_by_source: List[Dict[str, Any]],
+        last_fifty: Dict[str, Optional[str]],
+    ) -> "PullAnnotator":
+        """State after `count` annotated pulls.
+
+        last_by_source: newest annotated row of each source;
+        last_fifty: newest fifty_fifty outcome per pity_kind ("doll"/"weapon").
+        """
+        state = cls()
+        state.count = int(count)
+        for row in last_by_source:
+            src = row["purchase_source"]
+            state.source_index[src] = int(row["source_index"])
+            if row.get("pity") is None:
+                continue
+            reset = row.get("elite_pool") is not None or (
+                row.get("pity_kind") == "standard" and row.get("rarity") == "elite"
+            )
+            state.pity_by_source[src] = 0 if reset else int(row["pity"])
+        state.guarantee_doll = last_fifty.get("doll") == "loss"
+        state.guarantee_weapon = last_fifty.get("weapon") == "loss"
+        return state
+
+    def annotate(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         p = dict(raw)
+        self.count += 1
+        pity_by_source = self.pity_by_source
         src = normalize_source(p.get("purchase_source"))
         p["purchase_source"] = src
-        p["pull_index"] = i
+        p["pull_index"] = self.count
         p["rarity"] = normalize_rarity(p.get("rarity_color"))
         p["banner"] = banner_label(src)
-        source_index[src] += 1
-        p["source_index"] = source_index[src]
+        self.source_index[src] += 1
+        p["source_index"] = self.source_index[src]
 
         pity_val = None
         pity_kind = None
@@ -140,13 +180,13 @@ def annotate_pulls(pulls_oldest_first: List[Dict[str, Any]]) -> List[Dict[str, A
                 if src in FIFTY_FIFTY_SOURCES:
                     if pool == "standard":
                         fifty = "loss"
-                        guarantee_doll = True
-                    elif guarantee_doll:
+                        self.guarantee_doll = True
+                    elif self.guarantee_doll:
                         fifty = "guaranteed"
-                        guarantee_doll = False
+                        self.guarantee_doll = False
                     else:
                         fifty = "win"
-                        guarantee_doll = False
+                        self.guarantee_doll = False
                 pity_by_source[src] = 0
         elif src in WEAPON_PITY_SOURCES:
             pity_by_source[src] += 1
@@ -160,13 +200,13 @@ def annotate_pulls(pulls_oldest_first: List[Dict[str, Any]]) -> List[Dict[str, A
                 if src in FIFTY_FIFTY_SOURCES:
                     if pool == "standard":
                         fifty = "loss"
-                        guarantee_weapon = True
-                    elif guarantee_weapon:
+                        self.guarantee_weapon = True
+                    elif self.guarantee_weapon:
                         fifty = "guaranteed"
-                        guarantee_weapon = False
+                        self.guarantee_weapon = False
                     else:
                         fifty = "win"
-                        guarantee_weapon = False
+                        self.guarantee_weapon = False
                 pity_by_source[src] = 0
         elif src == STANDARD_SOURCE:
             # Pity only — Elites here are random pool hits, not 50/50 outcomes.
@@ -180,9 +220,18 @@ def annotate_pulls(pulls_oldest_first: List[Dict[str, Any]]) -> List[Dict[str, A
         p["pity_kind"] = pity_kind
         p["elite_pool"] = pool
         p["fifty_fifty"] = fifty
-        out.append(p)
+        return p
 
-    return out
+
+def annotate_pulls(pulls_oldest_first: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add pull_index, per-source pity, source_index, and 50/50 outcome.
+
+    Pity is consecutive pulls within one Purchase Source only.
+    50/50 applies only to Targeted Procurement (dolls) and Military Upgrade
+    (weapons): standard-pool Elite = loss; other Elite = win (or guaranteed).
+    """
+    annotator = PullAnnotator()
+    return [annotator.annotate(raw) for raw in pulls_oldest_first]
 
 
 def current_pity_by_source(
@@ -191,7 +240,7 @@ def current_pity_by_source(
     """Current pity remaining on each source after the newest pull."""
     pity_by_source: Dict[str, int] = defaultdict(int)
     for p in annotated_oldest_first:
-        src = normalize_source(p.get("purchase_source"))
+        src = p.get("purchase_source")
         if src in DOLL_PITY_SOURCES:
             pity_by_source[src] += 1
             if is_elite_doll(p):
@@ -218,8 +267,7 @@ def compute_summary(annotated: List[Dict[str, Any]]) -> Dict[str, Any]:
     doll_gaps: List[int] = []
     gap = 0
     for p in annotated:
-        src = normalize_source(p.get("purchase_source"))
-        if src != "Targeted Procurement":
+        if p.get("purchase_source") != "Targeted Procurement":
             continue
         gap += 1
         if is_elite_doll(p):
@@ -252,24 +300,28 @@ def build_history(
     purchase_source: Optional[str] = None,
     item_type: Optional[str] = None,
     rarity: Optional[str] = None,
+    pre_annotated: bool = False,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
-    """Annotate full chronology with per-source pity, then filter for display."""
-    annotated = annotate_pulls(list(pulls_oldest_first))
+    """Annotate full chronology with per-source pity, then filter for display.
+
+    Pass pre_annotated=True for rows that already carry the annotation
+    (GachaDB.list_annotated).
+    """
+    if pre_annotated:
+        annotated = list(pulls_oldest_first)
+    else:
+        annotated = annotate_pulls(list(pulls_oldest_first))
 
     pity_scope = annotated
     if purchase_source:
         want = normalize_source(purchase_source)
-        pity_scope = [
-            p for p in annotated if normalize_source(p.get("purchase_source")) == want
-        ]
+        pity_scope = [p for p in annotated if p.get("purchase_source") == want]
     summary = compute_summary(pity_scope)
 
     display = annotated
     if purchase_source:
         want = normalize_source(purchase_source)
-        display = [
-            p for p in display if normalize_source(p.get("purchase_source")) == want
-        ]
+        display = [p for p in display if p.get("purchase_source") == want]
     if item_type:
         display = [p for p in display if p.get("item_type") == item_type]
     if rarity:
@@ -288,25 +340,56 @@ def build_history(
     return list(reversed(display)), summary
 
 
+# Premium campaigns: banner source -> item type whose featured Elites count.
+CAMPAIGN_SOURCES = (
+    ("Targeted Procurement", "Doll"),
+    ("Military Upgrade", "Weapons"),
+)
+
+
+class _FiftyWindows:
+    """Prefix sums of 50/50 outcomes over one source, keyed by source_index.
+
+    Pulls arrive oldest first, so source_index is ascending and a window
+    [lo, hi] is two bisects and three subtractions. If a timeline ever breaks
+    that order, count() falls back to scanning.
+    """
+
+    def __init__(self):
+        self.source_index: List[int] = []
+        self.outcomes: List[Optional[str]] = []
+        self.sums = {"loss": [0], "win": [0], "guaranteed": [0]}
+        self.ascending = True
+
+    def add(self, si: int, outcome: Optional[str]) -> None:
+        if self.source_index and si < self.source_index[-1]:
+            self.ascending = False
+        self.source_index.append(si)
+        self.outcomes.append(outcome)
+        for kind, sums in self.sums.items():
+            sums.append(sums[-1] + (outcome == kind))
+
+    def count(self, lo: int, hi: int) -> Dict[str, int]:
+        if not self.ascending:
+            counts = {kind: 0 for kind in self.sums}
+            for si, outcome in zip(self.source_index, self.outcomes):
+                if lo <= si <= hi and outcome in counts:
+                    counts[outcome] += 1
+            return counts
+        a = bisect_left(self.source_index, lo)
+        b = bisect_right(self.source_index, hi)
+        return {kind: sums[b] - sums[a] for kind, sums in self.sums.items()}
+
+
 def _campaign_for_name(
-    source_pulls: List[Dict[str, Any]],
+    copies: List[Dict[str, Any]],
+    windows: _FiftyWindows,
     name: str,
     *,
     item_type: str,
     source: str,
-) -> Optional[Dict[str, Any]]:
+) -> Dict[str, Any]:
     """Spend from first copy (including its pity) through last copy (≤ V6)."""
-    copies = [
-        p
-        for p in source_pulls
-        if p.get("item_name") == name
-        and p.get("item_type") == item_type
-        and p.get("rarity") == "elite"
-        and p.get("elite_pool") == "premium"
-    ]
-    if not copies:
-        return None
-
     first = copies[0]
     # Campaign completes at 7th copy (V6); extras beyond that are noted separately
     end_idx = min(len(copies), MAX_COPIES) - 1
@@ -329,20 +412,7 @@ def _campaign_for_name(
         copy_segments.append(si - prev_end)
         prev_end = si
 
-    losses = 0
-    wins = 0
-    guaranteed = 0
-    for p in source_pulls:
-        si = int(p["source_index"])
-        if si < window_start or si > window_end:
-            continue
-        ff = p.get("fifty_fifty")
-        if ff == "loss":
-            losses += 1
-        elif ff == "win":
-            wins += 1
-        elif ff == "guaranteed":
-            guaranteed += 1
+    fifty = windows.count(window_start, window_end)
 
     n = end_idx + 1
     return {
@@ -357,9 +427,9 @@ def _campaign_for_name(
         "pulls_spent": pulls_spent,
         "copy_segments": copy_segments,
         "first_pity": first_pity,
-        "fifty_losses": losses,
-        "fifty_wins": wins,
-        "fifty_guaranteed": guaranteed,
+        "fifty_losses": fifty["loss"],
+        "fifty_wins": fifty["win"],
+        "fifty_guaranteed": fifty["guaranteed"],
         "luck_ratio": round(pulls_spent / WORST_PULLS_V6, 3),
         "first_time": first.get("purchase_time"),
         "last_time": last.get("purchase_time"),
@@ -369,35 +439,44 @@ def _campaign_for_name(
 
 
 def compute_campaigns(annotated_oldest_first: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Premium character/weapon campaigns on Targeted / Military Upgrade."""
+    """Premium character/weapon campaigns on Targeted / Military Upgrade.
+
+    Dict-based reference for Timeline.campaigns, which is what
+    build_stats_report runs; scripts/bench_stats.py checks the two agree.
+    One pass over the timeline collects each banner's premium copies per name
+    (first-seen order) and its 50/50 prefix sums; each campaign window is
+    then a lookup instead of a rescan of the banner.
+    """
+    item_types = dict(CAMPAIGN_SOURCES)
+    windows = {source: _FiftyWindows() for source in item_types}
+    copies: Dict[str, Dict[str, List[Dict[str, Any]]]] = {s: {} for s in item_types}
+    for p in annotated_oldest_first:
+        source = p.get("purchase_source")
+        item_type = item_types.get(source)
+        if item_type is None:
+            continue
+        windows[source].add(int(p["source_index"]), p.get("fifty_fifty"))
+        if (
+            p.get("item_type") == item_type
+            and p.get("rarity") == "elite"
+            and p.get("elite_pool") == "premium"
+        ):
+            n = p.get("item_name") or ""
+            if n:
+                copies[source].setdefault(n, []).append(p)
+
     campaigns: List[Dict[str, Any]] = []
-    for source, item_type in (
-        ("Targeted Procurement", "Doll"),
-        ("Military Upgrade", "Weapons"),
-    ):
-        source_pulls = [
-            p
-            for p in annotated_oldest_first
-            if normalize_source(p.get("purchase_source")) == source
-        ]
-        names: List[str] = []
-        seen = set()
-        for p in source_pulls:
-            if (
-                p.get("item_type") == item_type
-                and p.get("rarity") == "elite"
-                and p.get("elite_pool") == "premium"
-            ):
-                n = p.get("item_name") or ""
-                if n and n not in seen:
-                    seen.add(n)
-                    names.append(n)
-        for name in names:
-            c = _campaign_for_name(
-                source_pulls, name, item_type=item_type, source=source
+    for source, item_type in CAMPAIGN_SOURCES:
+        for name, name_copies in copies[source].items():
+            campaigns.append(
+                _campaign_for_name(
+                    name_copies,
+                    windows[source],
+                    name,
+                    item_type=item_type,
+                    source=source,
+                )
             )
-            if c:
-                campaigns.append(c)
 
     campaigns.sort(key=lambda c: (-c["pulls_spent"], c["name"]))
     return campaigns
@@ -443,7 +522,7 @@ def compute_fifty_fifty_summary(
         seq: List[Dict[str, Any]] = []
         outcomes: List[str] = []
         for p in annotated_oldest_first:
-            if normalize_source(p.get("purchase_source")) != src:
+            if p.get("purchase_source") != src:
                 continue
             ff = p.get("fifty_fifty")
             if not ff:
@@ -483,7 +562,7 @@ def compute_fifty_fifty_summary(
     g_doll = False
     g_weap = False
     for p in annotated_oldest_first:
-        src = normalize_source(p.get("purchase_source"))
+        src = p.get("purchase_source")
         if src == "Targeted Procurement" and p.get("fifty_fifty"):
             g_doll = p["fifty_fifty"] == "loss"
         elif src == "Military Upgrade" and p.get("fifty_fifty"):
@@ -557,26 +636,28 @@ def build_stats_report(
     pulls_oldest_first: List[Dict[str, Any]],
     *,
     purchase_source: Optional[str] = None,
+    pre_annotated: bool = False,
 ) -> Dict[str, Any]:
     """Full stats payload for the Gacha Stats tab.
 
     Pity annotation always uses the full timeline; display metrics can be
-    limited to one Purchase Source via purchase_source.
+    limited to one Purchase Source via purchase_source. pre_annotated=True skips
+    the replay for rows from GachaDB.list_annotated.
+
+    Computed on the columnar engine (src.core.gacha_columns); the dict-based
+    compute_* functions above are the reference it matches.
     """
-    annotated_full = annotate_pulls(list(pulls_oldest_first))
-    annotated = annotated_full
+    # Lazy: gacha_columns imports this module.
+    from src.core.gacha_columns import Timeline
+
+    timeline = Timeline.from_pulls(list(pulls_oldest_first), pre_annotated=pre_annotated)
     if purchase_source:
-        want = normalize_source(purchase_source)
-        annotated = [
-            p
-            for p in annotated_full
-            if normalize_source(p.get("purchase_source")) == want
-        ]
-
-    summary = compute_summary(annotated)
-    campaigns = compute_campaigns(annotated)
-    fifty = compute_fifty_fifty_summary(annotated)
-    activity = compute_activity_by_day(annotated)
+        timeline = timeline.of_source(purchase_source)
+
+    summary = timeline.summary()
+    campaigns = timeline.campaigns()
+    fifty = timeline.fifty_fifty_summary()
+    activity = timeline.activity_by_day()
 
     rarity = {
         "Elite": summary["elite_dolls"] + summary["elite_weapons"],
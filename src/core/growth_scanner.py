@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import re
 import time
+from contextlib import contextmanager
 from typing import Callable, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 import pyautogui
 
+from src.core.frame_source import FrameSource, fingerprint, frames_differ
 from src.core.growth_names import parse_perks_from_text, parse_type_line
-from src.core.scanner import safe_grab
+from src.core.ocr import OCRSpec
+from src.core.scanner import ScreenFrame, grab_frame, safe_grab
 from src.data.inventory_db import InventoryDB
 
 StatusCB = Optional[Callable[[str], None]]
@@ -74,9 +77,16 @@ def has_orange_lock(img: Optional[np.ndarray], *, min_pixels: int = 18) -> bool:
     """True if region has a compact orange padlock blob (not a full-width rarity bar)."""
     if img is None or img.size == 0:
         return False
+    return _is_lock_blob(_lock_mask(img), min_pixels)
+
+
+def _lock_mask(img: np.ndarray) -> np.ndarray:
     rgb = img[:, :, :3] if img.ndim == 3 else img
     hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
-    mask = cv2.inRange(hsv, _LOCK_HSV_LOW, _LOCK_HSV_HIGH)
+    return cv2.inRange(hsv, _LOCK_HSV_LOW, _LOCK_HSV_HIGH)
+
+
+def _is_lock_blob(mask: np.ndarray, min_pixels: int) -> bool:
     count = int(cv2.countNonZero(mask))
     if count < min_pixels:
         return False
@@ -102,6 +112,52 @@ def has_orange_lock(img: Optional[np.ndarray], *, min_pixels: int = 18) -> bool:
     return True
 
 
+def lock_bitmap(
+    frame: ScreenFrame,
+    grid: List[int],
+    cols: int,
+    rows: int,
+    inset: List[int],
+    *,
+    min_pixels: int = 18,
+) -> Optional[np.ndarray]:
+    """has_orange_lock for every cell_lock_inset window of a grid frame.
+
+    One HSV conversion and inRange over the frame; the windows are picked out
+    of a sliding-window view of the mask and pixel-counted together. Only
+    windows that pass the count / rarity-bar checks get the per-blob aspect
+    test. Returns a (rows, cols) bool array, or None without a frame.
+    """
+    if frame.img is None:
+        return None
+    ix, iy, iw, ih = [int(v) for v in inset]
+    iw, ih = max(1, iw), max(1, ih)
+    ox, oy = frame.origin
+    xs = np.array([cell_bbox(grid, cols, rows, c, 0)[0] + ix - ox for c in range(cols)])
+    ys = np.array([cell_bbox(grid, cols, rows, 0, r)[1] + iy - oy for r in range(rows)])
+
+    mask = _lock_mask(frame.img)
+    # Windows past the captured area (screen edge) read as no ink.
+    pad_l = max(0, -int(xs.min()))
+    pad_t = max(0, -int(ys.min()))
+    pad_r = max(0, int(xs.max()) + iw - mask.shape[1])
+    pad_b = max(0, int(ys.max()) + ih - mask.shape[0])
+    if pad_l or pad_t or pad_r or pad_b:
+        mask = cv2.copyMakeBorder(
+            mask, pad_t, pad_b, pad_l, pad_r, cv2.BORDER_CONSTANT, value=0
+        )
+    views = np.lib.stride_tricks.sliding_window_view(mask, (ih, iw))
+    windows = views[np.ix_(ys + pad_t, xs + pad_l)]  # (rows, cols, ih, iw)
+
+    counts = np.count_nonzero(windows, axis=(2, 3))
+    # Same cheap rejections as _is_lock_blob, for the whole grid at once.
+    candidates = (counts >= min_pixels) & (counts <= iw * ih * 0.55)
+    locked = np.zeros((rows, cols), dtype=bool)
+    for r, c in zip(*np.nonzero(candidates)):
+        locked[r, c] = _is_lock_blob(windows[r, c], min_pixels)
+    return locked
+
+
 def parse_own_count(text: str) -> Optional[int]:
     m = re.search(r"(\d+)\s*/\s*\d+", text or "")
     if m:
@@ -116,6 +172,8 @@ class GrowthScanner:
         self.ocr = ocr_processor
         self.db = db or InventoryDB()
         self._stop = False
+        self._source: Optional[FrameSource] = None
+        self._clicked_at: Optional[float] = None
 
     def stop(self) -> None:
         self._stop = True
@@ -144,11 +202,96 @@ class GrowthScanner:
         bbox = cell_lock_bbox(grid, cols, rows, col, row, inset)
         return has_orange_lock(safe_grab(bbox), min_pixels=14)
 
-    def is_detail_locked(self) -> bool:
+    def grid_lock_bitmap(self) -> Optional[np.ndarray]:
+        """(rows, cols) lock badges for the visible page from one grid grab."""
+        cfg = self._cfg()
+        grid = cfg["grid"]
+        cols = int(cfg.get("cols", 14))
+        rows = int(cfg.get("rows", 6))
+        inset = cfg.get("cell_lock_inset") or [8, 40, 36, 36]
+        frame = grab_frame(
+            cell_lock_bbox(grid, cols, rows, c, r, inset)
+            for r in range(rows)
+            for c in range(cols)
+        )
+        return lock_bitmap(frame, grid, cols, rows, inset, min_pixels=14)
+
+    @contextmanager
+    def _frame_source(self):
+        """Capture the detail panel on a background thread (frame_fps > 0)."""
+        cfg = self._cfg()
+        fps = float(cfg.get("frame_fps", 0) or 0)
+        regions = [cfg[k] for k in ("type", "perks", "lock_btn") if cfg.get(k)]
+        if fps <= 0 or not regions:
+            yield
+            return
+        self._source = FrameSource(regions, fps=fps).start()
+        try:
+            yield
+        finally:
+            self._source.stop()
+            self._source = None
+            self._clicked_at = None
+
+    def _detail_frame(self, after: Optional[float] = None) -> Optional[ScreenFrame]:
+        """Buffered detail frame once the panel has held still.
+
+        Only frames from after `after` count (default: last click +
+        click_delay_ms), and the type / perks / lock area must then stay
+        unchanged for ocr_settle_ms - like GachaScanner.turn_page - so a
+        panel still showing or animating from the previous cell is not read.
+        Falls back to the newest frame if it never settles.
+        None without a frame source - callers then grab each region directly.
+        """
+        if self._source is None:
+            return None
+        cfg = self._cfg()
+        delay = int(cfg.get("click_delay_ms", 80)) / 1000.0
+        settle = int(cfg.get("ocr_settle_ms", 250)) / 1000.0
+        if after is None:
+            after = (
+                self._clicked_at + delay
+                if self._clicked_at is not None
+                else time.monotonic()
+            )
+        regions = [cfg[k] for k in ("type", "perks", "lock_btn") if cfg.get(k)]
+        deadline = max(after, time.monotonic()) + settle + 2.0
+        frame: Optional[ScreenFrame] = None
+        last_fp: Optional[List] = None
+        still_since = after
+        while not self._stop:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            nxt = self._source.wait_newer(after, timeout=remaining)
+            if nxt is None:
+                break
+            after = nxt.timestamp
+            if nxt.img is None:
+                continue
+            frame = nxt
+            fp = [fingerprint(nxt.crop(r)) for r in regions]
+            if last_fp is None or any(
+                frames_differ(a, b) for a, b in zip(fp, last_fp)
+            ):
+                last_fp = fp
+                still_since = nxt.timestamp
+                continue
+            if nxt.timestamp - still_since >= settle:
+                return nxt
+        return frame
+
+    @staticmethod
+    def _grab(bbox, frame: Optional[ScreenFrame]) -> Optional[np.ndarray]:
+        if frame is not None:
+            return frame.crop(bbox)
+        return safe_grab(bbox)
+
+    def is_detail_locked(self, frame: Optional[ScreenFrame] = None) -> bool:
         bbox = self._cfg().get("lock_btn")
         if not bbox:
             return False
-        return has_orange_lock(safe_grab(bbox), min_pixels=12)
+        return has_orange_lock(self._grab(bbox, frame), min_pixels=12)
 
     def click_cell(self, col: int, row: int) -> None:
         cfg = self._cfg()
@@ -156,8 +299,10 @@ class GrowthScanner:
             cfg["grid"], int(cfg.get("cols", 14)), int(cfg.get("rows", 6)), col, row
         )
         pyautogui.click(x, y)
-        self._sleep_ms("click_delay_ms", 80)
-        self._sleep_ms("ocr_settle_ms", 250)
+        self._clicked_at = time.monotonic()
+        if self._source is None:
+            self._sleep_ms("click_delay_ms", 80)
+            self._sleep_ms("ocr_settle_ms", 250)
 
     def click_detail_lock(self) -> None:
         bbox = self._cfg().get("lock_btn")
@@ -167,11 +312,11 @@ class GrowthScanner:
         pyautogui.click(x + w // 2, y + h // 2)
         self._sleep_ms("lock_click_delay_ms", 120)
 
-    def ocr_region(self, key: str) -> str:
+    def ocr_region(self, key: str, frame: Optional[ScreenFrame] = None) -> str:
         bbox = self._cfg().get(key)
         if not bbox:
             return ""
-        img = safe_grab(bbox)
+        img = self._grab(bbox, frame)
         if img is None:
             return ""
         return self.ocr.extract_text(img, config=self.config_manager.config)
@@ -179,10 +324,15 @@ class GrowthScanner:
     def read_own_count(self) -> Optional[int]:
         return parse_own_count(self.ocr_region("own_count"))
 
-    def parse_detail(self) -> Optional[Dict]:
+    def parse_detail(self, frame: Optional[ScreenFrame] = None) -> Optional[Dict]:
         """OCR type + perks only (no name/icon identity)."""
-        type_raw = self.ocr_region("type")
-        perks_raw = self.ocr_region("perks")
+        cfg = self._cfg()
+        crops = [
+            self._grab(cfg[key], frame) if cfg.get(key) else None
+            for key in ("type", "perks")
+        ]
+        spec = OCRSpec(config=self.config_manager.config)
+        type_raw, perks_raw = self.ocr.extract_batch(crops, [spec, spec])
         perks = parse_perks_from_text(perks_raw)
         core_type = parse_type_line(type_raw)
 
@@ -269,14 +419,15 @@ class GrowthScanner:
             on_core(core)
         return core
 
-    def _parse_detail_with_retry(self) -> Optional[Dict]:
-        core = self.parse_detail()
+    def _parse_detail_with_retry(
+        self, frame: Optional[ScreenFrame] = None
+    ) -> Optional[Dict]:
+        core = self.parse_detail(frame)
         if core is not None and core.get("ok"):
             return core
-        if core is not None and not core.get("ok"):
-            # Type/perks incomplete — retry once in case UI was still settling
-            time.sleep(0.25)
-            return self.parse_detail()
+        # Type/perks incomplete — retry once in case UI was still settling
+        if self._source is not None:
+            return self.parse_detail(self._detail_frame(time.monotonic() + 0.25))
         time.sleep(0.25)
         return self.parse_detail()
 
@@ -288,14 +439,31 @@ class GrowthScanner:
         on_core: CoreCB,
     ) -> Tuple[int, int, int]:
         """Returns (scanned, skipped_locked, unlocked_seen)."""
+        with self._frame_source():
+            return self._walk_cell_list(cells, status=status, on_core=on_core)
+
+    def _walk_cell_list(
+        self,
+        cells: List[Tuple[int, int]],
+        *,
+        status: StatusCB,
+        on_core: CoreCB,
+    ) -> Tuple[int, int, int]:
         scanned = 0
         skipped = 0
         unlocked_seen = 0
+        # Badges only change on cells this walk already visited, so one
+        # grid read up front covers the whole page.
+        locked = self.grid_lock_bitmap()
         for col, row in cells:
             if self._stop:
                 break
             label = f"R{row + 1}C{col + 1}"
-            if self.is_cell_locked(col, row):
+            if locked is not None:
+                cell_locked = bool(locked[row, col])
+            else:
+                cell_locked = self.is_cell_locked(col, row)
+            if cell_locked:
                 skipped += 1
                 if status:
                     status(f"{label}: skip — grid lock badge")
@@ -303,12 +471,13 @@ class GrowthScanner:
             self.click_cell(col, row)
             if self._stop:
                 break
-            if self.is_detail_locked():
+            frame = self._detail_frame()
+            if self.is_detail_locked(frame):
                 skipped += 1
                 if status:
                     status(f"{label}: skip — detail already locked")
                 continue
-            core = self._parse_detail_with_retry()
+            core = self._parse_detail_with_retry(frame)
             if core is None:
                 if status:
                     status(f"{label}: skip — no detail")
@@ -0,0 +1,53 @@
+"""Gunsmoke leaderboard capture: OCR the visible rows into PlayerScores."""
+
+from __future__ import annotations
+
+from typing import List
+
+from src.core.ocr import OCRSpec
+from src.core.scanner import safe_grab
+from src.data.models import PlayerScore
+
+
+def read_leaderboard(config_manager, ocr_processor, season) -> List[PlayerScore]:
+    """Grab every configured row, OCR them in one batch, keep valid nicknames."""
+    rows = config_manager.get("rows", [])
+    config = config_manager.config
+    row_specs = [
+        OCRSpec(is_number=False, config=config),
+        OCRSpec(is_number=True, config=config),
+        OCRSpec(is_number=True, config=config),
+    ]
+
+    crops, specs = [], []
+    for row_config in rows:
+        nick_img = safe_grab(row_config["nickname"])
+        if nick_img is None:
+            continue
+        crops += [
+            nick_img,
+            safe_grab(row_config["single_high"]),
+            safe_grab(row_config["total_score"]),
+        ]
+        specs += row_specs
+    texts = ocr_processor.extract_batch(crops, specs)
+
+    min_nick_len = config_manager.get("validation", {}).get("min_nickname_length", 2)
+    batch = []
+    for i in range(0, len(texts), 3):
+        nickname, single_text, total_text = texts[i : i + 3]
+
+        nickname = ocr_processor.clean_nickname(nickname)
+        single_score = ocr_processor.clean_number(single_text, is_single_score=True)
+        total_score = ocr_processor.clean_number(total_text)
+
+        if len(nickname) >= min_nick_len:
+            batch.append(
+                PlayerScore(
+                    season=season,
+                    ign=nickname,
+                    topscore=single_score,
+                    totalscore=total_score,
+                )
+            )
+    return batch
@@ -1,19 +1,97 @@
+import hashlib
+import json
 import os
 import re
+import threading
 import time
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Callable, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.request import urlretrieve
 from zipfile import ZipFile
 
 import cv2
-import easyocr
-import easyocr.utils as easyocr_utils
 import numpy as np
 
 # filename, bytes downloaded, total bytes (0 if unknown)
 DownloadProgressCB = Callable[[str, int, int], None]
 
+# Bound by _import_easyocr() on first reader load: importing easyocr pulls in
+# torch, which is most of the app's startup time.
+easyocr = None
+easyocr_utils = None
+easyocr_get_text = None
+EASYOCR_IMG_H = 64
+
+GLYPH_ATLAS_PATH = os.path.join("data", "glyph_atlas.npz")
+OCR_CACHE_PATH = os.path.join("data", "ocr_cache.json")
+
+# Text boxes per recognizer forward pass in extract_batch.
+OCR_BATCH_SIZE = 16
+
+NUMBER_ALLOWLIST = "0123456789,"
+
+# Recognize-only reads below this confidence are redone with text detection.
+RECOGNIZE_MIN_CONF = 0.4
+
+
+def ink_mask(binary: np.ndarray) -> np.ndarray:
+    """Text pixels of a binarized crop (the minority colour)."""
+    ink = binary < 128
+    if ink.mean() > 0.5:
+        ink = ~ink
+    return ink
+
+
+def _runs(flags: np.ndarray, max_gap: int = 0) -> List[Tuple[int, int]]:
+    """[start, end) runs of True, bridging gaps of up to max_gap False."""
+    idx = np.flatnonzero(flags)
+    if idx.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(idx) > max_gap + 1)
+    starts = np.concatenate(([idx[0]], idx[breaks + 1]))
+    ends = np.concatenate((idx[breaks], [idx[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def line_boxes(binary: np.ndarray, pad: int = 2) -> List[List[int]]:
+    """Text line boxes [x_min, x_max, y_min, y_max] from projection profiles.
+
+    Calibrated crops hold one line (or a few stacked lines, e.g. perks), so a
+    row profile finds the lines and a column profile trims each one - the
+    boxes EasyOCR's detector would have produced, without running it.
+    """
+    ink = ink_mask(binary)
+    h, w = ink.shape
+    boxes = []
+    for y0, y1 in _runs(ink.sum(axis=1) > 0, max_gap=1):
+        if y1 - y0 < 4:
+            continue
+        cols = _runs(ink[y0:y1].any(axis=0))
+        if not cols:
+            continue
+        x0, x1 = cols[0][0], cols[-1][1]
+        boxes.append(
+            [max(0, x0 - pad * 2), min(w, x1 + pad * 2), max(0, y0 - pad), min(h, y1 + pad)]
+        )
+    return boxes
+
+
+@dataclass
+class OCRSpec:
+    """How to read one crop in OCRProcessor.extract_batch.
+
+    `config` carries the preprocessing settings (same dict extract_text takes).
+    `validate` turns on the glyph fast path for fixed-font digit fields; see
+    OCRProcessor.extract_glyphs.
+    """
+
+    allowlist: Optional[str] = None
+    is_number: bool = False
+    config: Optional[dict] = None
+    validate: Optional[Callable[[str], bool]] = None
+
 
 def format_byte_size(n: int) -> str:
     """Human-readable size for download progress (e.g. 512 KB, 28.1 MB)."""
@@ -28,6 +106,21 @@ def format_byte_size(n: int) -> str:
     return f"{n / (1024 * 1024 * 1024):.2f} GB"
 
 
+def _import_easyocr() -> None:
+    global easyocr, easyocr_utils, easyocr_get_text, EASYOCR_IMG_H
+    if easyocr is not None:
+        return
+    import easyocr as easyocr_pkg
+    import easyocr.utils as utils
+    from easyocr.config import imgH
+    from easyocr.recognition import get_text
+
+    easyocr_utils = utils
+    easyocr_get_text = get_text
+    EASYOCR_IMG_H = imgH
+    easyocr = easyocr_pkg
+
+
 def detect_ocr_device() -> Tuple[bool, str]:
     """Return (use_gpu, human-readable device label).
 
@@ -108,40 +201,453 @@ def _easyocr_download_progress(on_progress: Optional[DownloadProgressCB]):
         easyocr_main.download_and_unzip = original_main
 
 
+class GlyphRecognizer:
+    """Template matcher for the fixed in-game digit font (timestamps, page no.).
+
+    Glyphs are connected components of the binarized crop, normalized to a
+    square bitmap. The atlas is learned from readings that EasyOCR produced
+    and the caller validated, so no font file is needed; it is saved to
+    GLYPH_ATLAS_PATH and reused across sessions.
+
+    Validation only checks the format, so a 3/8 or 5/6 misread still passes
+    it. A glyph therefore becomes a sample only after CONFIRMATIONS readings
+    agree on it, and never while it already matches another character.
+    """
+
+    SIZE = 20
+    MAX_SAMPLES = 6
+    MIN_SCORE = 0.72
+    MIN_MARGIN = 0.06
+    CONFIRMATIONS = 3
+    MAX_CANDIDATES = 8
+
+    def __init__(self, path: Optional[str] = GLYPH_ATLAS_PATH):
+        self.path = path
+        self._atlas: Dict[str, List[np.ndarray]] = {}
+        # char -> [[glyph, readings that agreed]] not yet in the atlas
+        self._candidates: Dict[str, List[list]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                for key in data.files:
+                    char = chr(int(key[1:]))
+                    self._atlas[char] = [g.astype(bool) for g in data[key]]
+        except Exception as e:
+            print(f"Glyph atlas ignored ({e})")
+            self._atlas = {}
+            return
+        # Atlases saved before confirmation existed may hold misread samples;
+        # drop any that clash with another char so they are relearned.
+        clashing = {
+            (char, i)
+            for char, samples in self._atlas.items()
+            for i, g in enumerate(samples)
+            if self._clashes(g, char)
+        }
+        if clashing:
+            print(f"Glyph atlas: dropped {len(clashing)} ambiguous samples")
+            self._atlas = {
+                char: [g for i, g in enumerate(gs) if (char, i) not in clashing]
+                for char, gs in self._atlas.items()
+            }
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            np.savez_compressed(
+                self.path,
+                **{f"c{ord(c)}": np.stack(gs) for c, gs in self._atlas.items() if gs},
+            )
+        except Exception as e:
+            print(f"Could not save glyph atlas: {e}")
+
+    def known_chars(self) -> str:
+        return "".join(sorted(self._atlas))
+
+    def segment(self, binary: np.ndarray) -> List[Tuple[int, int, np.ndarray]]:
+        """Ink components (x0, x1, normalized bitmap), left → right.
+
+        Components that overlap horizontally (the two dots of ':') merge.
+        """
+        ink = ink_mask(binary)
+        n, labels, stats, _ = cv2.connectedComponentsWithStats(
+            ink.astype(np.uint8), connectivity=8
+        )
+        h = ink.shape[0]
+        spans: List[List[int]] = []
+        for i in range(1, n):
+            x, y, w, hh, area = stats[i]
+            if area < 2 or hh > h * 0.95 and w > h:
+                continue
+            spans.append([x, x + w, i])
+        spans.sort()
+        merged: List[Tuple[int, int, List[int]]] = []
+        for x0, x1, label in spans:
+            if merged and x0 < merged[-1][1] - 1:
+                px0, px1, ids = merged[-1]
+                merged[-1] = (px0, max(px1, x1), ids + [label])
+            else:
+                merged.append((x0, x1, [label]))
+
+        out = []
+        for x0, x1, ids in merged:
+            mask = np.isin(labels[:, x0:x1], ids)
+            rows = np.flatnonzero(mask.any(axis=1))
+            if rows.size == 0:
+                continue
+            glyph = mask[rows[0] : rows[-1] + 1]
+            out.append((x0, x1, self._normalize(glyph, h)))
+        return out
+
+    def _normalize(self, glyph: np.ndarray, line_h: int) -> np.ndarray:
+        """Fit glyph into SIZE×SIZE keeping aspect; tiny marks stay small ('-', ':')."""
+        gh, gw = glyph.shape
+        scale = self.SIZE / max(gh, gw, line_h * 0.6, 1)
+        tw = max(1, int(round(gw * scale)))
+        th = max(1, int(round(gh * scale)))
+        small = cv2.resize(
+            glyph.astype(np.uint8) * 255, (tw, th), interpolation=cv2.INTER_AREA
+        )
+        canvas = np.zeros((self.SIZE, self.SIZE), dtype=bool)
+        oy = (self.SIZE - th) // 2
+        ox = (self.SIZE - tw) // 2
+        canvas[oy : oy + th, ox : ox + tw] = small >= 96
+        return canvas
+
+    @staticmethod
+    def _score(glyph: np.ndarray, samples: List[np.ndarray]) -> float:
+        """Best IoU of glyph against any of samples."""
+        score = 0.0
+        for s in samples:
+            union = np.count_nonzero(glyph | s)
+            if union:
+                score = max(score, float(np.count_nonzero(glyph & s)) / union)
+        return score
+
+    def _clashes(self, glyph: np.ndarray, char: str) -> bool:
+        """True when glyph would also be read as some other char."""
+        return any(
+            self._score(glyph, samples) >= self.MIN_SCORE
+            for other, samples in self._atlas.items()
+            if other != char
+        )
+
+    def _match(self, glyph: np.ndarray, allowed: str) -> Tuple[str, float, float]:
+        """Best char, its IoU score, and the margin over the runner-up char."""
+        best_char, best, second = "", 0.0, 0.0
+        for char, samples in self._atlas.items():
+            if char not in allowed:
+                continue
+            score = self._score(glyph, samples)
+            if score > best:
+                best_char, second, best = char, best, score
+            elif score > second:
+                second = score
+        return best_char, best, best - second
+
+    def recognize(self, binary: np.ndarray, allowlist: str) -> Tuple[str, float]:
+        """Text and confidence (0 when any glyph is unknown / ambiguous)."""
+        with self._lock:
+            glyphs = self.segment(binary)
+            if not glyphs or not self._atlas:
+                return "", 0.0
+            gaps = sorted(b[0] - a[1] for a, b in zip(glyphs, glyphs[1:])) or [0]
+            gap_space = max(3, 2 * gaps[len(gaps) // 2] + 1)
+            text = []
+            conf = 1.0
+            prev_x1 = None
+            for x0, x1, g in glyphs:
+                if " " in allowlist and prev_x1 is not None and x0 - prev_x1 >= gap_space:
+                    text.append(" ")
+                char, score, margin = self._match(g, allowlist)
+                if not char or score < self.MIN_SCORE or margin < self.MIN_MARGIN:
+                    return "", 0.0
+                conf = min(conf, score)
+                text.append(char)
+                prev_x1 = x1
+        return "".join(text), conf
+
+    def learn(self, binary: np.ndarray, text: str) -> bool:
+        """Count a validated reading toward glyph samples. False if segmentation disagrees.
+
+        Each glyph waits as a candidate until CONFIRMATIONS readings of the
+        same char agree with it (IoU >= MIN_SCORE); glyphs that match another
+        char's samples are not counted at all.
+        """
+        chars = [c for c in text if not c.isspace()]
+        with self._lock:
+            glyphs = self.segment(binary)
+            if not chars or len(glyphs) != len(chars):
+                return False
+            changed = False
+            for char, (_x0, _x1, g) in zip(chars, glyphs):
+                samples = self._atlas.setdefault(char, [])
+                if len(samples) >= self.MAX_SAMPLES:
+                    continue
+                if any(np.array_equal(g, s) for s in samples):
+                    continue
+                if self._clashes(g, char):
+                    continue
+                candidates = self._candidates.setdefault(char, [])
+                for k, cand in enumerate(candidates):
+                    if self._score(g, [cand[0]]) >= self.MIN_SCORE:
+                        cand[1] += 1
+                        break
+                else:
+                    candidates.append([g, 1])
+                    del candidates[: -self.MAX_CANDIDATES]
+                    continue
+                if cand[1] < self.CONFIRMATIONS:
+                    continue
+                del candidates[k]
+                samples.append(cand[0])
+                changed = True
+            if changed:
+                self._save()
+        return True
+
+
+class OCRCache:
+    """Bounded LRU of OCR results keyed by the preprocessed pixels.
+
+    Identical cells (source/type on every row of a 10-pull, unchanged
+    leaderboard rows, the same core type line) are recognized once. Keys
+    also cover allowlist, number mode, reader languages and preprocessing
+    settings, so a hit always means "same input to the same reader".
+    """
+
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self.max_entries = max(0, int(max_entries))
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path:
+            self.load()
+
+    @staticmethod
+    def key(
+        processed: np.ndarray,
+        spec: "OCRSpec",
+        languages: List[str],
+    ) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(np.ascontiguousarray(processed).tobytes())
+        prep = (spec.config or {}).get("preprocessing", {})
+        meta = (
+            processed.shape,
+            spec.allowlist,
+            spec.is_number,
+            tuple(languages),
+            json.dumps(prep, sort_keys=True, default=str),
+        )
+        h.update(repr(meta).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def load(self) -> None:
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"OCR cache ignored ({e})")
+            return
+        if not isinstance(data, dict):
+            return
+        with self._lock:
+            for key, text in data.items():
+                if isinstance(key, str) and isinstance(text, str):
+                    self._entries[key] = text
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = dict(self._entries)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"Could not save OCR cache: {e}")
+
+
 class OCRProcessor:
+    """EasyOCR reader plus the glyph / cache fast paths.
+
+    With load=False the reader is not built until start_loading(), which does
+    it on a background thread; OCR calls made while it runs wait for it (or
+    build it themselves if it was never started), and UI entry points check
+    not_ready_reason() to tell the user instead.
+    """
+
     def __init__(
         self,
         languages: List[str] = None,
         on_download_progress: Optional[DownloadProgressCB] = None,
+        cache: Optional[OCRCache] = None,
+        load: bool = True,
     ):
         if languages is None:
             languages = ["en"]
         self.languages = list(languages)
         self.use_gpu = False
         self.reader = None
-        self._load_reader(self.languages, on_download_progress=on_download_progress)
+        self.glyphs = GlyphRecognizer()
+        self.cache = cache if cache is not None else OCRCache()
+        self.load_error: Optional[str] = None
+        self._load_progress = ""
+        self._load_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._load_started = load
+        self._start_lock = threading.Lock()
+        if load:
+            self._load_reader(self.languages, on_download_progress=on_download_progress)
 
     def _load_reader(
         self,
         languages: List[str],
         on_download_progress: Optional[DownloadProgressCB] = None,
     ) -> None:
-        use_gpu, device_label = detect_ocr_device()
-        print("Loading EasyOCR models...")
-        print(f"EasyOCR languages: {languages}")
-        print(f"EasyOCR device: {device_label}")
-        self.use_gpu = use_gpu
-        self.languages = list(languages)
-        with _easyocr_download_progress(on_download_progress):
-            self.reader = easyocr.Reader(
-                self.languages,
-                gpu=use_gpu,
-                model_storage_directory="./easyocr_models",
-                # Terminal progress goes to our UI callback when present.
-                verbose=on_download_progress is None,
-            )
+        with self._load_lock:
+            _import_easyocr()
+            use_gpu, device_label = detect_ocr_device()
+            print("Loading EasyOCR models...")
+            print(f"EasyOCR languages: {languages}")
+            print(f"EasyOCR device: {device_label}")
+            self.use_gpu = use_gpu
+            self.languages = list(languages)
+            with _easyocr_download_progress(on_download_progress):
+                self.reader = easyocr.Reader(
+                    self.languages,
+                    gpu=use_gpu,
+                    model_storage_directory="./easyocr_models",
+                    # Terminal progress goes to our UI callback when present.
+                    verbose=on_download_progress is None,
+                )
+            self.load_error = None
+            self._ready.set()
         print("EasyOCR ready!")
 
+    def start_loading(
+        self,
+        on_download_progress: Optional[DownloadProgressCB] = None,
+        on_done: Optional[Callable[[Optional[str]], None]] = None,
+    ) -> threading.Thread:
+        """Build the reader on a daemon thread; on_done(error or None) runs there too."""
+
+        def progress(name: str, downloaded: int, total: int) -> None:
+            if total > 0:
+                self._load_progress = (
+                    f"downloading {name} "
+                    f"{format_byte_size(downloaded)} / {format_byte_size(total)}"
+                )
+            else:
+                self._load_progress = f"downloading {name} {format_byte_size(downloaded)}"
+            if on_download_progress is not None:
+                on_download_progress(name, downloaded, total)
+
+        def run() -> None:
+            error = None
+            try:
+                self._load_reader(self.languages, on_download_progress=progress)
+            except Exception as e:
+                error = str(e)
+                self.load_error = error
+                print(f"EasyOCR failed to load: {e}")
+            finally:
+                self._load_progress = ""
+                self._ready.set()
+            if on_done is not None:
+                on_done(error)
+
+        with self._start_lock:
+            self._load_started = True
+        thread = threading.Thread(target=run, name="ocr-loader", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def ready(self) -> bool:
+        return self.reader is not None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first reader load finished; True if a reader exists."""
+        self._ready.wait(timeout)
+        return self.reader is not None
+
+    def _ensure_reader(self) -> bool:
+        """Wait for the reader, building it here when no load was ever started."""
+        with self._start_lock:
+            build = not self._load_started and not self._ready.is_set()
+            self._load_started = True
+        if build:
+            try:
+                self._load_reader(self.languages)
+            except Exception as e:
+                self.load_error = str(e)
+                print(f"EasyOCR failed to load: {e}")
+            finally:
+                self._ready.set()
+        return self.wait_ready()
+
+    def not_ready_reason(self) -> Optional[str]:
+        """Status text for a capture action started too early (None when ready)."""
+        if self.reader is not None:
+            return None
+        if self.load_error:
+            return f"OCR failed to load: {self.load_error}"
+        if self._load_progress:
+            return f"OCR warming up ({self._load_progress})..."
+        return "OCR warming up - try again in a moment..."
+
     def set_languages(
         self,
         languages: List[str],
@@ -153,6 +659,7 @@ class OCRProcessor:
             langs.insert(0, "en")
         if langs == self.languages and self.reader is not None:
             return
+        self.cache.clear()
         self._load_reader(langs, on_download_progress=on_download_progress)
 
     def preprocess_image(
@@ -198,6 +705,17 @@ class OCRProcessor:
 
         `allowlist` restricts characters when set (e.g. timestamps / page digits).
         """
+        spec = OCRSpec(allowlist=allowlist, is_number=is_number, config=config)
+        return self.extract_batch([img], [spec])[0]
+
+    def _readtext(
+        self,
+        img: np.ndarray,
+        is_number: bool = False,
+        config: dict = None,
+        allowlist: str = None,
+    ) -> str:
+        """One crop through reader.readtext (detector + recognizer)."""
         if img is None:
             return ""
 
@@ -212,7 +730,7 @@ class OCRProcessor:
                 )
             elif is_number:
                 result = self.reader.readtext(
-                    processed, detail=0, allowlist="0123456789,"
+                    processed, detail=0, allowlist=NUMBER_ALLOWLIST
                 )
             else:
                 result = self.reader.readtext(processed, detail=0, paragraph=False)
@@ -228,7 +746,7 @@ class OCRProcessor:
 
                 processed_retry = self.preprocess_image(img, retry_config)
                 result = self.reader.readtext(
-                    processed_retry, detail=0, allowlist="0123456789,"
+                    processed_retry, detail=0, allowlist=NUMBER_ALLOWLIST
                 )
                 text = "".join(result)
 
@@ -237,6 +755,246 @@ class OCRProcessor:
             print(f"OCR Error: {e}")
             return ""
 
+    def extract_glyphs(
+        self,
+        img: np.ndarray,
+        *,
+        allowlist: str,
+        validate: Callable[[str], bool],
+        config: dict = None,
+        is_number: bool = False,
+    ) -> str:
+        """Digit-font fast path: glyph atlas first, EasyOCR when unsure.
+
+        `validate` decides whether a reading is trustworthy (e.g. a full
+        timestamp). Glyph results must pass it; EasyOCR results that pass it
+        teach the atlas so later crops skip EasyOCR.
+        """
+        spec = OCRSpec(
+            allowlist=allowlist, is_number=is_number, config=config, validate=validate
+        )
+        return self.extract_batch([img], [spec])[0]
+
+    def extract_batch(
+        self,
+        crops: List[Optional[np.ndarray]],
+        specs: List[OCRSpec],
+        batch_size: int = OCR_BATCH_SIZE,
+    ) -> List[str]:
+        """OCR many crops at once; results come back in input order.
+
+        Crops are already tight, calibrated regions, so text detection is
+        skipped: line_boxes() supplies the boxes and every box of every crop
+        goes through the recognizer together, `batch_size` per forward pass
+        (EasyOCR itself recognizes box-by-box on CPU). Crops read with less
+        than RECOGNIZE_MIN_CONF are redone with the CRAFT detector.
+        """
+        if len(crops) != len(specs):
+            raise ValueError("extract_batch needs one spec per crop")
+        texts = [""] * len(crops)
+        processed: List[Optional[np.ndarray]] = [None] * len(crops)
+        keys: List[Optional[str]] = [None] * len(crops)
+        pending: List[int] = []
+        first: Dict[str, int] = {}
+        copies: List[Tuple[int, int]] = []
+        for i, (img, spec) in enumerate(zip(crops, specs)):
+            if img is None:
+                continue
+            # One bad crop reads as "" instead of failing the whole batch.
+            try:
+                processed[i] = self.preprocess_image(img, spec.config)
+                if processed[i] is None:
+                    continue
+                keys[i] = self.cache.key(processed[i], spec, self.languages)
+                if keys[i] in first:
+                    copies.append((i, first[keys[i]]))
+                    continue
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    texts[i] = cached
+                    continue
+                if spec.validate is not None:
+                    text, _conf = self.glyphs.recognize(
+                        processed[i], spec.allowlist or ""
+                    )
+                    if text and spec.validate(text):
+                        texts[i] = text
+                        self.cache.put(keys[i], text)
+                        first[keys[i]] = i
+                        continue
+            except Exception as e:
+                print(f"OCR Error: {e}")
+                processed[i] = None
+                texts[i] = ""
+                continue
+            first[keys[i]] = i
+            pending.append(i)
+
+        if not pending:
+            for i, src in copies:
+                texts[i] = texts[src]
+            return texts
+        if not self._ensure_reader():
+            print(f"OCR Error: {self.not_ready_reason()}")
+            for i, src in copies:
+                texts[i] = texts[src]
+            return texts
+        try:
+            read = self._recognize_many(
+                [processed[i] for i in pending],
+                [self._effective_allowlist(specs[i]) for i in pending],
+                batch_size,
+            )
+        except Exception as e:
+            print(f"Batched OCR failed ({e}) - reading crops one by one")
+            read = [
+                self._readtext(
+                    crops[i],
+                    is_number=specs[i].is_number,
+                    config=specs[i].config,
+                    allowlist=specs[i].allowlist,
+                )
+                for i in pending
+            ]
+            for i, text in zip(pending, read):
+                texts[i] = text
+            for i, src in copies:
+                texts[i] = texts[src]
+            return texts
+
+        retry: List[int] = []
+        for i, text in zip(pending, read):
+            texts[i] = text.strip()
+            spec = specs[i]
+            if spec.is_number and spec.allowlist is None and not texts[i]:
+                retry.append(i)
+            elif spec.validate is not None and texts[i]:
+                try:
+                    if spec.validate(texts[i]):
+                        self.glyphs.learn(processed[i], texts[i])
+                except Exception as e:
+                    print(f"OCR Error: {e}")
+
+        # Same empty-number retry as extract_text: fixed threshold instead.
+        if retry:
+            try:
+                retry_imgs = []
+                for i in retry:
+                    retry_config = dict(specs[i].config or {})
+                    retry_config["preprocessing"] = {
+                        **retry_config.get("preprocessing", {}),
+                        "adaptive": False,
+                    }
+                    retry_imgs.append(self.preprocess_image(crops[i], retry_config))
+                again = self._recognize_many(
+                    retry_imgs, [NUMBER_ALLOWLIST] * len(retry), batch_size
+                )
+            except Exception as e:
+                print(f"OCR Error: {e}")
+                again = [""] * len(retry)
+            for i, text in zip(retry, again):
+                texts[i] = text.strip()
+
+        for i in pending:
+            self.cache.put(keys[i], texts[i])
+        for i, src in copies:
+            texts[i] = texts[src]
+        return texts
+
+    @staticmethod
+    def _effective_allowlist(spec: OCRSpec) -> Optional[str]:
+        if spec.allowlist is not None:
+            return spec.allowlist
+        return NUMBER_ALLOWLIST if spec.is_number else None
+
+    def _ignore_chars(self, allowlist: Optional[str]) -> str:
+        """Characters the decoder must skip - mirrors Reader.recognize."""
+        reader = self.reader
+        if allowlist:
+            return "".join(set(reader.character) - set(allowlist))
+        return "".join(set(reader.character) - set(reader.lang_char))
+
+    def _recognize_many(
+        self,
+        images: List[Optional[np.ndarray]],
+        allowlists: List[Optional[str]],
+        batch_size: int,
+    ) -> List[str]:
+        """Recognize-only first; low-confidence crops again with detection."""
+        read = self._recognize_boxes(images, allowlists, batch_size, detect=False)
+        redo = [i for i, (_t, conf) in enumerate(read) if conf < RECOGNIZE_MIN_CONF]
+        if redo:
+            again = self._recognize_boxes(
+                [images[i] for i in redo],
+                [allowlists[i] for i in redo],
+                batch_size,
+                detect=True,
+            )
+            for i, got in zip(redo, again):
+                read[i] = got
+        return [text for text, _conf in read]
+
+    def _recognize_boxes(
+        self,
+        images: List[Optional[np.ndarray]],
+        allowlists: List[Optional[str]],
+        batch_size: int,
+        detect: bool,
+    ) -> List[Tuple[str, float]]:
+        """(text, lowest box confidence) per image; all boxes share batches.
+
+        Boxes come from line_boxes(), or from the CRAFT detector when `detect`.
+        Images without any box read as ("", 1.0).
+        """
+        reader = self.reader
+        # (allowlist) -> [(owner index, order within owner, resized box image)]
+        groups: Dict[Optional[str], List[Tuple[int, int, np.ndarray]]] = {}
+        parts: List[List[str]] = [[] for _ in images]
+        confs = [1.0] * len(images)
+        for idx, (img, allow) in enumerate(zip(images, allowlists)):
+            if img is None:
+                continue
+            if detect:
+                horizontal, free = reader.detect(img)
+                horizontal, free = horizontal[0], free[0]
+            else:
+                horizontal, free = line_boxes(img), []
+            if not horizontal and not free:
+                continue
+            boxes, _ = easyocr_utils.get_image_list(
+                horizontal, free, img, model_height=EASYOCR_IMG_H
+            )
+            parts[idx] = [""] * len(boxes)
+            bucket = groups.setdefault(allow, [])
+            for order, (_box, box_img) in enumerate(boxes):
+                bucket.append((idx, order, box_img))
+
+        for allow, items in groups.items():
+            ignore = self._ignore_chars(allow)
+            # Similar widths share a batch so little padding is recognized.
+            items.sort(key=lambda it: it[2].shape[1])
+            step = max(1, int(batch_size))
+            for start in range(0, len(items), step):
+                chunk = items[start : start + step]
+                max_w = max(it[2].shape[1] for it in chunk)
+                max_w = int(np.ceil(max_w / EASYOCR_IMG_H)) * EASYOCR_IMG_H
+                result = easyocr_get_text(
+                    reader.character,
+                    EASYOCR_IMG_H,
+                    max_w,
+                    reader.recognizer,
+                    reader.converter,
+                    [(None, it[2]) for it in chunk],
+                    ignore,
+                    batch_size=step,
+                    workers=0,
+                    device=reader.device,
+                )
+                for (idx, order, _img), (_box, text, conf) in zip(chunk, result):
+                    parts[idx][order] = text
+                    confs[idx] = min(confs[idx], float(conf))
+        return [("".join(p), c) for p, c in zip(parts, confs)]
+
     @staticmethod
     def clean_nickname(text: str) -> str:
         """Clean nickname"""
@@ -1,12 +1,17 @@
-from PIL import ImageGrab
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
 import numpy as np
-import pyautogui
 
+from src.core.capture import CaptureBackend, get_backend
 
-def safe_grab(bbox) -> np.ndarray:
-    """Safely capture screen region"""
+
+def _clamp_bbox(
+    bbox, backend: CaptureBackend
+) -> Optional[Tuple[int, int, int, int]]:
+    """Clip [x, y, w, h] to the primary screen → (left, top, right, bottom)."""
     x, y, w, h = bbox
-    screen_w, screen_h = pyautogui.size()
+    screen_w, screen_h = backend.screen_size()
 
     x = max(0, x)
     y = max(0, y)
@@ -15,9 +20,88 @@ def safe_grab(bbox) -> np.ndarray:
 
     if right <= x or bottom <= y or w <= 0 or h <= 0:
         return None
+    return x, y, right, bottom
+
+
+def safe_grab(bbox) -> np.ndarray:
+    """Safely capture screen region (via the active capture backend)"""
+    backend = get_backend()
+    box = _clamp_bbox(bbox, backend)
+    if box is None:
+        return None
 
     try:
-        img = ImageGrab.grab(bbox=(x, y, right, bottom))
-        return np.array(img)
+        return backend.grab(box)
     except Exception:
         return None
+
+
+def union_bbox(bboxes: Iterable[Sequence[int]]) -> Optional[List[int]]:
+    """Smallest [x, y, w, h] covering every bbox (None if there are none)."""
+    left = top = right = bottom = None
+    for b in bboxes:
+        if not b:
+            continue
+        x, y, w, h = [int(v) for v in b[:4]]
+        if w <= 0 or h <= 0:
+            continue
+        left = x if left is None else min(left, x)
+        top = y if top is None else min(top, y)
+        right = x + w if right is None else max(right, x + w)
+        bottom = y + h if bottom is None else max(bottom, y + h)
+    if left is None:
+        return None
+    return [left, top, right - left, bottom - top]
+
+
+class ScreenFrame:
+    """One screen grab covering several regions; crops are zero-copy views.
+
+    Every region read from the same frame comes from the same rendered
+    instant, so a half-drawn page cannot mix rows from two states.
+    ``timestamp`` is time.monotonic() taken just before the grab started.
+    """
+
+    def __init__(
+        self,
+        img: Optional[np.ndarray],
+        origin: Tuple[int, int] = (0, 0),
+        timestamp: float = 0.0,
+    ):
+        self.img = img
+        self.origin = origin
+        self.timestamp = timestamp
+
+    def crop(self, bbox) -> Optional[np.ndarray]:
+        """View of bbox inside the frame, clipped like safe_grab (None if empty)."""
+        if self.img is None or not bbox:
+            return None
+        x, y, w, h = [int(v) for v in bbox[:4]]
+        if w <= 0 or h <= 0:
+            return None
+        ox, oy = self.origin
+        fh, fw = self.img.shape[:2]
+        x0 = max(0, x - ox)
+        y0 = max(0, y - oy)
+        x1 = min(fw, x + w - ox)
+        y1 = min(fh, y + h - oy)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return self.img[y0:y1, x0:x1]
+
+
+def grab_frame(bboxes: Iterable[Sequence[int]]) -> ScreenFrame:
+    """Grab the union of bboxes once; crop individual regions from the result."""
+    backend = get_backend()
+    area = union_bbox(bboxes)
+    box = _clamp_bbox(area, backend) if area else None
+    stamp = time.monotonic()
+    if box is None:
+        return ScreenFrame(None, timestamp=stamp)
+    try:
+        img = backend.grab(box)
+    except Exception:
+        img = None
+    if img is None:
+        return ScreenFrame(None, timestamp=stamp)
+    return ScreenFrame(img, (box[0], box[1]), stamp)
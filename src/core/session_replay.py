@@ -0,0 +1,376 @@
+"""Record a scanner session against the live game, replay it without one.
+
+Recording wraps the active capture backend and the pyautogui input calls the
+scanners use. Every grab is stored (PNG, identical frames once) with its box
+and the number of input actions issued before it - its "epoch" - and every
+input call with its arguments. The result is one zip file:
+
+    manifest.json   screen size, grabs [{t, epoch, box, frame}], actions
+    frames/*.png    RGB frames
+
+Replay serves grabs from the recording through a CaptureBackend and turns the
+input calls into no-ops that only count epochs. A grab in epoch k gets the
+recorded grabs of epoch k that cover the requested box, in order, repeating
+the last one once they run out (the screen has settled); if epoch k recorded
+nothing for that box, the newest earlier frame that covers it is used. As
+long as the scanner issues the same inputs, it sees the screens it saw live.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import threading
+import time
+import types
+import zipfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.core.capture import Box, CaptureBackend, get_backend, set_backend
+
+SESSION_VERSION = 1
+MANIFEST = "manifest.json"
+
+# pyautogui functions the scanners call (and that move the game to a new screen).
+INPUT_FUNCTIONS = ("click", "moveTo", "dragTo", "mouseDown", "mouseUp", "scroll", "press")
+
+
+def input_module():
+    """pyautogui, or a no-op stand-in when it cannot load (no display).
+
+    Call before importing the scanners so their ``import pyautogui`` binds the
+    stand-in on headless machines.
+    """
+    try:
+        import pyautogui
+
+        return pyautogui
+    except Exception:
+        pass
+    stub = types.ModuleType("pyautogui")
+    for name in INPUT_FUNCTIONS:
+        setattr(stub, name, lambda *a, **k: None)
+    stub.size = lambda: (0, 0)
+    stub.FAILSAFE = False
+    sys.modules["pyautogui"] = stub
+    return stub
+
+
+def _jsonable(value):
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+class _InputPatch:
+    """Swap pyautogui's input functions for wrappers; restore() undoes it."""
+
+    def __init__(self, on_call, passthrough: bool):
+        self._module = input_module()
+        self._saved: Dict[str, Any] = {}
+        for name in INPUT_FUNCTIONS:
+            original = getattr(self._module, name, None)
+            if original is None:
+                continue
+            self._saved[name] = original
+            setattr(self._module, name, self._wrap(name, original, on_call, passthrough))
+
+    @staticmethod
+    def _wrap(name, original, on_call, passthrough):
+        def call(*args, **kwargs):
+            on_call(name, args, kwargs)
+            if passthrough:
+                return original(*args, **kwargs)
+            return None
+
+        call.__name__ = name
+        return call
+
+    def restore(self) -> None:
+        for name, original in self._saved.items():
+            setattr(self._module, name, original)
+        self._saved.clear()
+
+
+class RecordingBackend(CaptureBackend):
+    """Delegates to another backend and hands every grab to a SessionRecorder."""
+
+    name = "recording"
+
+    def __init__(self, inner: CaptureBackend, recorder: "SessionRecorder"):
+        self.inner = inner
+        self.recorder = recorder
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.inner.screen_size()
+
+    def grab(self, box: Box) -> Optional[np.ndarray]:
+        img = self.inner.grab(box)
+        if img is not None:
+            self.recorder.add_grab(box, img)
+        return img
+
+    def release_thread(self) -> None:
+        self.inner.release_thread()
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class SessionRecorder:
+    def __init__(self, path: str):
+        self.path = path
+        self.t0 = time.monotonic()
+        self.epoch = 0
+        self.grabs: List[Dict[str, Any]] = []
+        self.actions: List[Dict[str, Any]] = []
+        self._frames: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._inner: Optional[CaptureBackend] = None
+        self._patch: Optional[_InputPatch] = None
+        self.config: Optional[dict] = None
+        self._live_config: Optional[Callable[[], Optional[dict]]] = None
+
+    def start(
+        self,
+        config: Optional[dict] = None,
+        live_config: Optional[Callable[[], Optional[dict]]] = None,
+    ) -> "SessionRecorder":
+        """Begin recording; the config (regions, delays) is stored for the replay.
+
+        `live_config` is read again in stop(), so regions recalibrated or
+        delays changed during the session are what the replay uses; `config`
+        is the fallback when it is missing or fails.
+        """
+        if config is not None:
+            self.config = json.loads(json.dumps(config))
+        self._live_config = live_config
+        self._inner = get_backend()
+        set_backend(RecordingBackend(self._inner, self))
+        self._patch = _InputPatch(self.add_action, passthrough=True)
+        print(f"Recording scanner session to {self.path}")
+        return self
+
+    def add_grab(self, box: Box, img: np.ndarray) -> None:
+        t = time.monotonic() - self.t0
+        digest = hashlib.blake2b(img.tobytes(), digest_size=16)
+        digest.update(repr(img.shape).encode())
+        name = f"frames/{digest.hexdigest()}.png"
+        with self._lock:
+            epoch = self.epoch
+            known = name in self._frames
+        if not known:
+            ok, png = cv2.imencode(
+                ".png", cv2.cvtColor(img, cv2.COLOR_RGB2BGR), [cv2.IMWRITE_PNG_COMPRESSION, 1]
+            )
+            if not ok:
+                return
+            png = png.tobytes()
+        with self._lock:
+            if not known:
+                self._frames.setdefault(name, png)
+            self.grabs.append(
+                {"t": round(t, 4), "epoch": epoch, "box": list(box), "frame": name}
+            )
+
+    def add_action(self, name: str, args, kwargs) -> None:
+        with self._lock:
+            self.epoch += 1
+            self.actions.append(
+                {
+                    "t": round(time.monotonic() - self.t0, 4),
+                    "epoch": self.epoch,
+                    "name": name,
+                    "args": _jsonable(args),
+                    "kwargs": {k: _jsonable(v) for k, v in kwargs.items()},
+                }
+            )
+
+    def stop(self) -> None:
+        """Restore backend and input, write the session file."""
+        if self._patch is not None:
+            self._patch.restore()
+            self._patch = None
+        if self._inner is not None:
+            if isinstance(get_backend(), RecordingBackend):
+                set_backend(self._inner)
+            self._inner = None
+        if self._live_config is not None:
+            try:
+                config = self._live_config()
+                if config is not None:
+                    self.config = json.loads(json.dumps(config))
+            except Exception as e:
+                print(f"Recording keeps the start-up config ({e})")
+        with self._lock:
+            manifest = {
+                "version": SESSION_VERSION,
+                "screen_size": list(self._screen_size()),
+                "duration": round(time.monotonic() - self.t0, 3),
+                "config": self.config,
+                "grabs": list(self.grabs),
+                "actions": list(self.actions),
+            }
+            frames = dict(self._frames)
+        with zipfile.ZipFile(self.path, "w") as zf:
+            zf.writestr(MANIFEST, json.dumps(manifest), compress_type=zipfile.ZIP_DEFLATED)
+            for name, png in frames.items():
+                zf.writestr(name, png, compress_type=zipfile.ZIP_STORED)
+        print(
+            f"Recorded {len(manifest['grabs'])} grabs ({len(frames)} distinct frames), "
+            f"{len(manifest['actions'])} input actions → {self.path}"
+        )
+
+    def _screen_size(self) -> Tuple[int, int]:
+        try:
+            return (self._inner or get_backend()).screen_size()
+        except Exception:
+            return 0, 0
+
+    def __enter__(self) -> "SessionRecorder":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+
+def _covers(outer, inner) -> bool:
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and outer[2] >= inner[2]
+        and outer[3] >= inner[3]
+    )
+
+
+class ReplayBackend(CaptureBackend):
+    """Serves grabs from a recorded session (see module docstring)."""
+
+    name = "replay"
+
+    def __init__(self, session: "ReplaySession"):
+        self.session = session
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.session.screen_size
+
+    def grab(self, box: Box) -> Optional[np.ndarray]:
+        return self.session.serve(box)
+
+
+class ReplaySession:
+    def __init__(self, path: str):
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            manifest = json.loads(zf.read(MANIFEST))
+            self._png = {name: zf.read(name) for name in zf.namelist() if name != MANIFEST}
+        if manifest.get("version") != SESSION_VERSION:
+            raise ValueError(f"Unsupported session version {manifest.get('version')!r}")
+        self.screen_size = tuple(manifest.get("screen_size") or (0, 0))
+        self.duration = float(manifest.get("duration") or 0.0)
+        self.config = manifest.get("config")
+        self.grabs = manifest["grabs"]
+        self.recorded_actions = manifest["actions"]
+        self._decoded: Dict[str, np.ndarray] = {}
+        self._by_epoch: Dict[int, List[int]] = {}
+        for i, g in enumerate(self.grabs):
+            self._by_epoch.setdefault(int(g["epoch"]), []).append(i)
+        self._cursors: Dict[Tuple[int, Box], int] = {}
+        self._lock = threading.Lock()
+        self._saved_backend: Optional[CaptureBackend] = None
+        self._patch: Optional[_InputPatch] = None
+        self.epoch = 0
+        self.actions: List[Dict[str, Any]] = []
+        self.misses = 0
+
+    def _frame(self, name: str) -> np.ndarray:
+        img = self._decoded.get(name)
+        if img is None:
+            bgr = cv2.imdecode(np.frombuffer(self._png[name], np.uint8), cv2.IMREAD_COLOR)
+            img = self._decoded[name] = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        return img
+
+    def _crop(self, index: int, box: Box) -> np.ndarray:
+        g = self.grabs[index]
+        left, top = g["box"][0], g["box"][1]
+        img = self._frame(g["frame"])
+        return img[box[1] - top : box[3] - top, box[0] - left : box[2] - left].copy()
+
+    def serve(self, box: Box) -> Optional[np.ndarray]:
+        box = tuple(int(v) for v in box)
+        with self._lock:
+            epoch = self.epoch
+            candidates = [
+                i for i in self._by_epoch.get(epoch, []) if _covers(self.grabs[i]["box"], box)
+            ]
+            if candidates:
+                key = (epoch, box)
+                pos = self._cursors.get(key, 0)
+                self._cursors[key] = pos + 1
+                index = candidates[min(pos, len(candidates) - 1)]
+            else:
+                index = self._latest_before(epoch, box)
+                if index is None:
+                    self.misses += 1
+                    return None
+            return self._crop(index, box)
+
+    def _latest_before(self, epoch: int, box: Box) -> Optional[int]:
+        for e in sorted((e for e in self._by_epoch if e < epoch), reverse=True):
+            for i in reversed(self._by_epoch[e]):
+                if _covers(self.grabs[i]["box"], box):
+                    return i
+        return None
+
+    def _on_input(self, name: str, args, kwargs) -> None:
+        with self._lock:
+            self.epoch += 1
+            self.actions.append(
+                {
+                    "epoch": self.epoch,
+                    "name": name,
+                    "args": _jsonable(args),
+                    "kwargs": {k: _jsonable(v) for k, v in kwargs.items()},
+                }
+            )
+
+    def actions_match(self) -> bool:
+        """Did the replayed scanner issue exactly the recorded inputs?"""
+        strip = [{k: a[k] for k in ("name", "args", "kwargs")} for a in self.recorded_actions]
+        return strip == [{k: a[k] for k in ("name", "args", "kwargs")} for a in self.actions]
+
+    def start(self) -> "ReplaySession":
+        self._saved_backend = get_backend()
+        set_backend(ReplayBackend(self))
+        self._patch = _InputPatch(self._on_input, passthrough=False)
+        return self
+
+    def stop(self) -> None:
+        if self._patch is not None:
+            self._patch.restore()
+            self._patch = None
+        if self._saved_backend is not None:
+            set_backend(self._saved_backend)
+            self._saved_backend = None
+
+    def rewind(self) -> None:
+        """Back to the first screen (for repeated benchmark rounds)."""
+        with self._lock:
+            self.epoch = 0
+            self._cursors.clear()
+            self.actions = []
+            self.misses = 0
+
+    def __enter__(self) -> "ReplaySession":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
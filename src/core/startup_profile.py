@@ -0,0 +1,235 @@
+"""--profile-startup: per-module import cost and splash phase timings.
+
+main.py installs a StartupProfiler before importing the app when the flag is
+given. Imports are timed like ``python -X importtime`` (self and cumulative
+microseconds per module, nested imports charged to their importer) by a
+meta-path finder that wraps each module's loader; GunsmokeApp marks each
+splash phase with mark_phase(). finish() writes a JSON report and prints a
+sorted summary.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+STARTUP_PROFILE_PATH = os.path.join("data", "startup_profile.json")
+FLAG = "--profile-startup"
+
+_SUMMARY_TOP = 25
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000.0, 2)
+
+
+class _TimedLoader:
+    """Delegating loader whose exec_module is timed (everything else passes through)."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+    def exec_module(self, module) -> None:
+        # Hand the real loader back to the module so isinstance checks and
+        # later reloads never see the wrapper.
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        module.__loader__ = self._loader
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave()
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find = getattr(finder, "find_spec", None)
+            if find is None:
+                continue
+            spec = find(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self, path: str = STARTUP_PROFILE_PATH):
+        self.path = path
+        self.t0 = time.perf_counter()
+        self.imports: List[Dict[str, Any]] = []
+        self.phases: List[Dict[str, Any]] = []
+        self.background: List[Dict[str, Any]] = []
+        self._open_phase: Optional[Dict[str, Any]] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._finder = _TimingFinder(self)
+        self.finished = False
+
+    # -- imports -------------------------------------------------------------
+
+    def install(self) -> "StartupProfiler":
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+        return self
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name: str) -> None:
+        # [module, start, time spent in nested imports]
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _leave(self) -> None:
+        stack = self._stack()
+        name, start, children = stack.pop()
+        cumulative = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += cumulative
+        with self._lock:
+            self.imports.append(
+                {
+                    "module": name,
+                    "self_us": int((cumulative - children) * 1e6),
+                    "cumulative_us": int(cumulative * 1e6),
+                    "depth": len(stack),
+                    "thread": threading.current_thread().name,
+                }
+            )
+
+    # -- phases --------------------------------------------------------------
+
+    def mark(self, name: str) -> None:
+        """End the current phase (if any) and start `name`."""
+        now = time.perf_counter()
+        with self._lock:
+            if self._open_phase is not None:
+                self._open_phase["duration_ms"] = _ms(now - self._open_phase["_start"])
+            self._open_phase = {"name": name, "start_ms": _ms(now - self.t0), "_start": now}
+            self.phases.append(self._open_phase)
+
+    def add_span(self, name: str, start: float, end: float) -> None:
+        """Record work that overlapped the phases (perf_counter start/end)."""
+        with self._lock:
+            self.background.append(
+                {
+                    "name": name,
+                    "start_ms": _ms(start - self.t0),
+                    "duration_ms": _ms(end - start),
+                }
+            )
+
+    # -- report --------------------------------------------------------------
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = [
+                {k: v for k, v in p.items() if not k.startswith("_")} for p in self.phases
+            ]
+            imports = list(self.imports)
+            background = list(self.background)
+        return {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "total_ms": _ms(time.perf_counter() - self.t0),
+            "import_total_ms": round(
+                sum(i["self_us"] for i in imports) / 1000.0, 2
+            ),
+            "phases": phases,
+            "background": background,
+            "imports": imports,
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Close the last phase, stop timing imports, write JSON, print summary."""
+        if self._open_phase is not None and "duration_ms" not in self._open_phase:
+            self._open_phase["duration_ms"] = _ms(
+                time.perf_counter() - self._open_phase["_start"]
+            )
+        self.uninstall()
+        self.finished = True
+        data = self.report()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            print(f"Could not write startup profile: {e}")
+        print(format_summary(data))
+        print(f"Startup profile written to {self.path}")
+        return data
+
+
+def format_summary(data: Dict[str, Any], top: int = _SUMMARY_TOP) -> str:
+    lines = [
+        f"Startup {data['total_ms']:.0f} ms "
+        f"(imports {data['import_total_ms']:.0f} ms, Python {data['python']})",
+        "",
+        "Phases:",
+    ]
+    for p in data["phases"]:
+        lines.append(f"  {p.get('duration_ms', 0):9.1f} ms  {p['name']}")
+    for b in data["background"]:
+        lines.append(f"  {b['duration_ms']:9.1f} ms  {b['name']} (background)")
+
+    imports = data["imports"]
+    lines += ["", f"Slowest imports by self time (top {top}):", "     self µs   cumul µs  module"]
+    for i in sorted(imports, key=lambda r: -r["self_us"])[:top]:
+        lines.append(f"  {i['self_us']:>10}  {i['cumulative_us']:>9}  {i['module']}")
+    lines += ["", f"Slowest top-level imports by cumulative time (top {top}):"]
+    roots = [i for i in imports if i["depth"] == 0]
+    for i in sorted(roots, key=lambda r: -r["cumulative_us"])[:top]:
+        lines.append(f"  {i['cumulative_us']:>10}  {i['module']}  [{i['thread']}]")
+    return "\n".join(lines)
+
+
+_active: Optional[StartupProfiler] = None
+
+
+def start_from_argv(argv: List[str]) -> Optional[StartupProfiler]:
+    """Install the profiler if argv has --profile-startup[=PATH] (flag is removed)."""
+    global _active
+    for arg in list(argv):
+        if arg == FLAG or arg.startswith(FLAG + "="):
+            argv.remove(arg)
+            path = arg.split("=", 1)[1] if "=" in arg else STARTUP_PROFILE_PATH
+            _active = StartupProfiler(path or STARTUP_PROFILE_PATH).install()
+            return _active
+    return None
+
+
+def active_profiler() -> Optional[StartupProfiler]:
+    return _active if _active is not None and not _active.finished else None
+
+
+def mark_phase(name: str) -> None:
+    """No-op unless --profile-startup is on."""
+    if _active is not None and not _active.finished:
+        _active.mark(name)
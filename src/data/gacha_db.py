@@ -4,66 +4,476 @@ from __future__ import annotations
 
 import os
 import sqlite3
-from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from src.data.sqlite_pool import get_manager
+
 DB_PATH = os.path.join("data", "gacha.db")
 
+_ANNOTATION_COLUMNS = (
+    "pull_index",
+    "purchase_source",
+    "rarity",
+    "banner",
+    "source_index",
+    "pity",
+    "pity_kind",
+    "elite_pool",
+    "fifty_fifty",
+)
+
+# Timeline order used for pity (see list_pulls): time ASC, id DESC.
+_AT_OR_AFTER = "(p.purchase_ts > ? OR (p.purchase_ts = ? AND p.id <= ?))"
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_EPOCH = datetime(1970, 1, 1)
+
+# pull_rows columns written by inserts, in _encode_pulls order.
+_PULL_ROW_COLUMNS = (
+    "purchase_ts, raw_time, source_id, type_id, item_id, ordinal, rarity_id, "
+    "scanned_at"
+)
+
+
+def _encode_time(purchase_time: str) -> Tuple[int, str]:
+    """purchase_time text → (purchase_ts, raw_time) as stored in pull_rows.
+
+    purchase_ts is the in-game wall-clock time counted as if it were UTC, so
+    SQLite's datetime(purchase_ts, 'unixepoch') gives the text back exactly.
+    Text that is not YYYY-MM-DD HH:MM:SS (hand-made imports) is kept as
+    raw_time, with a best-effort purchase_ts for ordering.
+    """
+    try:
+        dt = datetime.fromisoformat(str(purchase_time).strip())
+    except ValueError:
+        return 0, str(purchase_time)
+    ts = (dt.replace(tzinfo=None) - _EPOCH) // timedelta(seconds=1)
+    # 19 characters: no fraction or UTC offset that purchase_ts would drop.
+    exact = len(purchase_time) == 19 and dt.isoformat(" ") == purchase_time
+    return ts, "" if exact else str(purchase_time)
+
+
+def _bound_ts(bound: str, upper: bool) -> Optional[int]:
+    """purchase_ts limit equal to comparing purchase_time text with bound.
+
+    Handles full timestamps and bare dates; None for anything else. A bare
+    date as upper bound excludes that day, as the text comparison did. Only
+    valid for rows without raw_time; _time_range compares those as text.
+    """
+    ts, raw = _encode_time(bound)
+    if not raw:
+        return ts
+    try:
+        day = datetime.strptime(bound, "%Y-%m-%d")
+    except ValueError:
+        return None
+    if day.strftime("%Y-%m-%d") != bound:
+        return None
+    ts = (day - _EPOCH) // timedelta(seconds=1)
+    return ts - 1 if upper else ts
+
+
+def _time_range(
+    date_from: Optional[str], date_to: Optional[str]
+) -> Tuple[List[str], List[Any]]:
+    """WHERE clauses (on the pulls view as p) for a purchase_time range.
+
+    Rows kept as raw_time are compared as text, like every row was in v1.
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    for bound, op, upper in ((date_from, ">=", False), (date_to, "<=", True)):
+        if not bound:
+            continue
+        ts = _bound_ts(bound, upper)
+        if ts is None:
+            clauses.append(f"p.purchase_time {op} ?")
+            params.append(bound)
+        else:
+            clauses.append(
+                f"(p.raw_time = '' AND p.purchase_ts {op} ?"
+                f" OR p.raw_time != '' AND p.purchase_time {op} ?)"
+            )
+            params += [ts, bound]
+    return clauses, params
+
 
 class GachaDB:
     def __init__(self, path: str = DB_PATH):
         self.path = path
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = get_manager(self.path)
         self._init_schema()
 
-    @contextmanager
     def _connect(self):
-        conn = sqlite3.connect(self.path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        """Shared writer connection, one transaction per outermost block."""
+        return self._db.write()
+
+    def _read(self):
+        """Pooled reader connection (WAL: does not wait for the writer)."""
+        return self._db.read()
 
     def _init_schema(self):
         with self._connect() as conn:
+            fresh = not (
+                self._has_table(conn, "pulls") or self._has_table(conn, "pull_rows")
+            )
+            self._init_pull_schema(conn)
+            self._init_annotation_schema(conn)
+            self._init_revision_schema(conn)
             conn.execute(
                 """
-                CREATE TABLE IF NOT EXISTS pulls (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    purchase_time TEXT NOT NULL,
-                    purchase_source TEXT NOT NULL,
-                    item_type TEXT NOT NULL,
+                CREATE TABLE IF NOT EXISTS collection_overrides (
                     item_name TEXT NOT NULL,
-                    ordinal INTEGER NOT NULL DEFAULT 0,
-                    rarity_color TEXT,
-                    scanned_at TEXT NOT NULL,
-                    UNIQUE (purchase_time, item_name, ordinal)
+                    item_type TEXT NOT NULL,
+                    copies INTEGER NOT NULL,
+                    PRIMARY KEY (item_name, item_type)
                 )
                 """
             )
+            migrated = self._migrate(conn, fresh=fresh)
+            self._init_pulls_view(conn)
+        if migrated:
+            # Give the space of rewritten tables back to the file system.
+            with self._connect() as conn:
+                conn.execute("VACUUM")
+
+    @staticmethod
+    def _has_table(conn, name: str) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _init_pull_schema(conn) -> None:
+        """pull_rows: one row per pull, integer-coded (schema v2).
+
+        Source, type, item name and rarity color are ids into small
+        dictionary tables; purchase_time is purchase_ts (see _encode_time).
+        Read through the pulls view, which has the v1 text columns.
+        """
+        for table in ("pull_sources", "pull_types", "pull_items", "pull_rarities"):
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_pulls_time ON pulls(purchase_time DESC)"
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                )
+                """
+            )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pull_rows (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                purchase_ts INTEGER NOT NULL,
+                raw_time TEXT NOT NULL DEFAULT '',
+                source_id INTEGER NOT NULL,
+                type_id INTEGER NOT NULL,
+                item_id INTEGER NOT NULL,
+                ordinal INTEGER NOT NULL DEFAULT 0,
+                rarity_id INTEGER,
+                scanned_at TEXT NOT NULL,
+                UNIQUE (purchase_ts, item_id, ordinal, raw_time)
             )
+            """
+        )
+        # DESC + rowid: read forward is time DESC, id ASC and backward is
+        # time ASC, id DESC - both timeline orders without a sort.
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_pull_rows_time
+            ON pull_rows(purchase_ts DESC)
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pull_rows_source ON pull_rows(source_id)"
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_pull_rows_rarity
+            ON pull_rows(rarity_id, type_id, item_id)
+            """
+        )
+
+    @staticmethod
+    def _init_pulls_view(conn) -> None:
+        """pulls: the v1 table's columns over pull_rows, plus purchase_ts, raw_time."""
+        # Recreated on every open so older v2 files get the current columns.
+        conn.execute("DROP VIEW IF EXISTS pulls")
+        conn.execute(
+            """
+            CREATE VIEW pulls AS
+            SELECT p.id,
+                   CASE p.raw_time
+                       WHEN '' THEN datetime(p.purchase_ts, 'unixepoch')
+                       ELSE p.raw_time
+                   END AS purchase_time,
+                   s.name AS purchase_source,
+                   t.name AS item_type,
+                   i.name AS item_name,
+                   p.ordinal,
+                   r.name AS rarity_color,
+                   p.scanned_at,
+                   p.purchase_ts,
+                   p.raw_time
+            FROM pull_rows p
+            JOIN pull_sources s ON s.id = p.source_id
+            JOIN pull_types t ON t.id = p.type_id
+            JOIN pull_items i ON i.id = p.item_id
+            LEFT JOIN pull_rarities r ON r.id = p.rarity_id
+            """
+        )
+
+    @staticmethod
+    def _intern(conn, table: str, names: Iterable[Optional[str]]) -> Dict[str, int]:
+        """Ids of names in a dictionary table, adding the ones it lacks."""
+        wanted = list({n for n in names if n is not None})
+        if not wanted:
+            return {}
+        marks = ", ".join("?" * len(wanted))
+        sql = f"SELECT name, id FROM {table} WHERE name IN ({marks})"
+        ids = dict(conn.execute(sql, wanted).fetchall())
+        if len(ids) < len(wanted):
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {table} (name) VALUES (?)",
+                [(n,) for n in wanted if n not in ids],
+            )
+            ids = dict(conn.execute(sql, wanted).fetchall())
+        return ids
+
+    def _encode_pulls(self, conn, pulls: List[tuple]) -> List[tuple]:
+        """(time, source, type, name, ordinal, rarity, scanned) → pull_rows values."""
+        sources = self._intern(conn, "pull_sources", (p[1] for p in pulls))
+        types = self._intern(conn, "pull_types", (p[2] for p in pulls))
+        items = self._intern(conn, "pull_items", (p[3] for p in pulls))
+        rarities = self._intern(conn, "pull_rarities", (p[5] for p in pulls))
+        rows = []
+        for purchase_time, source, item_type, name, ordinal, rarity, scanned in pulls:
+            ts, raw = _encode_time(purchase_time)
+            rows.append(
+                (
+                    ts,
+                    raw,
+                    sources[source],
+                    types[item_type],
+                    items[name],
+                    ordinal,
+                    rarities.get(rarity),
+                    scanned,
+                )
+            )
+        return rows
+
+    @staticmethod
+    def _init_annotation_schema(conn) -> None:
+        """pull_annotations: annotate_pulls output per pulls.id, kept current.
+
+        Edits to a pull drop its annotation and note its old timeline position
+        in annotation_dirty; refresh_annotations replays from the earliest
+        unannotated / dirty position onward.
+        """
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pull_annotations (
+                pull_id INTEGER PRIMARY KEY,
+                pull_index INTEGER NOT NULL,
+                purchase_source TEXT NOT NULL,
+                rarity TEXT NOT NULL,
+                banner TEXT NOT NULL,
+                source_index INTEGER NOT NULL,
+                pity INTEGER,
+                pity_kind TEXT,
+                elite_pool TEXT,
+                fifty_fifty TEXT
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_annotations_source
+            ON pull_annotations(purchase_source, pull_index)
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS annotation_dirty (
+                purchase_ts INTEGER NOT NULL,
+                pull_id INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS pull_rows_annotation_update
+            AFTER UPDATE OF purchase_ts, source_id, type_id, item_id, rarity_id
+            ON pull_rows
+            WHEN OLD.purchase_ts IS NOT NEW.purchase_ts
+              OR OLD.source_id IS NOT NEW.source_id
+              OR OLD.type_id IS NOT NEW.type_id
+              OR OLD.item_id IS NOT NEW.item_id
+              OR OLD.rarity_id IS NOT NEW.rarity_id
+            BEGIN
+                DELETE FROM pull_annotations WHERE pull_id = NEW.id;
+                INSERT INTO annotation_dirty VALUES (OLD.purchase_ts, OLD.id);
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS pull_rows_annotation_delete
+            AFTER DELETE ON pull_rows
+            BEGIN
+                DELETE FROM pull_annotations WHERE pull_id = OLD.id;
+                INSERT INTO annotation_dirty VALUES (OLD.purchase_ts, OLD.id);
+            END
+            """
+        )
+
+    # (version, name, method): one-shot data migrations, applied in order once
+    # per database and recorded in schema_migrations. A new database starts
+    # at the current layout and records them all as applied.
+    _MIGRATIONS = (
+        (1, "canonical_purchase_sources", "_canonical_sources_v1"),
+        (2, "integer_coded_pulls", "_compact_pulls"),
+    )
+
+    def _migrate(self, conn, fresh: bool = False) -> int:
+        """Apply pending migrations. Returns how many rows they changed."""
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+            """
+        )
+        done = {r[0] for r in conn.execute("SELECT version FROM schema_migrations")}
+        total = 0
+        for version, name, method in self._MIGRATIONS:
+            if version in done:
+                continue
+            changed = 0 if fresh else getattr(self, method)(conn)
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_pulls_source ON pulls(purchase_source)"
+                "INSERT INTO schema_migrations VALUES (?, ?, ?)",
+                (version, name, datetime.now().strftime(_TIME_FORMAT)),
             )
+            if changed:
+                print(f"{self.path}: migration {version} ({name}): {changed} rows")
+            total += changed
+        return total
+
+    def schema_migrations(self) -> List[Tuple[int, str, str]]:
+        """Applied migrations as (version, name, applied_at), oldest first."""
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT version, name, applied_at FROM schema_migrations"
+                " ORDER BY version"
+            ).fetchall()
+        return [tuple(r) for r in rows]
+
+    @staticmethod
+    def _canonical_sources_v1(conn) -> int:
+        """Migration 1: canonical purchase_source in the v1 text table."""
+        from src.core.gacha_stats import normalize_source
+
+        updated = 0
+        rows = conn.execute("SELECT DISTINCT purchase_source FROM pulls").fetchall()
+        for (raw,) in rows:
+            canon = normalize_source(raw)
+            if not canon or canon == raw:
+                continue
+            cur = conn.execute(
+                "UPDATE pulls SET purchase_source = ? WHERE purchase_source = ?",
+                (canon, raw),
+            )
+            updated += cur.rowcount
+        return updated
+
+    def _compact_pulls(self, conn) -> int:
+        """Migration 2: move the v1 pulls table into pull_rows, keeping ids.
+
+        The v1 table (with its indexes and triggers) is dropped so the pulls
+        view can take its name. Stored annotations are cleared and rebuilt
+        by the next refresh_annotations, as annotation_dirty changes shape.
+        """
+        legacy = conn.execute(
+            """
+            SELECT id, purchase_time, purchase_source, item_type, item_name,
+                   ordinal, rarity_color, scanned_at
+            FROM pulls
+            ORDER BY id
+            """
+        ).fetchall()
+        rows = self._encode_pulls(conn, [tuple(r)[1:] for r in legacy])
+        conn.executemany(
+            f"""
+            INSERT INTO pull_rows (id, {_PULL_ROW_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(r["id"],) + row for r, row in zip(legacy, rows)],
+        )
+        conn.execute("DROP TABLE pulls")
+        conn.execute("DROP TABLE annotation_dirty")
+        conn.execute("DELETE FROM pull_annotations")
+        self._init_annotation_schema(conn)
+        return len(rows)
+
+    @staticmethod
+    def _init_revision_schema(conn) -> None:
+        """pulls_revision: one counter bumped by every change to pulls.
+
+        Triggers keep it current for every write path (scans, imports, edits,
+        normalization, clear). Writes that change nothing shown - INSERT OR
+        IGNORE duplicates, UPDATEs matching no row, a rescan refreshing only
+        scanned_at - leave it alone, so views can cache per revision().
+        """
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pulls_revision (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                revision INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO pulls_revision (id, revision) VALUES (1, 0)"
+        )
+        changed = """
+            OLD.purchase_ts IS NOT NEW.purchase_ts
+            OR OLD.raw_time IS NOT NEW.raw_time
+            OR OLD.source_id IS NOT NEW.source_id
+            OR OLD.type_id IS NOT NEW.type_id
+            OR OLD.item_id IS NOT NEW.item_id
+            OR OLD.ordinal IS NOT NEW.ordinal
+            OR OLD.rarity_id IS NOT NEW.rarity_id
+        """
+        for event, when in (
+            ("INSERT", ""),
+            ("UPDATE", f"WHEN {changed}"),
+            ("DELETE", ""),
+        ):
             conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS collection_overrides (
-                    item_name TEXT NOT NULL,
-                    item_type TEXT NOT NULL,
-                    copies INTEGER NOT NULL,
-                    PRIMARY KEY (item_name, item_type)
-                )
+                f"""
+                CREATE TRIGGER IF NOT EXISTS pull_rows_revision_{event.lower()}
+                AFTER {event} ON pull_rows
+                {when}
+                BEGIN
+                    UPDATE pulls_revision SET revision = revision + 1 WHERE id = 1;
+                END
                 """
             )
 
+    def revision(self) -> int:
+        """Change token for pulls: differs whenever any pull was written since."""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT revision FROM pulls_revision WHERE id = 1"
+            ).fetchone()
+        return int(row[0]) if row else 0
+
     def insert_pull(
         self,
         purchase_time: str,
@@ -75,25 +485,32 @@ class GachaDB:
         scanned_at: Optional[str] = None,
     ) -> bool:
         """Insert a pull. Returns True if inserted, False if duplicate."""
+        from src.core.gacha_stats import normalize_source
+
+        purchase_source = normalize_source(purchase_source)
         if scanned_at is None:
-            scanned_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            scanned_at = datetime.now().strftime(_TIME_FORMAT)
         with self._connect() as conn:
+            (row,) = self._encode_pulls(
+                conn,
+                [
+                    (
+                        purchase_time,
+                        purchase_source,
+                        item_type,
+                        item_name,
+                        ordinal,
+                        rarity_color,
+                        scanned_at,
+                    )
+                ],
+            )
             cur = conn.execute(
-                """
-                INSERT OR IGNORE INTO pulls (
-                    purchase_time, purchase_source, item_type, item_name,
-                    ordinal, rarity_color, scanned_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                f"""
+                INSERT OR IGNORE INTO pull_rows ({_PULL_ROW_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    purchase_time,
-                    purchase_source,
-                    item_type,
-                    item_name,
-                    ordinal,
-                    rarity_color,
-                    scanned_at,
-                ),
+                row,
             )
             return cur.rowcount > 0
 
@@ -105,14 +522,16 @@ class GachaDB:
         conn: Optional[sqlite3.Connection] = None,
     ) -> bool:
         sql = """
-            SELECT 1 FROM pulls
-            WHERE purchase_time = ? AND item_name = ? AND ordinal = ?
+            SELECT 1 FROM pull_rows p
+            JOIN pull_items i ON i.id = p.item_id
+            WHERE p.purchase_ts = ? AND p.raw_time = ? AND i.name = ?
+              AND p.ordinal = ?
             LIMIT 1
         """
-        params = (purchase_time, item_name, ordinal)
+        params = _encode_time(purchase_time) + (item_name, ordinal)
         if conn is not None:
             return conn.execute(sql, params).fetchone() is not None
-        with self._connect() as c:
+        with self._read() as c:
             return c.execute(sql, params).fetchone() is not None
 
     def insert_pulls(self, pulls: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
@@ -120,42 +539,84 @@ class GachaDB:
 
         Existing rows (same time, name, ordinal) are updated in place and
         counted as already_known so the scanner can stop when catching up.
+        One set-based existence probe + one executemany per call, so a scan
+        page and a history import of thousands of rows take the same path.
+        purchase_source is stored canonical (normalize_source).
         """
-        inserted = 0
-        known = 0
-        scanned_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        from src.core.gacha_stats import normalize_source
+
+        scanned_at = datetime.now().strftime(_TIME_FORMAT)
+        pulls = [
+            (
+                p["purchase_time"],
+                normalize_source(p["purchase_source"]),
+                p["item_type"],
+                p["item_name"],
+                int(p.get("ordinal", 0)),
+                p.get("rarity_color"),
+                p.get("scanned_at", scanned_at),
+            )
+            for p in pulls
+        ]
+        if not pulls:
+            return 0, 0
+
         with self._connect() as conn:
-            for p in pulls:
-                time_s = p["purchase_time"]
-                name = p["item_name"]
-                ordinal = int(p.get("ordinal", 0))
-                existed = self.pull_exists(time_s, name, ordinal, conn=conn)
-                conn.execute(
+            rows = self._encode_pulls(conn, pulls)
+            conn.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS incoming_keys (
+                    purchase_ts INTEGER NOT NULL,
+                    raw_time TEXT NOT NULL,
+                    item_id INTEGER NOT NULL,
+                    ordinal INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("DELETE FROM incoming_keys")
+            conn.executemany(
+                "INSERT INTO incoming_keys VALUES (?, ?, ?, ?)",
+                [(r[0], r[1], r[4], r[5]) for r in rows],
+            )
+            existing = {
+                tuple(r)
+                for r in conn.execute(
+                    """
+                    SELECT DISTINCT p.purchase_ts, p.raw_time, p.item_id, p.ordinal
+                    FROM incoming_keys k
+                    JOIN pull_rows p
+                      ON p.purchase_ts = k.purchase_ts
+                     AND p.item_id = k.item_id
+                     AND p.ordinal = k.ordinal
+                     AND p.raw_time = k.raw_time
                     """
-                    INSERT INTO pulls (
-                        purchase_time, purchase_source, item_type, item_name,
-                        ordinal, rarity_color, scanned_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(purchase_time, item_name, ordinal) DO UPDATE SET
-                        purchase_source = excluded.purchase_source,
-                        item_type = excluded.item_type,
-                        rarity_color = excluded.rarity_color,
-                        scanned_at = excluded.scanned_at
-                    """,
-                    (
-                        time_s,
-                        p["purchase_source"],
-                        p["item_type"],
-                        name,
-                        ordinal,
-                        p.get("rarity_color"),
-                        p.get("scanned_at", scanned_at),
-                    ),
                 )
-                if existed:
-                    known += 1
-                else:
-                    inserted += 1
+            }
+            conn.execute("DELETE FROM incoming_keys")
+            conn.executemany(
+                f"""
+                INSERT INTO pull_rows ({_PULL_ROW_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(purchase_ts, item_id, ordinal, raw_time) DO UPDATE SET
+                    source_id = excluded.source_id,
+                    type_id = excluded.type_id,
+                    rarity_id = excluded.rarity_id,
+                    scanned_at = excluded.scanned_at
+                """,
+                rows,
+            )
+
+        # A key repeated within the batch is "known" from its second row on,
+        # exactly as when rows were probed one at a time.
+        inserted = 0
+        known = 0
+        for r in rows:
+            key = (r[0], r[1], r[4], r[5])
+            if key in existing:
+                known += 1
+            else:
+                existing.add(key)
+                inserted += 1
         return inserted, known
 
     def list_pulls(
@@ -170,17 +631,14 @@ class GachaDB:
         clauses = []
         params: List[Any] = []
         if purchase_source:
-            clauses.append("purchase_source = ?")
+            clauses.append("p.purchase_source = ?")
             params.append(purchase_source)
         if item_type:
-            clauses.append("item_type = ?")
+            clauses.append("p.item_type = ?")
             params.append(item_type)
-        if date_from:
-            clauses.append("purchase_time >= ?")
-            params.append(date_from)
-        if date_to:
-            clauses.append("purchase_time <= ?")
-            params.append(date_to)
+        time_clauses, time_params = _time_range(date_from, date_to)
+        clauses += time_clauses
+        params += time_params
 
         where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
         params.append(limit)
@@ -189,19 +647,19 @@ class GachaDB:
         # Oldest→newest pity timeline must reverse that: time ASC, id DESC.
         # Newest→oldest UI order matches scan order: time DESC, id ASC.
         order = (
-            "ORDER BY purchase_time ASC, id DESC"
+            "ORDER BY p.purchase_ts ASC, p.id DESC"
             if oldest_first
-            else "ORDER BY purchase_time DESC, id ASC"
+            else "ORDER BY p.purchase_ts DESC, p.id ASC"
         )
         sql = f"""
-            SELECT id, purchase_time, purchase_source, item_type, item_name,
-                   ordinal, rarity_color, scanned_at
-            FROM pulls
+            SELECT p.id, p.purchase_time, p.purchase_source, p.item_type,
+                   p.item_name, p.ordinal, p.rarity_color, p.scanned_at
+            FROM pulls p
             {where}
             {order}
             LIMIT ?
         """
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(sql, params).fetchall()
         return [dict(r) for r in rows]
 
@@ -219,78 +677,251 @@ class GachaDB:
             oldest_first=True,
         )
 
-    def distinct_sources(self) -> List[str]:
+    def refresh_annotations(self) -> int:
+        """Bring pull_annotations up to date. Returns how many rows were replayed.
+
+        Finds the earliest pull (timeline order) that is new or was edited,
+        resumes the annotator from the stored rows before it, and replays
+        only from there - a catch-up scan replays just the new pulls.
+        """
+        from src.core.gacha_stats import PullAnnotator
+
+        def _earlier(a, b):
+            if a is None:
+                return b
+            if b is None:
+                return a
+            # (purchase_ts, id): later time or, within a second, lower id
+            # is later in the timeline.
+            return min(a, b, key=lambda k: (k[0], -k[1]))
+
         with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT p.purchase_ts, p.id FROM pull_rows p
+                LEFT JOIN pull_annotations a ON a.pull_id = p.id
+                WHERE a.pull_id IS NULL
+                ORDER BY p.purchase_ts ASC, p.id DESC
+                LIMIT 1
+                """
+            ).fetchone()
+            start = tuple(row) if row else None
+            row = conn.execute(
+                """
+                SELECT purchase_ts, pull_id FROM annotation_dirty
+                ORDER BY purchase_ts ASC, pull_id DESC
+                LIMIT 1
+                """
+            ).fetchone()
+            dirty = tuple(row) if row else None
+            start = _earlier(start, dirty)
+            if start is None:
+                return 0
+            t, pid = start
+            if dirty is not None:
+                conn.execute("DELETE FROM annotation_dirty")
+                conn.execute(
+                    """
+                    DELETE FROM pull_annotations
+                    WHERE pull_id NOT IN (SELECT id FROM pull_rows)
+                    """
+                )
+            conn.execute(
+                f"""
+                DELETE FROM pull_annotations WHERE pull_id IN (
+                    SELECT p.id FROM pull_rows p WHERE {_AT_OR_AFTER}
+                )
+                """,
+                (t, t, pid),
+            )
+
+            count = conn.execute(
+                "SELECT COALESCE(MAX(pull_index), 0) FROM pull_annotations"
+            ).fetchone()[0]
+            last_by_source = [
+                dict(r)
+                for r in conn.execute(
+                    """
+                    SELECT a.* FROM pull_annotations a
+                    JOIN (
+                        SELECT purchase_source, MAX(pull_index) AS last
+                        FROM pull_annotations GROUP BY purchase_source
+                    ) m ON m.purchase_source = a.purchase_source
+                       AND m.last = a.pull_index
+                    """
+                )
+            ]
+            last_fifty = {
+                kind: outcome
+                for kind, outcome in conn.execute(
+                    """
+                    SELECT a.pity_kind, a.fifty_fifty FROM pull_annotations a
+                    JOIN (
+                        SELECT pity_kind, MAX(pull_index) AS last
+                        FROM pull_annotations
+                        WHERE fifty_fifty IS NOT NULL
+                        GROUP BY pity_kind
+                    ) m ON m.pity_kind = a.pity_kind AND m.last = a.pull_index
+                    """
+                )
+            }
+            annotator = PullAnnotator.resume(count, last_by_source, last_fifty)
+
+            pending = conn.execute(
+                f"""
+                SELECT p.id, p.purchase_source, p.item_type, p.item_name,
+                       p.rarity_color
+                FROM pulls p
+                WHERE {_AT_OR_AFTER}
+                ORDER BY p.purchase_ts ASC, p.id DESC
+                """,
+                (t, t, pid),
+            ).fetchall()
+            rows = []
+            for r in pending:
+                a = annotator.annotate(dict(r))
+                rows.append((r["id"],) + tuple(a[c] for c in _ANNOTATION_COLUMNS))
+            conn.executemany(
+                f"""
+                INSERT INTO pull_annotations (pull_id, {", ".join(_ANNOTATION_COLUMNS)})
+                VALUES ({", ".join("?" * (len(_ANNOTATION_COLUMNS) + 1))})
+                """,
+                rows,
+            )
+            return len(rows)
+
+    def list_annotated(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Oldest → newest pulls with their stored annotation (annotate_pulls shape).
+
+        Pity / pull_index always come from the full history; the date range
+        only limits which rows are returned.
+        """
+        self.refresh_annotations()
+        clauses, params = _time_range(date_from, date_to)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        tail = ""
+        if limit is not None:
+            tail = "LIMIT ?"
+            params.append(limit)
+        sql = f"""
+            SELECT p.id, p.purchase_time, a.purchase_source, p.item_type,
+                   p.item_name, p.ordinal, p.rarity_color, p.scanned_at,
+                   a.pull_index, a.rarity, a.banner, a.source_index, a.pity,
+                   a.pity_kind, a.elite_pool, a.fifty_fifty
+            FROM pulls p
+            JOIN pull_annotations a ON a.pull_id = p.id
+            {where}
+            ORDER BY p.purchase_ts ASC, p.id DESC
+            {tail}
+        """
+        with self._read() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
+
+    def distinct_sources(self) -> List[str]:
+        with self._read() as conn:
             rows = conn.execute(
-                "SELECT DISTINCT purchase_source FROM pulls ORDER BY purchase_source"
+                """
+                SELECT name FROM pull_sources
+                WHERE id IN (SELECT source_id FROM pull_rows)
+                ORDER BY name
+                """
             ).fetchall()
         return [r[0] for r in rows]
 
     def count_pulls(self) -> int:
-        with self._connect() as conn:
-            row = conn.execute("SELECT COUNT(*) FROM pulls").fetchone()
+        with self._read() as conn:
+            row = conn.execute("SELECT COUNT(*) FROM pull_rows").fetchone()
         return int(row[0]) if row else 0
 
     def count_elite_copies(
         self, item_type: Optional[str] = None
     ) -> Dict[Tuple[str, str], int]:
-        """Elite pull counts by (item_name, item_type) — no full timeline load."""
-        sql = """
-            SELECT item_name, item_type, COUNT(*) AS n
-            FROM pulls
-            WHERE lower(trim(rarity_color)) IN ('elite', 'gold')
+        """Elite pull counts by (item_name, item_type) — no full timeline load.
+
+        Groups integer ids on idx_pull_rows_rarity; names are joined on the
+        grouped rows only.
+        """
+        inner = """
+            SELECT item_id, type_id, COUNT(*) AS n
+            FROM pull_rows
+            WHERE rarity_id IN (
+                SELECT id FROM pull_rarities
+                WHERE lower(trim(name)) IN ('elite', 'gold')
+            )
         """
         params: list = []
         if item_type:
-            sql += " AND item_type = ?"
+            inner += " AND type_id IN (SELECT id FROM pull_types WHERE name = ?)"
             params.append(item_type)
-        sql += " GROUP BY item_name, item_type"
-        with self._connect() as conn:
+        inner += " GROUP BY item_id, type_id"
+        sql = f"""
+            SELECT i.name, t.name, c.n
+            FROM ({inner}) c
+            JOIN pull_items i ON i.id = c.item_id
+            JOIN pull_types t ON t.id = c.type_id
+        """
+        with self._read() as conn:
             rows = conn.execute(sql, params).fetchall()
         return {(r[0], r[1]): int(r[2]) for r in rows}
 
     def clear_all(self) -> None:
         with self._connect() as conn:
-            conn.execute("DELETE FROM pulls")
+            conn.execute("DELETE FROM pull_rows")
+            for table in ("pull_sources", "pull_types", "pull_items", "pull_rarities"):
+                conn.execute(f"DELETE FROM {table}")
 
     def normalize_purchase_sources(self) -> int:
         """Rewrite OCR-mangled purchase_source values to canonical names.
 
-        Returns how many rows were updated.
+        Inserts store canonical names and migration 1 fixed older rows, so
+        this is only needed after changing the source rules. Returns how many
+        rows were updated.
         """
-        from src.core.gacha_scanner import clean_source
+        from src.core.gacha_stats import normalize_source
 
         updated = 0
         with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT DISTINCT purchase_source FROM pulls"
-            ).fetchall()
-            for (raw,) in rows:
-                canon = clean_source(raw)
+            rows = conn.execute("SELECT id, name FROM pull_sources").fetchall()
+            for source_id, raw in rows:
+                canon = normalize_source(raw)
                 if not canon or canon == raw:
                     continue
+                canon_id = self._intern(conn, "pull_sources", (canon,))[canon]
                 cur = conn.execute(
-                    "UPDATE pulls SET purchase_source = ? WHERE purchase_source = ?",
-                    (canon, raw),
+                    "UPDATE pull_rows SET source_id = ? WHERE source_id = ?",
+                    (canon_id, source_id),
                 )
+                conn.execute("DELETE FROM pull_sources WHERE id = ?", (source_id,))
                 updated += cur.rowcount
         return updated
 
     def distinct_item_names(self) -> List[str]:
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
-                "SELECT DISTINCT item_name FROM pulls ORDER BY item_name"
+                """
+                SELECT name FROM pull_items
+                WHERE id IN (SELECT item_id FROM pull_rows)
+                ORDER BY name
+                """
             ).fetchall()
         return [r[0] for r in rows if r[0]]
 
     def distinct_item_name_types(self) -> List[Tuple[str, str]]:
         """Distinct (item_name, item_type) pairs for type-aware OCR repair."""
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 """
-                SELECT DISTINCT item_name, item_type
-                FROM pulls
-                ORDER BY item_type, item_name
+                SELECT i.name, t.name
+                FROM (SELECT DISTINCT item_id, type_id FROM pull_rows) c
+                JOIN pull_items i ON i.id = c.item_id
+                JOIN pull_types t ON t.id = c.type_id
+                ORDER BY t.name, i.name
                 """
             ).fetchall()
         return [(r[0], r[1] or "") for r in rows if r[0]]
@@ -309,60 +940,54 @@ class GachaDB:
         if not old_name or not new_name or old_name == new_name:
             return 0
         with self._connect() as conn:
+            new_id = self._intern(conn, "pull_items", (new_name,))[new_name]
+            match = "item_id IN (SELECT id FROM pull_items WHERE name = ?)"
+            params: List[Any] = [old_name]
             if item_type:
-                conflict_sql = """
-                    SELECT p.id, p.purchase_time, p.ordinal
-                    FROM pulls p
-                    WHERE p.item_name = ? AND p.item_type = ?
-                      AND EXISTS (
-                        SELECT 1 FROM pulls q
-                        WHERE q.purchase_time = p.purchase_time
-                          AND q.item_name = ?
-                          AND q.ordinal = p.ordinal
-                          AND q.id != p.id
-                      )
-                """
-                conflict_params = (old_name, item_type, new_name)
-            else:
-                conflict_sql = """
-                    SELECT p.id, p.purchase_time, p.ordinal
-                    FROM pulls p
-                    WHERE p.item_name = ?
-                      AND EXISTS (
-                        SELECT 1 FROM pulls q
-                        WHERE q.purchase_time = p.purchase_time
-                          AND q.item_name = ?
-                          AND q.ordinal = p.ordinal
-                          AND q.id != p.id
-                      )
-                """
-                conflict_params = (old_name, new_name)
+                match += " AND type_id IN (SELECT id FROM pull_types WHERE name = ?)"
+                params.append(item_type)
 
-            conflicts = conn.execute(conflict_sql, conflict_params).fetchall()
-            for row_id, purchase_time, ordinal in conflicts:
+            conflicts = conn.execute(
+                f"""
+                SELECT p.id, p.purchase_ts, p.raw_time, p.ordinal
+                FROM pull_rows p
+                WHERE {match}
+                  AND EXISTS (
+                    SELECT 1 FROM pull_rows q
+                    WHERE q.purchase_ts = p.purchase_ts
+                      AND q.raw_time = p.raw_time
+                      AND q.item_id = ?
+                      AND q.ordinal = p.ordinal
+                      AND q.id != p.id
+                  )
+                """,
+                params + [new_id],
+            ).fetchall()
+            for row_id, ts, raw, ordinal in conflicts:
                 new_ord = int(ordinal)
                 while True:
                     new_ord += 1
                     exists = conn.execute(
                         """
-                        SELECT 1 FROM pulls
-                        WHERE purchase_time = ? AND item_name = ? AND ordinal = ?
+                        SELECT 1 FROM pull_rows
+                        WHERE purchase_ts = ? AND raw_time = ? AND item_id = ?
+                          AND ordinal = ?
                         LIMIT 1
                         """,
-                        (purchase_time, new_name, new_ord),
+                        (ts, raw, new_id, new_ord),
                     ).fetchone()
                     if not exists:
                         break
                 conn.execute(
-                    "UPDATE pulls SET ordinal = ? WHERE id = ?",
+                    "UPDATE pull_rows SET ordinal = ? WHERE id = ?",
                     (new_ord, row_id),
                 )
 
+            cur = conn.execute(
+                f"UPDATE pull_rows SET item_id = ? WHERE {match}",
+                [new_id] + params,
+            )
             if item_type:
-                cur = conn.execute(
-                    "UPDATE pulls SET item_name = ? WHERE item_name = ? AND item_type = ?",
-                    (new_name, old_name, item_type),
-                )
                 conn.execute(
                     """
                     UPDATE OR IGNORE collection_overrides
@@ -375,10 +1000,6 @@ class GachaDB:
                     (old_name, item_type),
                 )
             else:
-                cur = conn.execute(
-                    "UPDATE pulls SET item_name = ? WHERE item_name = ?",
-                    (new_name, old_name),
-                )
                 conn.execute(
                     """
                     UPDATE OR IGNORE collection_overrides
@@ -400,7 +1021,7 @@ class GachaDB:
         return total
 
     def get_collection_overrides(self) -> Dict[Tuple[str, str], int]:
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(
                 "SELECT item_name, item_type, copies FROM collection_overrides"
             ).fetchall()
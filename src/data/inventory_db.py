@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 import os
-import sqlite3
-from contextlib import contextmanager
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from src.data.sqlite_pool import get_manager
+
 DB_PATH = os.path.join("data", "inventory.db")
 
 _CORE_DDL = """
@@ -35,20 +35,16 @@ class InventoryDB:
     def __init__(self, path: str = DB_PATH):
         self.path = path
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = get_manager(self.path)
         self._init_schema()
 
-    @contextmanager
     def _connect(self):
-        conn = sqlite3.connect(self.path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        """Shared writer connection, one transaction per outermost block."""
+        return self._db.write()
+
+    def _read(self):
+        """Pooled reader connection (WAL: does not wait for the writer)."""
+        return self._db.read()
 
     def _init_schema(self):
         with self._connect() as conn:
@@ -148,19 +144,19 @@ class InventoryDB:
             sql += " WHERE type = ?"
             params = (core_type,)
         sql += " ORDER BY type, perk1_name, perk2_name, perk3_name"
-        with self._connect() as conn:
+        with self._read() as conn:
             rows = conn.execute(sql, params).fetchall()
             return [dict(r) for r in rows]
 
     def total_quantity(self) -> int:
-        with self._connect() as conn:
+        with self._read() as conn:
             row = conn.execute(
                 "SELECT COALESCE(SUM(quantity), 0) AS n FROM growth_cores"
             ).fetchone()
             return int(row["n"] if row else 0)
 
     def unique_count(self) -> int:
-        with self._connect() as conn:
+        with self._read() as conn:
             row = conn.execute(
                 "SELECT COUNT(*) AS n FROM growth_cores"
             ).fetchone()
@@ -0,0 +1,129 @@
+"""Shared SQLite connections: one writer + a small reader pool per database file.
+
+GachaDB / InventoryDB used to open a fresh connection for every method call.
+Connections here live for the whole session, run in WAL mode (readers never
+block the scanner thread's writes and vice versa) with synchronous=NORMAL,
+and keep sqlite3's per-connection statement cache warm.
+
+Connections are created with check_same_thread=False but are only ever used
+by one thread at a time: the writer behind a lock, readers checked out of a
+queue. A thread that holds the writer gets the writer for nested reads too,
+so it sees its own uncommitted rows.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+READER_POOL_SIZE = 4
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT_MS = 5000
+
+
+def _open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return conn
+
+
+class ConnectionManager:
+    def __init__(self, path: str, readers: int = READER_POOL_SIZE):
+        self.path = path
+        self._max_readers = max(1, int(readers))
+        self._writer = _open(path)
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Writer connection in a transaction; commits when the outermost block exits."""
+        with self._write_lock:
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                yield self._writer
+                if depth == 0:
+                    self._writer.commit()
+            except Exception:
+                if depth == 0:
+                    self._writer.rollback()
+                raise
+            finally:
+                self._local.depth = depth
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """A reader connection (or the writer, if this thread is inside write())."""
+        if getattr(self._local, "depth", 0) > 0:
+            yield self._writer
+            return
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if len(self._readers) < self._max_readers:
+                conn = _open(self.path)
+                self._readers.append(conn)
+                return conn
+        return self._idle.get()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        with self._write_lock:
+            self._writer.close()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(path: str) -> ConnectionManager:
+    """Process-wide manager for a database file (created on first use)."""
+    key = os.path.abspath(path)
+    with _managers_lock:
+        mgr = _managers.get(key)
+        if mgr is None or mgr._closed:
+            mgr = ConnectionManager(path)
+            _managers[key] = mgr
+        return mgr
+
+
+def close_all() -> None:
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for mgr in managers:
+        mgr.close()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import sys
 import threading
+import time
 import webbrowser
 from pathlib import Path
 
@@ -27,17 +28,20 @@ from PySide6.QtWidgets import (
 
 from src.config import ConfigManager
 from src.constants import APP_VERSION, GITHUB_URL, SITE_URL, THEME
+from src.core.capture import set_backend as set_capture_backend
 from src.core.layouts import (
     apply_gacha_layout,
     apply_gunsmoke_layout,
     apply_inventory_layout,
     find_layout,
 )
-from src.core.ocr import OCRProcessor
+from src.core.ocr import OCR_CACHE_PATH, OCRCache, OCRProcessor
 from src.core.season import SeasonManager
+from src.core.startup_profile import active_profiler, mark_phase
 from src.core.updater import UpdateChecker
 from src.data.gacha_db import GachaDB
 from src.data.inventory_db import InventoryDB
+from src.data.sqlite_pool import close_all as close_db_connections
 from src.ui.components.mode_nav import ModeNav, build_mode_switch, mode_label
 from src.ui.components.overlay import OverlayManager
 from src.ui.components.splash import StartupSplash
@@ -78,6 +82,7 @@ class _MainWindow(QMainWindow):
 
 class GunsmokeApp:
     def __init__(self):
+        mark_phase("Starting Qt")
         self.app = QApplication.instance() or QApplication(sys.argv)
         self.app.setApplicationName("Gunsmoke Scanner")
         self.app.setStyle("Fusion")
@@ -87,11 +92,13 @@ class GunsmokeApp:
         splash.show_centered()
 
         def status(pct: int, msg: str) -> None:
+            mark_phase(msg)
             splash.set_progress(pct, msg)
 
         status(5, "Loading configuration...")
         self.config_manager = ConfigManager()
         self.config_manager.ensure_ui_config()
+        set_capture_backend(self.config_manager.get_capture_backend())
 
         status(15, "Loading fonts...")
         self.fonts = load_fonts()
@@ -103,33 +110,19 @@ class GunsmokeApp:
         self.gacha_db = GachaDB()
         self.inventory_db = InventoryDB()
 
-        langs = self.config_manager.get_ocr_languages()
-        lang_label = ", ".join(langs)
-        status(40, f"Loading EasyOCR ({lang_label})...")
-        splash.set_busy(True)
-
-        def on_ocr_download(name: str, downloaded: int, total: int) -> None:
-            from src.core.ocr import format_byte_size
-
-            # Map file download into the EasyOCR boot slice (~40-68).
-            if total > 0:
-                pct = min(100, int(downloaded * 100 / total))
-                mapped = 40 + int(pct * 0.28)
-                msg = (
-                    f"Downloading {name}... "
-                    f"{format_byte_size(downloaded)} / {format_byte_size(total)}"
-                )
-            else:
-                mapped = 40
-                msg = f"Downloading {name}... {format_byte_size(downloaded)}"
-            status(mapped, msg)
-
+        # The EasyOCR reader (torch import, device probe, model load) is built
+        # on a background thread once the window is up - see run().
+        cache_cfg = self.config_manager.get_ocr_cache()
         self.ocr_processor = OCRProcessor(
-            langs, on_download_progress=on_ocr_download
+            self.config_manager.get_ocr_languages(),
+            cache=OCRCache(
+                cache_cfg["max_entries"],
+                path=OCR_CACHE_PATH if cache_cfg["persist"] else None,
+            ),
+            load=False,
         )
-        splash.set_busy(False)
 
-        status(70, "Building interface...")
+        status(50, "Building interface...")
         self.root = _MainWindow(self)
         self.root.setWindowTitle(
             f"Gunsmoke Scanner v{APP_VERSION} - Leaderboard / Gacha / Inventory"
@@ -658,9 +651,43 @@ class GunsmokeApp:
             self.config_manager.set_always_on_top(on)
 
     def run(self):
+        mark_phase("Showing window")
         self.root.show()
+        call_soon(self._start_ocr_loading)
         sys.exit(self.app.exec())
 
+    def _start_ocr_loading(self):
+        """Load EasyOCR off the GUI thread; capture actions report "warming up" until then."""
+        mark_phase("Event loop idle (EasyOCR loading)")
+        profiler = active_profiler()
+        started = time.perf_counter()
+
+        def done(error):
+            if profiler is not None:
+                name = "EasyOCR load (failed)" if error else "EasyOCR load"
+                profiler.add_span(name, started, time.perf_counter())
+                call_soon(self._finish_startup_profile)
+                return
+            if error:
+                call_soon(
+                    lambda: QMessageBox.warning(
+                        self.root,
+                        "OCR",
+                        f"EasyOCR failed to load - capture is unavailable:\n{error}",
+                    )
+                )
+
+        self.ocr_processor.start_loading(on_done=done)
+
+    def _finish_startup_profile(self):
+        """--profile-startup: write the report once OCR is up, then exit."""
+        profiler = active_profiler()
+        if profiler is None:
+            return
+        profiler.finish()
+        self.root.close()
+        self.app.quit()
+
     def on_closing(self):
         try:
             self.config_manager.set_ui_mode(self._mode)
@@ -671,4 +698,6 @@ class GunsmokeApp:
             keyboard.unhook_all()
         except Exception:
             pass
+        self.ocr_processor.cache.save()
+        close_db_connections()
         self.overlay_manager.hide()
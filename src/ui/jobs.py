@@ -0,0 +1,98 @@
+"""Latest-wins background jobs for views that recompute on every filter change.
+
+A JobRunner owns one worker thread. submit() replaces whatever was queued and
+cancels the job that is running: the work function gets a Job and should call
+job.check() between steps, which raises JobCancelled once a newer job exists.
+Results come back on the GUI thread through call_soon, and only for the newest
+job - a stale result that finished anyway is dropped - so a view keeps showing
+its previous data until the current one arrives.
+"""
+
+from __future__ import annotations
+
+import threading
+import traceback
+from typing import Any, Callable, Optional
+
+from src.ui.qt_util import call_soon
+
+
+class JobCancelled(Exception):
+    """Raised by Job.check() when a newer job was submitted."""
+
+
+class Job:
+    def __init__(self, runner: "JobRunner", generation: int):
+        self._runner = runner
+        self.generation = generation
+
+    @property
+    def cancelled(self) -> bool:
+        return self.generation != self._runner._generation
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+
+class JobRunner:
+    def __init__(self, name: str):
+        self.name = name
+        self._generation = 0
+        self._pending: Optional[tuple] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        work: Callable[[Job], Any],
+        on_done: Callable[[Any], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Job:
+        """Run work(job) off the GUI thread; on_done(result) on it if still current."""
+        with self._cond:
+            self._generation += 1
+            job = Job(self, self._generation)
+            self._pending = (job, work, on_done, on_error)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name=f"jobs-{self.name}", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return job
+
+    def cancel(self) -> None:
+        """Drop the queued job and make the running one stale."""
+        with self._cond:
+            self._generation += 1
+            self._pending = None
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                job, work, on_done, on_error = self._pending
+                self._pending = None
+            if job.cancelled:
+                continue
+            try:
+                result = work(job)
+            except JobCancelled:
+                continue
+            except Exception as e:
+                if job.cancelled:
+                    continue
+                if on_error is None:
+                    print(f"{self.name} failed: {e}")
+                    traceback.print_exc()
+                else:
+                    call_soon(lambda e=e: self._deliver(job, on_error, e))
+                continue
+            call_soon(lambda r=result: self._deliver(job, on_done, r))
+
+    @staticmethod
+    def _deliver(job: Job, fn: Callable[[Any], None], value: Any) -> None:
+        if not job.cancelled:
+            fn(value)
@@ -22,7 +22,7 @@ from PySide6.QtWidgets import (
 )
 
 from src.constants import THEME
-from src.core.scanner import safe_grab
+from src.core.leaderboard import read_leaderboard
 from src.data.models import PlayerScore
 from src.data.storage import save_to_csv
 from src.ui.qt_util import call_soon
@@ -215,6 +215,11 @@ class CaptureTab(QWidget):
         if self.is_capturing:
             return
 
+        reason = self.ocr_processor.not_ready_reason()
+        if reason:
+            self.status_label.setText(reason)
+            return
+
         if self.season_num is None:
             QMessageBox.warning(
                 self, "Season Not Set", "Please set the season number first!"
@@ -252,47 +257,7 @@ class CaptureTab(QWidget):
 
     def _capture_logic(self):
         try:
-            batch = []
-            rows = self.config_manager.get("rows", [])
-
-            for row_config in rows:
-                nick_img = safe_grab(row_config["nickname"])
-                single_img = safe_grab(row_config["single_high"])
-                total_img = safe_grab(row_config["total_score"])
-
-                if nick_img is None:
-                    continue
-
-                nickname = self.ocr_processor.extract_text(
-                    nick_img, is_number=False, config=self.config_manager.config
-                )
-                single_text = self.ocr_processor.extract_text(
-                    single_img, is_number=True, config=self.config_manager.config
-                )
-                total_text = self.ocr_processor.extract_text(
-                    total_img, is_number=True, config=self.config_manager.config
-                )
-
-                nickname = self.ocr_processor.clean_nickname(nickname)
-                single_score = self.ocr_processor.clean_number(
-                    single_text, is_single_score=True
-                )
-                total_score = self.ocr_processor.clean_number(total_text)
-
-                min_nick_len = self.config_manager.get("validation", {}).get(
-                    "min_nickname_length", 2
-                )
-
-                if len(nickname) >= min_nick_len:
-                    batch.append(
-                        PlayerScore(
-                            season=self.season_num,
-                            ign=nickname,
-                            topscore=single_score,
-                            totalscore=total_score,
-                        )
-                    )
-
+            batch = read_leaderboard(self.config_manager, self.ocr_processor, self.season_num)
             call_soon(lambda: self._on_capture_complete(batch))
 
         except Exception as e:
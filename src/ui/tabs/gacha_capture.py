@@ -129,7 +129,7 @@ class GachaCaptureTab(QWidget):
         self.click_delay_entry = self._timing_field(
             timing_row,
             "Click delay (ms)",
-            str(int(gacha.get("click_delay_ms", 150))),
+            str(int(gacha.get("click_delay_ms", 50))),
         )
         self.settle_delay_entry = self._timing_field(
             timing_row,
@@ -212,7 +212,7 @@ class GachaCaptureTab(QWidget):
             settle_ms = int(self.settle_delay_entry.text().strip())
         except ValueError:
             # Restore last saved values on bad input
-            self.click_delay_entry.setText(str(int(gacha.get("click_delay_ms", 150))))
+            self.click_delay_entry.setText(str(int(gacha.get("click_delay_ms", 50))))
             self.settle_delay_entry.setText(str(int(gacha.get("ocr_settle_ms", 100))))
             return
 
@@ -236,6 +236,11 @@ class GachaCaptureTab(QWidget):
         if self.is_scanning:
             return
 
+        reason = self.ocr_processor.not_ready_reason()
+        if reason:
+            self.status_label.setText(reason)
+            return
+
         self.apply_timing()
         self.is_scanning = True
         self.session_pulls = []
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from PySide6.QtCore import Qt
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
 from PySide6.QtGui import QBrush, QColor
 from PySide6.QtWidgets import (
     QAbstractItemView,
@@ -15,16 +16,17 @@ from PySide6.QtWidgets import (
     QLabel,
     QMessageBox,
     QScrollArea,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from src.constants import THEME
-from src.core.gacha_stats import ELITE_HARD_PITY, build_history
+from src.core.gacha_columns import Timeline
+from src.core.gacha_stats import ELITE_HARD_PITY
 from src.data.gacha_db import GachaDB
 from src.ui.components.date_picker import DatePickerField
+from src.ui.jobs import Job, JobRunner
 from src.ui.styles import configure_stretch_table, create_button, section_frame, stat_strip
 
 
@@ -48,17 +50,93 @@ _COLUMNS = (
 )
 
 
-class GachaHistoryTab(QWidget):
-    # Cap rows drawn in the table - pity still uses full timeline
-    DISPLAY_LIMIT = 800
+def _row_color(rarity_v: str, pity_high: bool) -> str:
+    if pity_high:
+        return THEME["element_omni"]
+    return {
+        "elite": THEME["element_electric"],
+        "standard": THEME["class_vanguard"],
+        "retired": THEME["element_physical"],
+    }.get(rarity_v, THEME["text_primary"])
+
+
+class _HistoryTableModel(QAbstractTableModel):
+    """Annotated pulls shown through an index array; cells are built on paint."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pulls: List[Dict[str, Any]] = []
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._brushes: Dict[str, QBrush] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        if parent.isValid():
+            return 0
+        return len(_COLUMNS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.ItemDataRole.DisplayRole):  # noqa: N802
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and 0 <= section < len(_COLUMNS)
+        ):
+            return _COLUMNS[section][0]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        col = index.column()
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return int(_COLUMNS[col][2] | Qt.AlignmentFlag.AlignVCenter)
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole):
+            return None
+        p = self._pulls[self._rows[index.row()]]
+        rarity_v = p.get("rarity") or "retired"
+        pity = p.get("pity")
+        if role == Qt.ItemDataRole.ForegroundRole:
+            color = _row_color(rarity_v, pity is not None and pity >= ELITE_HARD_PITY - 10)
+            brush = self._brushes.get(color)
+            if brush is None:
+                brush = self._brushes[color] = QBrush(QColor(color))
+            return brush
+        if col == 0:
+            return str(p.get("pull_index", ""))
+        if col == 1:
+            return "" if pity is None else str(pity)
+        if col == 2:
+            return p["purchase_time"]
+        if col == 3:
+            return p.get("banner") or p["purchase_source"]
+        if col == 4:
+            return p["item_type"]
+        if col == 5:
+            return p["item_name"]
+        return rarity_v
+
+    def set_rows(self, pulls: List[Dict[str, Any]], rows: np.ndarray) -> None:
+        """Show pulls[i] for i in rows (row order = display order)."""
+        self.beginResetModel()
+        self._pulls = pulls
+        self._rows = rows
+        self.endResetModel()
 
+
+class GachaHistoryTab(QWidget):
     def __init__(self, parent, fonts, db: GachaDB = None, on_change=None):
         super().__init__(parent)
         self.fonts = fonts
         self.db = db or GachaDB()
         self.on_change = on_change
         self._cached_timeline = None
+        self._columns: Optional[Timeline] = None
         self._cache_key = None
+        self._jobs = JobRunner("history")
         self.setStyleSheet(f"background-color: {THEME['bg_canvas']};")
         self._build_ui()
         self.refresh()
@@ -139,9 +217,14 @@ class GachaHistoryTab(QWidget):
         row_actions.addWidget(clear_btn)
         row_actions.addStretch(1)
 
-        self.table = QTableWidget(0, len(_COLUMNS))
-        self.table.setHorizontalHeaderLabels([c[0] for c in _COLUMNS])
+        # Model/view: rows are painted on demand, so the full history scrolls
+        # and a filter change only swaps the model's index array.
+        self.model = _HistoryTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.setWordWrap(False)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setAlternatingRowColors(False)
@@ -321,16 +404,8 @@ class GachaHistoryTab(QWidget):
 
         dlg.exec()
 
-    def _row_color(self, rarity_v: str, pity_high: bool) -> str:
-        if pity_high:
-            return THEME["element_omni"]
-        return {
-            "elite": THEME["element_electric"],
-            "standard": THEME["class_vanguard"],
-            "retired": THEME["element_physical"],
-        }.get(rarity_v, THEME["text_primary"])
-
     def refresh(self) -> None:
+        """Reload / filter off the GUI thread; the table keeps its rows until then."""
         source = self.source_combo.currentText() or "All"
         item_type = self.type_combo.currentText() or "All"
         rarity = self.rarity_combo.currentText() or "All"
@@ -338,74 +413,47 @@ class GachaHistoryTab(QWidget):
         date_to = self.to_picker.get() or None
         if date_to and len(date_to) == 10:
             date_to = date_to + " 23:59:59"
-
-        # Reload timeline only when DB size changes or date filter changes
-        count = self.db.count_pulls()
-        cache_key = (count, date_from, date_to)
-        if self._cached_timeline is None or self._cache_key != cache_key:
-            self._cached_timeline = self.db.list_all_oldest_first(
-                date_from=date_from,
-                date_to=date_to,
+        known_key = self._cache_key
+        known = (self._cached_timeline, self._columns)
+
+        def work(job: Job):
+            # Reload timeline only when pulls were written or the date filter changes
+            cache_key = (self.db.revision(), date_from, date_to)
+            timeline, columns = known
+            if timeline is None or cache_key != known_key:
+                timeline = self.db.list_annotated(date_from=date_from, date_to=date_to)
+                job.check()
+                columns = Timeline.from_pulls(timeline, pre_annotated=True)
+                job.check()
+            sources = ["All"] + sorted(s for s in columns.sources if s)
+            shown_source = source if source in sources else "All"
+            rows, summary = columns.history(
+                purchase_source=None if shown_source == "All" else shown_source,
+                item_type=None if item_type == "All" else item_type,
+                rarity=None if rarity == "All" else rarity,
             )
-            self._cache_key = cache_key
+            return cache_key, timeline, columns, sources, shown_source, rows, summary
+
+        self._jobs.submit(work, self._on_history)
+
+    def _on_history(self, result) -> None:
+        cache_key, timeline, columns, sources, source, rows, summary = result
+        self._cache_key = cache_key
+        self._cached_timeline = timeline
+        self._columns = columns
 
-        sources = ["All"] + sorted(
-            {p.get("purchase_source") or "" for p in self._cached_timeline if p.get("purchase_source")}
-        )
-        current = self.source_combo.currentText()
         self.source_combo.blockSignals(True)
         self.source_combo.clear()
         self.source_combo.addItems(sources)
-        if current in sources:
-            self.source_combo.setCurrentText(current)
-            source = current
-        else:
-            self.source_combo.setCurrentText("All")
-            source = "All"
+        self.source_combo.setCurrentText(source)
         self.source_combo.blockSignals(False)
 
-        display, summary = build_history(
-            self._cached_timeline,
-            purchase_source=None if source == "All" else source,
-            item_type=None if item_type == "All" else item_type,
-            rarity=None if rarity == "All" else rarity,
-        )
-
-        total_shown = len(display)
-        truncated = total_shown > self.DISPLAY_LIMIT
-        rows = display[: self.DISPLAY_LIMIT]
-
-        self.table.setRowCount(len(rows))
-        for r, p in enumerate(rows):
-            rarity_v = p.get("rarity") or "retired"
-            pity = p.get("pity")
-            pity_str = "" if pity is None else str(pity)
-            pity_high = pity is not None and pity >= ELITE_HARD_PITY - 10
-            color = self._row_color(rarity_v, pity_high)
-            values = (
-                str(p.get("pull_index", "")),
-                pity_str,
-                p["purchase_time"],
-                p.get("banner") or p["purchase_source"],
-                p["item_type"],
-                p["item_name"],
-                rarity_v,
-            )
-            for c, value in enumerate(values):
-                item = QTableWidgetItem(value)
-                item.setTextAlignment(int(_COLUMNS[c][2] | Qt.AlignmentFlag.AlignVCenter))
-                item.setForeground(QBrush(QColor(color)))
-                self.table.setItem(r, c, item)
-
-        self._format_stats(summary, total_shown)
-        if truncated:
-            self.stats_quality.setText(
-                self.stats_quality.text()
-                + f"  \u00b7  Table shows newest {self.DISPLAY_LIMIT} of {total_shown}"
-            )
+        self.model.set_rows(timeline, rows)
+        self._format_stats(summary, len(rows))
 
     def invalidate_cache(self) -> None:
         self._cached_timeline = None
+        self._columns = None
         self._cache_key = None
 
     def clear_db(self) -> None:
@@ -28,6 +28,7 @@ from src.core.gacha_stats import (
     build_stats_report,
 )
 from src.data.gacha_db import GachaDB
+from src.ui.jobs import Job, JobRunner
 from src.ui.components.charts import ActivityHeatmap, ChartFrame
 from src.ui.styles import (
     card_frame,
@@ -361,6 +362,12 @@ class GachaStatsTab(QWidget):
         super().__init__(parent)
         self.fonts = fonts
         self.db = db or GachaDB()
+        # Reports per selected source, valid for one GachaDB.revision().
+        self._revision: Optional[int] = None
+        self._reports: Dict[Optional[str], Dict[str, Any]] = {}
+        self._timeline: Optional[List[Dict[str, Any]]] = None
+        self._shown: Optional[Tuple[int, Optional[str]]] = None
+        self._jobs = JobRunner("stats")
         self.setStyleSheet(f"background-color: {THEME['bg_canvas']};")
         self._build_ui()
         self.refresh()
@@ -588,13 +595,41 @@ class GachaStatsTab(QWidget):
                 self.table.setItem(row, col, item)
 
     def refresh(self) -> None:
-        self.db.normalize_purchase_sources()
-        timeline = self.db.list_all_oldest_first()
-        report = build_stats_report(timeline, purchase_source=self._selected_source())
+        """Rebuild off the GUI thread; the page keeps its data until then."""
+        src = self._selected_source()
+        known_revision = self._revision
+        known_report = self._reports.get(src)
+        known_timeline = self._timeline
+
+        def work(job: Job):
+            revision = self.db.revision()
+            report, timeline = known_report, known_timeline
+            if revision != known_revision:
+                report = timeline = None
+            if report is None:
+                if timeline is None:
+                    timeline = self.db.list_annotated()
+                    job.check()
+                report = build_stats_report(
+                    timeline, purchase_source=src, pre_annotated=True
+                )
+            return revision, src, timeline, report
+
+        self._jobs.submit(work, self._on_report)
+
+    def _on_report(self, result) -> None:
+        revision, src, timeline, report = result
+        if revision != self._revision:
+            self._revision = revision
+            self._reports = {}
+        self._timeline = timeline
+        self._reports[src] = report
+        if self._shown == (revision, src):
+            return
+        self._shown = (revision, src)
         summary = report["summary"]
         fifty = report["fifty_fifty"]
         charts = report["charts"]
-        src = self._selected_source()
 
         self._render_summary(summary)
         self._render_pity(summary, src)
@@ -318,6 +318,10 @@ class InventoryCaptureTab(QWidget):
         if self.is_scanning:
             QMessageBox.information(self, "Busy", "A scan is already running.")
             return True
+        reason = self.ocr_processor.not_ready_reason()
+        if reason:
+            self._status(reason)
+            return True
         return False
 
     def _hide_overlay(self):
@@ -390,6 +390,10 @@ class InventorySetupTab(QWidget):
     def ocr_peek(self):
         if not self.ocr_processor:
             return
+        reason = self.ocr_processor.not_ready_reason()
+        if reason:
+            self._log(reason)
+            return
 
         def _run():
             key = self._get_region()
@@ -487,6 +487,10 @@ class SetupTab(QWidget):
         if self.ocr_processor is None:
             QMessageBox.warning(self, "OCR Peek", "OCR is not available.")
             return
+        reason = self.ocr_processor.not_ready_reason()
+        if reason:
+            self.peek_label.setText(f"OCR Peek: {reason}")
+            return
         self.apply_manual_values()
         self.peek_label.setText("OCR Peek: reading...")
         was_active = self.overlay_manager.active